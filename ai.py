@@ -0,0 +1,264 @@
+from __future__ import annotations
+import threading
+import time
+from dataclasses import dataclass
+
+import analysis
+import tablebase
+from captures import has_capture, sum_table
+from engine import BoardState, iter_bits
+
+# Gépi ellenfél: iteratívan mélyülő alfa-béta (negamax) az ütés-lépések felett,
+# Zobrist-kulcsos, fix méretű transzpozíciós táblával és időkerettel.
+# Kivy-független: a keresés háttérszálon fut, az eredményt callback kapja.
+# Végjáték-tábla (tablebase) hatókörében a gyökérben és a levelekben pontos érték.
+
+PASS = (-1, 0)  # "Kör vége" lépés (cél, támadó maszk)
+
+TT_SIZE = 1 << 16     # transzpozíciós tábla rekeszei (2 hatványa)
+MAX_DEPTH = 32
+PER_TARGET = 4        # célonként legfeljebb ennyi támadó-kombináció kerül a fába
+CHECK_EVERY = 64      # ennyi csomópontonként (és lépésgenerálásonként) nézzük az időt / megszakítást
+
+MIN_THINK = 0.2       # mp
+MAX_THINK = 3.0       # mp
+MOVES_LEFT = 20       # ennyi hátralévő lépésre osztjuk a maradék időt
+
+COUNT_WEIGHT = 8192   # 1 bábu többet ér bármilyen összérték-különbségnél
+WIN = 1 << 30
+
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+def think_time(time_left: float) -> float:
+    # a gép saját maradék idejéből gazdálkodik
+    return max(MIN_THINK, min(MAX_THINK, time_left / MOVES_LEFT))
+
+
+def evaluate(board: BoardState, side: int, final: bool = False) -> int:
+    # ugyanaz a sorrend, mint BoardState.finish: bábuszám, majd összérték
+    score = (board.counts[side] - board.counts[1 - side]) * COUNT_WEIGHT
+    score += board.sums[side] - board.sums[1 - side]
+    if final and score:
+        score += WIN if score > 0 else -WIN
+    return score
+
+
+def tablebase_score(outcome: tuple[int, int]) -> int:
+    # tablebase végeredmény (bábuszám-, összérték-különbség) → evaluate(final=True) skálája
+    score = outcome[0] * COUNT_WEIGHT + outcome[1]
+    if score:
+        score += WIN if score > 0 else -WIN
+    return score
+
+
+def _popcount(mask: int) -> int:
+    return bin(mask).count("1")
+
+
+@dataclass
+class SearchResult:
+    move: tuple[int, int]
+    score: int
+    depth: int
+    nodes: int
+    elapsed: float
+
+    @property
+    def nps(self) -> float:
+        return self.nodes / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class _Abort(Exception):
+    pass
+
+
+class TranspositionTable:
+    # rekeszenként egy bejegyzés: (kulcs, mélység, érték, jelző, legjobb lépés), mindig felülír
+    __slots__ = ("slots", "mask")
+
+    def __init__(self, size: int = TT_SIZE):
+        self.slots = [None] * size
+        self.mask = size - 1
+
+    def get(self, key: int):
+        entry = self.slots[key & self.mask]
+        return entry if entry is not None and entry[0] == key else None
+
+    def put(self, key: int, depth: int, score: int, flag: int, move):
+        self.slots[key & self.mask] = (key, depth, score, flag, move)
+
+    def clear(self):
+        self.slots = [None] * len(self.slots)
+
+
+class Search:
+    # egyetlen keresés a tábla saját másolatán (make / undo lépésekkel)
+    def __init__(self, board: BoardState, tt: TranspositionTable, deadline: float, cancel: threading.Event | None,
+                 tb: tablebase.Tablebase | None = None):
+        self.board = board
+        self.tt = tt
+        self.tb = tb
+        self.deadline = deadline
+        self.cancel = cancel
+        self.nodes = 0
+        self.root_move = None  # az éppen futó mélység eddigi legjobb gyökérlépése
+
+    def moves(self, tt_move):
+        b = self.board
+        s = b.to_move
+        table = sum_table(b)
+        values = b.values
+        found = []
+        for t in iter_bits(b.masks[1 - s]):
+            self._check()  # nagy táblán a felsorolás önmagában is tized mp-ek
+            for i, mask in enumerate(table.iter_subsets(values[t])):
+                if i == PER_TARGET:
+                    break
+                found.append((t, mask))
+        # az ütés mindig bábuvesztés az ütőnek → kevesebb támadó előre, a passz legelőre
+        found.sort(key=lambda m: _popcount(m[1]))
+        found.insert(0, PASS)
+        if tt_move is not None and tt_move in found:
+            found.remove(tt_move)
+            found.insert(0, tt_move)
+        return found
+
+    def _check(self):
+        if (self.cancel is not None and self.cancel.is_set()) or time.perf_counter() > self.deadline:
+            raise _Abort
+
+    def negamax(self, depth: int, alpha: int, beta: int, root: bool = False):
+        self.nodes += 1
+        if self.nodes % CHECK_EVERY == 0:
+            self._check()
+
+        b = self.board
+        s = b.to_move
+        if b.is_over():
+            return evaluate(b, s, final=True), None
+        if self.tb is not None:
+            outcome = self.tb.probe(b)
+            if outcome is not None:
+                return tablebase_score(outcome), None
+        mine = has_capture(b)
+        if not mine and not has_capture(b, b.enemy):
+            return evaluate(b, s, final=True), None
+        if depth == 0:
+            return evaluate(b, s), None
+
+        key = b.zobrist
+        entry = self.tt.get(key)
+        tt_move = None
+        if entry is not None:
+            tt_move = entry[4]
+            if entry[1] >= depth:
+                score, flag = entry[2], entry[3]
+                if flag == EXACT:
+                    return score, tt_move
+                if flag == LOWER and score >= beta:
+                    return score, tt_move
+                if flag == UPPER and score <= alpha:
+                    return score, tt_move
+
+        alpha0 = alpha
+        best, best_move = -WIN * 2, None
+        for move in (self.moves(tt_move) if mine else (PASS,)):
+            if move == PASS:
+                b.pass_turn()
+                score = -self.negamax(depth - 1, -beta, -alpha)[0]
+                b.pass_turn()
+            else:
+                target, attackers = move
+                b.apply_capture(target, attackers)
+                if b.is_over():
+                    score = evaluate(b, s, final=True)
+                else:
+                    score = -self.negamax(depth - 1, -beta, -alpha)[0]
+                b.undo_capture(target, attackers, s)
+
+            if score > best:
+                best, best_move = score, move
+                if root:
+                    self.root_move = move
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                break
+
+        flag = UPPER if best <= alpha0 else LOWER if best >= beta else EXACT
+        self.tt.put(key, depth, best, flag, best_move)
+        return best, best_move
+
+
+class AIPlayer:
+    def __init__(self, tt_size: int = TT_SIZE, tb: tablebase.Tablebase | None = None):
+        # a kulcs csak a bábuk (oldal, érték) halmazától függ → a tábla játékok között is érvényes
+        self.tt = TranspositionTable(tt_size)
+        self.tb = tb if tb is not None else tablebase.default()
+        self.last: SearchResult | None = None
+        self._cancel: threading.Event | None = None
+
+    def search(self, board: BoardState, budget: float, cancel: threading.Event | None = None) -> SearchResult:
+        # szinkron keresés; megszakításkor félbemaradt lépések maradnának → saját másolaton fut
+        start = time.perf_counter()
+        if self.tb is not None:
+            hit = self.tb.best_move(board)
+            if hit is not None:
+                # végjáték-tábla: tökéletes lépés keresés nélkül (mélység 0)
+                move, outcome = hit
+                self.last = SearchResult(move or PASS, tablebase_score(outcome), 0, 1, time.perf_counter() - start)
+                return self.last
+        # ugyanez az állás már volt (visszavonás, visszajátszás, azonos seed) legalább ekkora kerettel
+        cache = analysis.shared()
+        hit = cache.get(board, "search")
+        if hit is not None and hit[4] >= budget:
+            target, attackers, score, depth, _ = hit
+            self.last = SearchResult((target, attackers), score, depth, 0, time.perf_counter() - start)
+            return self.last
+        srch = Search(board.copy(), self.tt, start + budget, cancel, self.tb)
+        result = None
+        for depth in range(1, MAX_DEPTH + 1):
+            srch.root_move = None
+            try:
+                score, move = srch.negamax(depth, -WIN * 2, WIN * 2, root=True)
+            except _Abort:
+                break
+            result = SearchResult(move or PASS, score, depth, srch.nodes, time.perf_counter() - start)
+            if abs(score) >= WIN or time.perf_counter() > srch.deadline:
+                break
+        if result is None:
+            # az 1. mélység sem ért véget: az eddig legjobb gyökérlépés, vagy a lépés-sorrend
+            # első (mindig szabályos) lépése, a passz
+            result = SearchResult(srch.root_move or PASS, 0, 0, srch.nodes, 0.0)
+        result.nodes = srch.nodes
+        result.elapsed = time.perf_counter() - start
+        if result.depth and (cancel is None or not cancel.is_set()):
+            # csak végigkeresett mélység kerül a cache-be (a kényszerlépés nem)
+            cache.put(board, "search", [*result.move, result.score, result.depth, budget])
+        self.last = result
+        return result
+
+    def start(self, board: BoardState, budget: float, on_done):
+        # háttérszálas keresés a tábla másolatán; on_done(SearchResult) a háttérszálról hívódik
+        self.cancel()
+        cancel = threading.Event()
+        self._cancel = cancel
+        board = board.copy()
+
+        def _run():
+            result = self.search(board, budget, cancel)
+            if not cancel.is_set():
+                self._cancel = None
+                on_done(result)
+
+        threading.Thread(target=_run, name="ai-search", daemon=True).start()
+
+    def cancel(self):
+        if self._cancel is not None:
+            self._cancel.set()
+            self._cancel = None
+
+    @property
+    def thinking(self) -> bool:
+        return self._cancel is not None
@@ -0,0 +1,200 @@
+from __future__ import annotations
+import hashlib
+import json
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from engine import BoardState, iter_bits
+
+# Megosztott pozíció-elemzés cache: a kulcs kanonikus pozíció-hash (mezőnként
+# tulajdonos + érték, a lépő), így ugyanaz az elrendezés (visszajátszás, visszavonás,
+# azonos seedű visszavágó) nem számolódik újra. Korlátos memóriabeli LRU, mögötte
+# opcionális SQLite réteg, ami túléli az újraindítást. Szálbiztos (a gép háttérszálon
+# keres); az értékek JSON-ként kerülnek lemezre. A put() sosem ír lemezre: a
+# felgyűlt bejegyzéseket háttérszál írja ki (vagy flush() szünetnél / leállításkor),
+# így a kattintás útján nincs SQLite-tranzakció.
+
+CAPACITY = 4096        # memóriában tartott bejegyzések (eszközönként hangolható)
+DISK_LIMIT = 100_000   # lemezen legfeljebb ennyi; fölötte a legrégebben írtak mennek
+FLUSH_EVERY = 256      # ennyi új bejegyzés után háttérszálon, egy tranzakcióban a lemezre
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS analysis (
+    id INTEGER PRIMARY KEY,
+    key BLOB NOT NULL,
+    kind TEXT NOT NULL,
+    value TEXT NOT NULL,
+    UNIQUE (key, kind)
+);
+"""
+
+
+def position_key(board: BoardState) -> bytes:
+    # egy játékon belül a számok helye fix → a Zobrist-kulcs már egyértelmű, a hash-t
+    # a board.cache-ben tartjuk (új játéknál ürül)
+    memo = ("position_key", board.zobrist)
+    key = board.cache.get(memo)
+    if key is None:
+        # a levett bábuk értéke a values tömbben marad → üres mezőn 0 (kanonikus)
+        values = array("H", board.values)
+        full = (1 << board.size) - 1
+        for idx in iter_bits(full & ~(board.masks[0] | board.masks[1])):
+            values[idx] = 0
+        h = hashlib.blake2b(board.owners.tobytes(), digest_size=16)
+        h.update(values.tobytes())
+        h.update(bytes((board.to_move,)))
+        key = h.digest()
+        board.cache[memo] = key
+    return key
+
+
+@dataclass
+class CacheStats:
+    entries: int
+    capacity: int
+    hits: int
+    disk_hits: int
+    misses: int
+    evictions: int
+    disk_writes: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.disk_hits + self.misses
+        return (self.hits + self.disk_hits) / total if total else 0.0
+
+
+class AnalysisCache:
+    def __init__(self, path: str | None = None, capacity: int = CAPACITY, disk_limit: int = DISK_LIMIT):
+        self.capacity = capacity
+        self.disk_limit = disk_limit
+        self._lock = threading.Lock()            # a memóriabeli állapot őre (rövid ideig tartjuk)
+        self._db_lock = threading.Lock()         # az SQLite-kapcsolat őre (az írás alatt is)
+        self._writer: threading.Thread | None = None
+        self._mem: OrderedDict = OrderedDict()   # (kulcs, fajta) → érték, a legutóbb használt a végén
+        self._pending: dict = {}                 # még ki nem írt bejegyzések: (kulcs, fajta) → JSON
+        self.hits = self.disk_hits = self.misses = self.evictions = self.disk_writes = 0
+        self.db = None
+        if path is not None:
+            self.db = sqlite3.connect(path, check_same_thread=False)
+            self.db.executescript(_SCHEMA)
+
+    def close(self):
+        writer = self._writer
+        if writer is not None:
+            writer.join()
+        self.flush()
+        with self._lock, self._db_lock:
+            if self.db is not None:
+                self.db.close()
+                self.db = None
+
+    # ---------- elérés ----------
+    def get(self, board: BoardState, kind: str, decode=None):
+        # None, ha nincs (sem memóriában, sem lemezen)
+        item = (position_key(board), kind)
+        with self._lock:
+            value = self._mem.get(item)
+            if value is not None:
+                self._mem.move_to_end(item)
+                self.hits += 1
+                return value
+            if self.db is not None:
+                with self._db_lock:
+                    row = self.db.execute("SELECT value FROM analysis WHERE key = ? AND kind = ?", item).fetchone()
+                if row is not None:
+                    value = json.loads(row[0])
+                    if decode is not None:
+                        value = decode(value)
+                    self._remember(item, value)
+                    self.disk_hits += 1
+                    return value
+            self.misses += 1
+            return None
+
+    def put(self, board: BoardState, kind: str, value):
+        item = (position_key(board), kind)
+        with self._lock:
+            self._remember(item, value)
+            if self.db is not None:
+                # a szerializálás itt (kicsi), hogy az író szál ne tartsa sokáig a GIL-t
+                self._pending[item] = json.dumps(value, separators=(",", ":"))
+                if len(self._pending) >= FLUSH_EVERY:
+                    self._flush_in_background()
+
+    def memo(self, board: BoardState, kind: str, compute, decode=None):
+        # a cache-elt érték, vagy compute(board) eredménye (ami bekerül a cache-be)
+        value = self.get(board, kind, decode)
+        if value is None:
+            value = compute(board)
+            self.put(board, kind, value)
+        return value
+
+    def _remember(self, item, value):
+        mem = self._mem
+        mem[item] = value
+        mem.move_to_end(item)
+        while len(mem) > self.capacity:
+            mem.popitem(last=False)
+            self.evictions += 1
+
+    # ---------- lemez ----------
+    def _flush_in_background(self):
+        # self._lock alatt hívandó; egyszerre legfeljebb egy író szál
+        if self._writer is None or not self._writer.is_alive():
+            self._writer = threading.Thread(target=self.flush, name="analysis-flush", daemon=True)
+            self._writer.start()
+
+    def flush(self):
+        # a függő bejegyzések kiírása; a memóriabeli zárat csak az átvételig tartjuk
+        with self._lock:
+            if self.db is None or not self._pending:
+                return
+            pending = self._pending
+            self._pending = {}
+        rows = [(key, kind, text) for (key, kind), text in pending.items()]
+        with self._db_lock:
+            if self.db is None:
+                return
+            with self.db:
+                # REPLACE új id-t ad → az id sorrendje az írás sorrendje (a régiek törlődnek)
+                self.db.executemany("INSERT OR REPLACE INTO analysis (key, kind, value) VALUES (?, ?, ?)", rows)
+                self.db.execute(
+                    "DELETE FROM analysis WHERE id <= (SELECT MAX(id) FROM analysis) - ?", (self.disk_limit,)
+                )
+        with self._lock:
+            self.disk_writes += len(rows)
+
+    def clear(self):
+        writer = self._writer
+        if writer is not None:
+            writer.join()  # a már átvett sorok se kerüljenek a törlés után lemezre
+        with self._lock:
+            self._mem.clear()
+            self._pending.clear()
+            if self.db is not None:
+                with self._db_lock, self.db:
+                    self.db.execute("DELETE FROM analysis")
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(len(self._mem), self.capacity, self.hits, self.disk_hits,
+                              self.misses, self.evictions, self.disk_writes)
+
+
+_shared = AnalysisCache()
+
+
+def shared() -> AnalysisCache:
+    return _shared
+
+
+def configure(path: str | None = None, capacity: int = CAPACITY) -> AnalysisCache:
+    # a folyamat közös cache-e (alapból csak memória); az app indításkor a lemezre köti
+    global _shared
+    _shared.close()
+    _shared = AnalysisCache(path, capacity)
+    return _shared
@@ -0,0 +1,117 @@
+from __future__ import annotations
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import TURN_SECONDS  # noqa: E402
+from gameclock import GameClock  # noqa: E402
+from hud import HudText, state_text, time_text, turn_text  # noqa: E402
+
+# HUD label re-textúrák játékonként + óra-csúszás késő frame-eknél, Kivy nélkül.
+# "régi": 1 mp-es interval tick, fix 1 levonás, minden tick/katt mind a 4 label-t írja.
+# "új": GameClock (monoton idő) + másodpercváltásra ütemezett tick + HudText.
+#
+#   python benchmarks/bench_hud.py --games 200
+
+MOVE_TIME = (2.0, 12.0)   # gondolkodási idő lépésenként (mp)
+CLICKS = (2, 5)           # kattintás lépésenként (cél + támadók)
+LATE = 0.25               # frame-késés legfeljebb ennyi (mp), minden tick-nél
+TICK_SLACK = 0.01
+
+
+class FakeLabel:
+    def __init__(self, text=""):
+        self.text = text
+
+
+def old_game(rng: random.Random) -> tuple[int, float]:
+    # visszaad: label írások száma, óra-hiba (mp) a játék végén
+    t = 0.0
+    left = [TURN_SECONDS, TURN_SECONDS]
+    true_left = [float(TURN_SECONDS)] * 2
+    side = 0
+    writes = 0
+    next_tick = 1.0 + rng.uniform(0, LATE)
+    while True:
+        move_at = t + rng.uniform(*MOVE_TIME)
+        while next_tick < move_at:
+            true_left[side] -= next_tick - t
+            t = next_tick
+            left[side] -= 1
+            writes += 4
+            if left[side] <= 0:
+                return writes, abs(true_left[side] - left[side])
+            next_tick = t + 1.0 + rng.uniform(0, LATE)
+        true_left[side] -= move_at - t
+        t = move_at
+        writes += 4 * rng.randint(*CLICKS)
+        side ^= 1
+
+
+def new_game(rng: random.Random) -> tuple[int, int, float]:
+    # visszaad: update hívások, tényleges re-textúrák, óra-hiba (mp)
+    t = 0.0
+    clock = GameClock(TURN_SECONDS, 0, now=lambda: t)
+    labels = [HudText(FakeLabel()) for _ in range(4)]
+    updates = 0
+
+    def hud(target, total, paused=False):
+        nonlocal updates
+        updates += 4
+        labels[0].set(turn_text(str(clock.side)))
+        labels[1].set(time_text(clock.left(0), clock.left(1)))
+        labels[2].set(state_text(target, total))
+        labels[3].set("Folytat" if paused else "Szünet")
+
+    true_left = [float(TURN_SECONDS)] * 2
+    clock.start()
+    hud(None, 0)
+    next_tick = clock.until_next_second() + TICK_SLACK + rng.uniform(0, LATE)
+    while True:
+        move_at = t + rng.uniform(*MOVE_TIME)
+        while next_tick < move_at:
+            true_left[clock.side] -= next_tick - t
+            t = next_tick
+            if clock.expired():
+                return updates, sum(h.renders for h in labels), abs(true_left[clock.side] - clock.left(clock.side))
+            updates += 1
+            labels[1].set(time_text(clock.left(0), clock.left(1)))
+            next_tick = t + clock.until_next_second() + TICK_SLACK + rng.uniform(0, LATE)
+        true_left[clock.side] -= move_at - t
+        t = move_at
+        target = rng.randint(1, 128)
+        total = 0
+        for _ in range(rng.randint(*CLICKS)):
+            total += rng.randint(1, 40)
+            hud(target, total)
+        clock.switch(clock.side ^ 1)
+        hud(None, 0)
+        next_tick = t + clock.until_next_second() + TICK_SLACK + rng.uniform(0, LATE)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="HUD re-textúra és óra-csúszás benchmark")
+    ap.add_argument("--games", type=int, default=200)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    old = [old_game(rng) for _ in range(args.games)]
+    rng = random.Random(args.seed)
+    new = [new_game(rng) for _ in range(args.games)]
+
+    n = args.games
+    print(f"játékok: {n}")
+    print(f"régi: {sum(w for w, _ in old) / n:.0f} label írás/játék, "
+          f"óra-hiba átlag {sum(e for _, e in old) / n:.1f} mp")
+    print(f"új:   {sum(u for u, _, _ in new) / n:.0f} frissítés/játék, "
+          f"{sum(r for _, r, _ in new) / n:.0f} re-textúra/játék, "
+          f"óra-hiba átlag {sum(e for _, _, e in new) / n:.3f} mp")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
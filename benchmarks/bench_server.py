@@ -0,0 +1,146 @@
+from __future__ import annotations
+import argparse
+import asyncio
+import base64
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import snapshot  # noqa: E402
+from captures import iter_captures  # noqa: E402
+from engine import BoardState  # noqa: E402
+from server import GameServer, encode_message, percentile  # noqa: E402
+
+# Sok párhuzamos játék egy szerverprocesszben: a szerver és a kliensek ugyanabban
+# az asyncio hurokban, localhost-on. Minden kliens a saját táblamásolatán választ
+# véletlen szabályos ütést (vagy passzol), a szerver ellenőriz és szétküld.
+# Mérés: lépés-feldolgozás a szerveren (p50/p99) + kör-idő a kliens oldalán.
+#
+#   python benchmarks/bench_server.py --games 500 --moves 40
+
+PASS_CHANCE = 0.1
+SUBSETS = 8  # ennyi ütés közül választ véletlenül (nem kell mind)
+
+
+async def player(host: str, port: int, rng: random.Random, max_moves: int, rtt: list, ready: asyncio.Event, go: asyncio.Event):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(encode_message({"op": "join"}))
+    board = BoardState()
+    side = -1
+    moves = 0
+    sent = 0.0
+    ready.set()
+
+    async def send(msg: dict):
+        nonlocal sent
+        sent = time.perf_counter()
+        writer.write(encode_message(msg))
+        await writer.drain()
+
+    async def act():
+        nonlocal moves
+        if moves >= max_moves:
+            writer.close()
+            return
+        moves += 1
+        caps = []
+        if rng.random() >= PASS_CHANCE:
+            for cap in iter_captures(board):
+                caps.append(cap)
+                if len(caps) >= SUBSETS:
+                    break
+        if caps:
+            t, a = rng.choice(caps)
+            await send({"op": "capture", "t": t, "a": a})
+        else:
+            await send({"op": "pass"})
+
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            msg = json.loads(line)
+            op = msg["op"]
+            if op == "joined":
+                side = msg["side"]
+            elif op == "start":
+                snapshot.loads(base64.b64decode(msg["snap"]), board)
+                await go.wait()  # mindenki csatlakozott → egyszerre nyitott játékok
+                if board.to_move == side:
+                    await act()
+            elif op == "move":
+                if board.to_move == side:
+                    rtt.append(time.perf_counter() - sent)
+                if msg["kind"] == "pass":
+                    board.pass_turn()
+                else:
+                    board.apply_capture(msg["t"], msg["a"])
+                if board.to_move == side:
+                    await act()
+            elif op in ("end", "error"):
+                break
+    finally:
+        writer.close()
+
+
+async def run(games: int, max_moves: int, seed: int) -> dict:
+    server = GameServer(max_sessions=games, seed=seed)
+    srv = await server.start("127.0.0.1", 0)
+    host, port = srv.sockets[0].getsockname()[:2]
+    rng = random.Random(seed)
+    rtt: list[float] = []
+
+    started = time.perf_counter()
+    tasks = []
+    go = asyncio.Event()
+    for _ in range(games * 2):
+        # kliensek egymás után csatlakoznak → a párosítás sorrendje determinisztikus
+        ready = asyncio.Event()
+        player_rng = random.Random(rng.getrandbits(32))
+        tasks.append(asyncio.create_task(player(host, port, player_rng, max_moves, rtt, ready, go)))
+        await ready.wait()
+    while len(server.sessions) < games or server.waiting is not None:
+        await asyncio.sleep(0.01)
+    peak = len(server.sessions)
+    connected = time.perf_counter()
+    go.set()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    elapsed = time.perf_counter() - connected
+    srv.close()
+    await srv.wait_closed()
+
+    stats = server.stats()
+    stats.update(
+        games=games,
+        peak_sessions=peak,
+        connect_seconds=round(connected - started, 3),
+        seconds=round(elapsed, 3),
+        moves_per_sec=round(server.moves / elapsed, 1),
+        rtt_p50_ms=round(percentile(rtt, 0.50) * 1000, 3),
+        rtt_p99_ms=round(percentile(rtt, 0.99) * 1000, 3),
+    )
+    return stats
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Számos Sakk szerver terhelésmérés (localhost)")
+    ap.add_argument("--games", type=int, default=200, help="párhuzamos játékok")
+    ap.add_argument("--moves", type=int, default=40, help="lépés / játékos legfeljebb")
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args(argv)
+
+    s = asyncio.run(run(args.games, args.moves, args.seed))
+    print(f"játékok: {s['games']}  egyszerre nyitva (csúcs): {s['peak_sessions']}  befejezett: {s['finished']}")
+    print(f"csatlakozás: {s['connect_seconds']:.2f} mp  lépések: {s['moves']}  ({s['moves_per_sec']:.0f}/mp, {s['seconds']:.2f} mp)")
+    print(f"szerver feldolgozás: p50 {s['p50_ms']:.3f} ms  p99 {s['p99_ms']:.3f} ms")
+    print(f"kliens kör-idő:      p50 {s['rtt_p50_ms']:.3f} ms  p99 {s['rtt_p99_ms']:.3f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,464 @@
+from __future__ import annotations
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import analysis  # noqa: E402
+import tracing  # noqa: E402
+from captures import iter_captures, no_captures_left  # noqa: E402
+from deal import balanced_deal  # noqa: E402
+from reach import Reachability  # noqa: E402
+from engine import DEFAULT_CONFIG, PRESETS, SIDES, BoardConfig, GameResult, BoardState, iter_bits  # noqa: E402
+from history import MatchHistory  # noqa: E402
+import puzzles  # noqa: E402
+from hud import HudText, state_text, stats_text, time_text, turn_text  # noqa: E402
+
+# Reprodukálható mérések a játék forró útjaira (fix seed-ek). Minden mérés
+# mintánként `number` műveletet időz, `repeat` mintából medián / min / p95
+# (µs / művelet). Az eredmény JSON; --baseline-nal összevet és lassulásnál
+# 1-gyel lép ki (pl. APK build előtt).
+#
+#   python benchmarks/suite.py --out bench.json
+#   python benchmarks/suite.py --baseline benchmarks/baseline.json --tolerance 0.25
+#   python benchmarks/suite.py --save-baseline benchmarks/baseline.json
+#
+# A "kivy." mérésekhez Kivy kell; ablak nélkül fut (SDL offscreen videó), ha
+# nincs Kivy, "skipped"-ként kerülnek a kimenetbe. A baseline-t mindig egy teljes
+# futás írja (Kivy-vel, tiszta munkafával); kézzel nem szerkesztjük.
+
+SEED = 12345
+REPEAT = 15
+HISTORY_ROWS = 100_000
+TOLERANCE = 0.25  # ennyivel lassabb medián = regresszió
+
+BENCHES = []
+
+
+def bench(name: str, number: int, kivy: bool = False):
+    # a mért függvény: make(number) → futtató, ami a mért időt adja vissza (mp),
+    # így az előkészítés (pl. új tábla) kimaradhat az időből
+    def deco(make):
+        BENCHES.append((name, number, kivy, make))
+        return make
+    return deco
+
+
+class FakeLabel:
+    def __init__(self, text=""):
+        self.text = text
+
+
+def _boards(count: int, seed: int = SEED, config: BoardConfig = DEFAULT_CONFIG) -> list[BoardState]:
+    rng = random.Random(seed)
+    boards = []
+    for _ in range(count):
+        b = BoardState(config=config)
+        b.new_game(rng)
+        boards.append(b)
+    return boards
+
+
+def _first_capture(b: BoardState) -> tuple[int, int] | None:
+    return next(iter_captures(b), None)
+
+
+# ---------- motor (Kivy nélkül) ----------
+@bench("engine.new_game", number=200)
+def _new_game(number):
+    def run():
+        rng = random.Random(SEED)
+        b = BoardState()
+        t0 = time.perf_counter()
+        for _ in range(number):
+            b.new_game(rng)
+        return time.perf_counter() - t0
+    return run
+
+
+@bench("deal.balanced", number=50)
+def _balanced_deal(number):
+    # kiegyensúlyozott osztás (jelöltek pontozásával) – az "Új játék" motor-oldali része
+    def run():
+        t0 = time.perf_counter()
+        for seed in range(number):
+            balanced_deal(SEED + seed)
+        return time.perf_counter() - t0
+    return run
+
+
+def _click_capture(number, config=DEFAULT_CONFIG):
+    # on_cell_click → try_capture → _after_capture → update_hud motor-oldali része:
+    # cél + támadók kijelölése, ütés, játék vége ellenőrzés, HUD szövegek
+    boards = [b for b in _boards(number, config=config) if _first_capture(b) is not None]
+    moves = [_first_capture(b) for b in boards]
+    hud = [HudText(FakeLabel()) for _ in range(3)]
+
+    def run():
+        total = 0.0
+        for b, (target, attackers) in zip(boards, moves):
+            side = b.to_move
+            t0 = time.perf_counter()
+            b.select(target)
+            for idx in iter_bits(attackers):
+                b.select(idx)
+                hud[2].set(state_text(b.target_value(), b.attack_sum))
+            b.capture()
+            no_captures_left(b)
+            hud[0].set(turn_text(b.current_player))
+            hud[1].set(time_text(300, 300))
+            hud[2].set(state_text(b.target_value(), b.attack_sum))
+            total += time.perf_counter() - t0
+            b.undo_capture(target, attackers, side)
+            b.cache.clear()
+        return total * number / len(boards)
+    return run
+
+
+bench("engine.click_capture", number=200)(_click_capture)
+bench("engine.click_capture.30x30", number=20)(lambda number: _click_capture(number, PRESETS[-1]))
+
+
+def _reach_click(number, config=DEFAULT_CONFIG):
+    # élő kiemelés egy támadó-kattintás után (inkrementális frissítés, a körönkénti
+    # újraépítés nélkül): sync + completers + dead_targets
+    boards = _boards(8, config=config)
+    reach, own = [], []
+    for b in boards:
+        b.select(next(iter_bits(b.masks[1 - b.to_move])))
+        r = Reachability(b)
+        r.sync()
+        reach.append(r)
+        own.append(list(iter_bits(b.masks[b.to_move]))[:5])
+
+    def run():
+        total = 0.0
+        for i in range(number):
+            k = i % len(boards)
+            b, r = boards[k], reach[k]
+            b.select(own[k][i // len(boards) % 5])  # be / ki felváltva
+            t0 = time.perf_counter()
+            r.sync()
+            r.completers()
+            r.dead_targets()
+            total += time.perf_counter() - t0
+        return total
+    return run
+
+
+bench("reach.click", number=400)(_reach_click)
+bench("reach.click.30x30", number=100)(lambda number: _reach_click(number, PRESETS[-1]))
+
+
+def _finish(number, config=DEFAULT_CONFIG):
+    # finish_game pontozása + count_pieces / sum_values
+    boards = _boards(16, config=config)
+
+    def run():
+        t0 = time.perf_counter()
+        for i in range(number):
+            b = boards[i & 15]
+            b.finish("Idő")
+            for side in SIDES:
+                b.count_pieces(side)
+                b.sum_values(side)
+        return time.perf_counter() - t0
+    return run
+
+
+bench("engine.finish", number=2000)(_finish)
+bench("engine.finish.30x30", number=2000)(lambda number: _finish(number, PRESETS[-1]))
+
+
+@bench("history.format_stats", number=200)
+def _format_stats(number):
+    # statisztika szöveg nagy (HISTORY_ROWS) történetből, fájl-alapú adatbázissal
+    tmp = tempfile.mkdtemp(prefix="szsk-bench-")
+    h = MatchHistory(os.path.join(tmp, "history.sqlite3"))
+    rng = random.Random(SEED)
+    reasons = ("Idő", "Elfogyott", "Nincs ütés")
+    h.add_many(
+        GameResult(rng.choice(SIDES), rng.randrange(50), rng.randrange(50),
+                   rng.randrange(3000), rng.randrange(3000), rng.choice(reasons), rng.choice(SIDES))
+        for _ in range(HISTORY_ROWS)
+    )
+
+    def run():
+        t0 = time.perf_counter()
+        for _ in range(number):
+            stats_text(h.totals(), h.last())
+        return time.perf_counter() - t0
+    return run
+
+
+@bench("puzzles.generate", number=20)
+def _puzzles_generate(number):
+    # egy 2. szintű (3 támadós) egyértelmű feladvány keresése, egy magon (a generátor áteresztése)
+    def run():
+        t0 = time.perf_counter()
+        puzzles.generate_batch(SEED, 2, number)
+        return time.perf_counter() - t0
+    return run
+
+
+@bench("puzzles.load", number=1000)
+def _puzzles_load(number):
+    # egy feladvány betöltése a lusta (mmap) fájlból a játéktáblára, mint a GameScreen-en
+    path = os.path.join(tempfile.mkdtemp(prefix="szsk-bench-"), puzzles.FILE_NAME)
+    found = []
+    for level in range(1, puzzles.LEVELS):
+        found += puzzles.generate_batch(SEED + level, level, 20)
+    puzzles.write(path, found)
+    book = puzzles.PuzzleBook(path)
+    board = BoardState()
+
+    def run():
+        t0 = time.perf_counter()
+        for i in range(number):
+            book.load(1 + i % (puzzles.LEVELS - 1), i % 20, board)
+        return time.perf_counter() - t0
+    return run
+
+
+@bench("tracing.disabled", number=100_000)
+def _tracing_disabled(number):
+    # egy @traced hívás többletköltsége kikapcsolt nyomkövetésnél (vs. közvetlen hívás)
+    def plain():
+        return None
+
+    wrapped = tracing.traced("bench")(plain)
+
+    def run():
+        tracing.enable(False)
+        t0 = time.perf_counter()
+        for _ in range(number):
+            wrapped()
+        t1 = time.perf_counter()
+        for _ in range(number):
+            plain()
+        return max(0.0, (t1 - t0) - (time.perf_counter() - t1))
+    return run
+
+
+# ---------- Kivy (ablak nélkül) ----------
+def _kivy_env():
+    # az első Kivy import előtt: különben a Kivy a mi parancssori kapcsolóinkat is értelmezi
+    os.environ.setdefault("KIVY_NO_ARGS", "1")
+    os.environ.setdefault("KIVY_NO_CONSOLELOG", "1")
+    os.environ.setdefault("SDL_VIDEODRIVER", "offscreen")  # GL-képes; a "dummy" driverrel nincs GL-kontextus
+
+
+def _kivy_setup():
+    _kivy_env()
+    from kivy.uix.screenmanager import ScreenManager
+    import main
+    from gamescreen import GameScreen
+    sm = ScreenManager()
+    game = GameScreen(name="game")
+    sm.add_widget(game)
+    sm.add_widget(main.StatsScreen(name="stats"))
+    return main, sm, game
+
+
+@bench("kivy.board_view", number=20, kivy=True)
+def _board_view(number):
+    _kivy_env()
+    from boardview import BoardView
+    board = _boards(1)[0]
+
+    def run():
+        t0 = time.perf_counter()
+        for _ in range(number):
+            view = BoardView(board, size=(800, 800))
+            view._flush()
+        return time.perf_counter() - t0
+    return run
+
+
+@bench("kivy.start_new_game", number=50, kivy=True)
+def _start_new_game(number):
+    _, _, game = _kivy_setup()
+
+    def run():
+        random.seed(SEED)
+        t0 = time.perf_counter()
+        for _ in range(number):
+            game.start_new_game()
+            game.view._flush()
+        return time.perf_counter() - t0
+    return run
+
+
+@bench("kivy.click_capture", number=100, kivy=True)
+def _kivy_click(number):
+    # a teljes kattintás-út a GameScreen-en, a következő frame kirajzolásával
+    _, _, game = _kivy_setup()
+
+    def run():
+        # mintánként ugyanazok az osztások, üres elemzés-cache-sel (a korábbi mérések
+        # által feltöltött közös cache ne befolyásolja)
+        random.seed(SEED)
+        analysis.configure()
+        total, done = 0.0, 0
+        while done < number:
+            game.start_new_game()
+            game.view._flush()
+            move = _first_capture(game.board)
+            if move is None:
+                continue
+            target, attackers = move
+            t0 = time.perf_counter()
+            game.on_cell_click(target)
+            for idx in iter_bits(attackers):
+                game.on_cell_click(idx)
+            game.view._flush()
+            total += time.perf_counter() - t0
+            done += 1
+            game.clock.stop()
+        return total
+    return run
+
+
+# ---------- futtatás ----------
+def measure(make, number: int, repeat: int) -> dict:
+    run = make(number)
+    run()  # bemelegítés (cache, lusta importok)
+    samples = sorted(run() / number * 1e6 for _ in range(repeat))
+    return {
+        "median_us": round(statistics.median(samples), 3),
+        "min_us": round(samples[0], 3),
+        "p95_us": round(samples[min(len(samples) - 1, int(0.95 * len(samples)))], 3),
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def _commit() -> str:
+    # a mért kód: HEAD, "-dirty" ha a követett fájlok eltérnek tőle (a baseline maga nem számít)
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no", "--", ".",
+                                ":(exclude)benchmarks/baseline.json"], cwd=ROOT, capture_output=True, text=True)
+        return out.stdout.strip() + ("-dirty" if dirty.stdout.strip() else "")
+    except OSError:
+        return ""
+
+
+def _cpu() -> str:
+    # processzor-típus (Linuxon /proc/cpuinfo; platform.processor() ott gyakran üres)
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor()
+
+
+def run_suite(pattern: str = "", repeat: int = REPEAT, kivy: bool = True) -> dict:
+    results = {}
+    for name, number, needs_kivy, make in BENCHES:
+        if pattern and pattern not in name:
+            continue
+        if needs_kivy and not kivy:
+            results[name] = {"skipped": "--no-kivy"}
+            continue
+        try:
+            results[name] = measure(make, number, repeat)
+        except ImportError as e:
+            if not needs_kivy:
+                raise
+            results[name] = {"skipped": f"nincs Kivy ({e.name})"}
+        print(f"{name:24s} {_fmt(results[name])}", file=sys.stderr, flush=True)
+    return {
+        "meta": {
+            "time": time.time(),
+            "commit": _commit(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpu": _cpu(),
+            "cpus": os.cpu_count(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+
+def _fmt(r: dict) -> str:
+    if "skipped" in r:
+        return f"kihagyva: {r['skipped']}"
+    return f"{r['median_us']:10.2f} µs  (min {r['min_us']:.2f}, p95 {r['p95_us']:.2f})"
+
+
+def compare(data: dict, baseline: dict, tolerance: float) -> list[str]:
+    # a regressziók listája: medián > baseline * (1 + tolerance)
+    slow = []
+    base = baseline.get("results", {})
+    for name, r in data["results"].items():
+        b = base.get(name)
+        if "skipped" in r or not b or "skipped" in b:
+            continue
+        ratio = r["median_us"] / b["median_us"]
+        r["baseline_us"] = b["median_us"]
+        r["ratio"] = round(ratio, 3)
+        mark = "LASSABB" if ratio > 1 + tolerance else ""
+        print(f"{name:24s} {b['median_us']:10.2f} → {r['median_us']:10.2f} µs  ×{ratio:.2f} {mark}", file=sys.stderr)
+        if mark:
+            slow.append(name)
+    return slow
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Számos Sakk mérőcsomag")
+    ap.add_argument("-k", "--filter", default="", help="csak a nevében ezt tartalmazó mérések")
+    ap.add_argument("--repeat", type=int, default=REPEAT)
+    ap.add_argument("--no-kivy", action="store_true", help="a Kivy-s mérések kihagyása")
+    ap.add_argument("--out", help="eredmény JSON ide (alap: stdout)")
+    ap.add_argument("--baseline", help="összevetés ezzel a JSON-nal")
+    ap.add_argument("--tolerance", type=float, default=TOLERANCE)
+    ap.add_argument("--save-baseline", help="az eredmény mentése új baseline-ként")
+    args = ap.parse_args(argv)
+    if args.save_baseline and args.filter:
+        ap.error("--save-baseline csak a teljes csomaggal (-k nélkül)")
+
+    data = run_suite(args.filter, args.repeat, kivy=not args.no_kivy)
+
+    slow = []
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            slow = compare(data, json.load(f), args.tolerance)
+        data["regressions"] = slow
+
+    text = json.dumps(data, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    if args.save_baseline:
+        # a baseline egyetlen teljes futás egy gépen: kihagyott mérés (pl. nincs Kivy) nem kerülhet bele
+        skipped = [name for name, r in data["results"].items() if "skipped" in r]
+        if skipped:
+            print(f"Nem mentem a baseline-t, kihagyott mérések: {', '.join(skipped)}", file=sys.stderr)
+            return 2
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+    if slow:
+        print(f"Regresszió: {', '.join(slow)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
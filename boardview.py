@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+from kivy.clock import Clock
+from kivy.graphics import Color, Rectangle
+from kivy.metrics import dp, sp
+from kivy.uix.widget import Widget
+
+import tracing
+from engine import EMPTY, BoardState, iter_bits
+from numberatlas import number_atlas
+
+# Egyetlen widget a táblára: csak a látható mezőkhöz van canvas-utasítás (háttér +
+# szám), az érintést aritmetika képezi mezőre, és frame-enként csak a piszkos mezők
+# frissülnek. Ha a tábla nagyobb a nézetnél (pl. 30×30), húzással görgethető,
+# egérgörgővel nagyítható; a rajzolási munka a nézet méretével arányos.
+
+LIGHT = (0.94, 0.85, 0.72, 1)
+DARK = (0.70, 0.52, 0.38, 1)
+TARGET_BG = (0.78, 0.22, 0.22, 1)
+ATTACKER_BG = (0.25, 0.65, 0.25, 1)
+PIECE_BG = ((0.95, 0.95, 0.95, 1), (0.18, 0.18, 0.18, 1))  # Fehér / Fekete
+HINT_BG = ((0.80, 0.95, 0.80, 1), (0.16, 0.38, 0.16, 1))    # kiegészítheti a cél összegét
+DEAD_BG = ((0.70, 0.70, 0.70, 1), (0.34, 0.34, 0.34, 1))    # semmilyen kombináció nem üti
+NUMBER_COLOR = (0, 1, 0, 1)  # zöld szám
+
+SPACING = 2
+FONT_SIZE = 16  # sp
+NUMBER_FILL = 0.55  # a szám legfeljebb a mezőmagasság ekkora része
+MAX_VISIBLE = 12    # ennyi mező látszik egy sorban legfeljebb (nagyobb táblán görgetés)
+MIN_VISIBLE = 5     # legnagyobb nagyítás
+DRAG_SLOP = 10      # dp; ennél kisebb elmozdulás még kattintás
+
+
+class BoardView(Widget):
+    def __init__(self, board: BoardState, on_cell=None, visible: int = MAX_VISIBLE, scheduler=None, **kwargs):
+        super().__init__(**kwargs)
+        self.board = board
+        self.on_cell = on_cell  # on_cell(idx) érintéskor
+        self.max_visible = visible
+
+        self._font_px = int(sp(FONT_SIZE))
+        self._dirty = 0
+        # scheduler.Scheduler: háttérben / menüben a kirajzolás vár, folytatáskor egyben fut le
+        if scheduler is None:
+            self._redraw = Clock.create_trigger(self._flush, -1)
+        else:
+            self._redraw = scheduler.trigger("board.flush", self._flush)
+        self._drag = None  # (kezdő x, y, kezdő sor, oszlop, húzás-e)
+        self.hint_mask = 0  # kiemelt saját bábuk (reach.Reachability.completers)
+        self.dead_mask = 0  # halványított ellenséges bábuk (reach.Reachability.dead_targets)
+
+        self.bind(pos=self._layout, size=self._layout)
+        self._build()
+
+    # ---------- nézet ----------
+    def _build(self):
+        # a látható ablak (vis × vis mező) utasításai; tábla- vagy nagyításváltáskor újra
+        n = self.board.n
+        self._n = n
+        self.vis = min(n, self.max_visible)
+        self.row0 = self.col0 = 0
+
+        self.canvas.clear()
+        self._bg_colors = []
+        self._bg_rects = []
+        self._num_rects = []
+        with self.canvas:
+            for _ in range(self.vis * self.vis):
+                self._bg_colors.append(Color(*LIGHT))
+                self._bg_rects.append(Rectangle())
+            Color(*NUMBER_COLOR)
+            for _ in range(self.vis * self.vis):
+                self._num_rects.append(Rectangle(size=(0, 0)))
+        self._update_visible()
+        self._layout()
+
+    def _update_visible(self):
+        # a látható mezők maszkja (tábla-indexek): a flush ezzel szűr
+        n, vis = self.board.n, self.vis
+        row = ((1 << vis) - 1) << self.col0
+        mask = 0
+        for r in range(self.row0, self.row0 + vis):
+            mask |= row << (r * n)
+        self._visible = mask
+
+    def scroll_to(self, row0: int, col0: int):
+        limit = self.board.n - self.vis
+        row0 = max(0, min(limit, row0))
+        col0 = max(0, min(limit, col0))
+        if (row0, col0) == (self.row0, self.col0):
+            return
+        self.row0, self.col0 = row0, col0
+        self._update_visible()
+        self._shown = [None] * (self.vis * self.vis)
+        self.refresh_all()
+
+    def show_cell(self, idx: int):
+        # a mező a nézetbe görgetése (pl. tipp)
+        r, c = self.board.pos(idx)
+        row0 = min(max(self.row0, r - self.vis + 1), r)
+        col0 = min(max(self.col0, c - self.vis + 1), c)
+        self.scroll_to(row0, col0)
+
+    def zoom(self, step: int):
+        # step > 0: több mező látszik (kicsinyítés), < 0: nagyítás
+        n = self.board.n
+        vis = max(min(MIN_VISIBLE, n), min(n, self.vis + step))
+        if vis == self.vis:
+            return
+        center_r = self.row0 + self.vis // 2
+        center_c = self.col0 + self.vis // 2
+        self.max_visible = vis
+        self._build()
+        self.scroll_to(center_r - vis // 2, center_c - vis // 2)
+
+    # ---------- geometria ----------
+    def _cell_size(self) -> tuple[float, float]:
+        vis = self.vis
+        return (self.width - SPACING * (vis - 1)) / vis, (self.height - SPACING * (vis - 1)) / vis
+
+    def _slot_origin(self, slot: int, cw: float, ch: float) -> tuple[float, float]:
+        r, c = divmod(slot, self.vis)
+        # 0. sor felül, mint a GridLayout-ban
+        return self.x + c * (cw + SPACING), self.top - (r + 1) * ch - r * SPACING
+
+    def _layout(self, *_):
+        cw, ch = self._cell_size()
+        for slot, rect in enumerate(self._bg_rects):
+            rect.pos = self._slot_origin(slot, cw, ch)
+            rect.size = (cw, ch)
+        # a betűméret a mezőhöz igazodik; az atlasz csak új méretnél készül (flush-kor)
+        self._font_px = max(1, int(min(sp(FONT_SIZE), ch * NUMBER_FILL)))
+        # a számok helye a mező méretétől függ → mindent újra
+        self._shown = [None] * (self.vis * self.vis)  # slotonként kirajzolt (háttér, érték)
+        self.refresh_all()
+
+    def cell_at(self, x: float, y: float) -> int:
+        # -1, ha a pont mezők közötti résre vagy a táblán kívülre esik
+        if not self.collide_point(x, y):
+            return -1
+        vis = self.vis
+        cw, ch = self._cell_size()
+        c, dx = divmod(x - self.x, cw + SPACING)
+        r, dy = divmod(self.top - y, ch + SPACING)
+        if dx > cw or dy > ch or not (0 <= r < vis and 0 <= c < vis):
+            return -1
+        return self.board.index(self.row0 + int(r), self.col0 + int(c))
+
+    # ---------- érintés ----------
+    def on_touch_down(self, touch):
+        if not self.collide_point(*touch.pos):
+            return super().on_touch_down(touch)
+        if touch.is_mouse_scrolling:
+            self.zoom(1 if touch.button == "scrollup" else -1)
+            return True
+        if self.vis == self.board.n:
+            # az egész tábla látszik: kattintás azonnal, mint eddig
+            self._click(self.cell_at(*touch.pos))
+            return True
+        # görgethető nézet: húzás vagy (felengedéskor) kattintás
+        touch.grab(self)
+        self._drag = (touch.x, touch.y, self.row0, self.col0, False)
+        return True
+
+    def on_touch_move(self, touch):
+        if touch.grab_current is not self or self._drag is None:
+            return super().on_touch_move(touch)
+        x0, y0, row0, col0, dragging = self._drag
+        dx, dy = touch.x - x0, touch.y - y0
+        if not dragging and max(abs(dx), abs(dy)) < dp(DRAG_SLOP):
+            return True
+        self._drag = (x0, y0, row0, col0, True)
+        cw, ch = self._cell_size()
+        self.scroll_to(row0 + int(round(dy / (ch + SPACING))), col0 - int(round(dx / (cw + SPACING))))
+        return True
+
+    def on_touch_up(self, touch):
+        if touch.grab_current is not self:
+            return super().on_touch_up(touch)
+        touch.ungrab(self)
+        drag, self._drag = self._drag, None
+        if drag is not None and not drag[4]:
+            self._click(self.cell_at(*touch.pos))
+        return True
+
+    def _click(self, idx: int):
+        if idx >= 0 and self.on_cell is not None:
+            self.on_cell(idx)
+
+    # ---------- frissítés ----------
+    def refresh(self, mask: int):
+        # a mező-maszkot a következő frame előtt rajzoljuk ki (egy frame-ben összevonva)
+        if mask:
+            self._dirty |= mask
+            self._redraw()
+
+    def refresh_all(self):
+        self.refresh((1 << self.board.size) - 1)
+
+    def set_marks(self, hint: int, dead: int):
+        # csak a ténylegesen változó mezők rajzolódnak újra
+        changed = (hint ^ self.hint_mask) | (dead ^ self.dead_mask)
+        self.hint_mask = hint
+        self.dead_mask = dead
+        self.refresh(changed)
+
+    def _style(self, idx: int):
+        b = self.board
+        side = b.owners[idx]
+        if side == EMPTY:
+            r, c = b.pos(idx)
+            return (LIGHT if (r + c) % 2 == 0 else DARK), 0
+        if idx == b.target:
+            bg = TARGET_BG
+        elif b.attackers >> idx & 1:
+            bg = ATTACKER_BG
+        elif self.hint_mask >> idx & 1:
+            bg = HINT_BG[side]
+        elif self.dead_mask >> idx & 1:
+            bg = DEAD_BG[side]
+        else:
+            bg = PIECE_BG[side]
+        return bg, b.values[idx]
+
+    @tracing.traced("board.flush")
+    def _flush(self, *_):
+        if self.board.n != self._n:
+            # a tábla mérete megváltozott (új beállítás / betöltött mentés)
+            self._dirty = 0
+            self._build()
+            return
+        dirty, self._dirty = self._dirty & self._visible, 0
+        cw, ch = self._cell_size()
+        atlas = number_atlas(self._font_px, hi=self.board.config.value_max)
+        n, vis, row0, col0 = self.board.n, self.vis, self.row0, self.col0
+        for idx in iter_bits(dirty):
+            r, c = divmod(idx, n)
+            slot = (r - row0) * vis + (c - col0)
+            style = self._style(idx)
+            if style == self._shown[slot]:
+                continue
+            self._shown[slot] = style
+            bg, value = style
+            self._bg_colors[slot].rgba = bg
+
+            rect = self._num_rects[slot]
+            if not value:
+                rect.size = (0, 0)
+                continue
+            tex = atlas.get(value)
+            x, y = self._slot_origin(slot, cw, ch)
+            tw, th = tex.size
+            rect.texture = tex
+            rect.size = (tw, th)
+            rect.pos = (x + (cw - tw) / 2, y + (ch - th) / 2)
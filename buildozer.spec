@@ -10,18 +10,19 @@ package.domain = org.szamos
 # Forráskód
 # ===============================
 source.dir = .
-source.include_exts = py,kv,png,jpg,jpeg,wav,mp3
+source.include_exts = py,kv,png,jpg,jpeg,wav,mp3,tb,pz
 
 # ===============================
 # Verzió
 # ===============================
-version = 0.2
+version.regex = __version__ = ['"](.*)['"]
+version.filename = %(source.dir)s/main.py
 
 # ===============================
 # Követelmények
 # FONTOS: python3-at NEM kell ide írni
 # ===============================
-requirements = kivy
+requirements = kivy,sqlite3
 
 # ===============================
 # Képernyő
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import analysis
+from engine import SIDES, BoardState, iter_bits
+
+# Szabályos ütések generálása: a saját bábuk mely részhalmazainak összege
+# egyezik egy ellenséges bábu értékével. Bitset DP (prefix elérhetőségi
+# táblák) + lusta visszalépéses felsorolás, ami csak létező megoldásba lép.
+
+CACHE_LIMIT = 4096  # ennyi pozíció-elemzés felett a board.cache ürül
+
+
+class SumTable:
+    # egy oldal bábuinak részhalmaz-összegei 1..limit között
+    __slots__ = ("items", "prefix", "ways", "limit")
+
+    def __init__(self, board: BoardState, own_mask: int, limit: int | None = None):
+        values = board.values
+        if limit is None:
+            limit = board.config.value_max
+        self.limit = limit
+        self.items = sorted(
+            ((values[i], i) for i in iter_bits(own_mask) if values[i] <= limit),
+            key=lambda t: t[0],
+        )
+
+        # prefix[k]: az első k bábuval elérhető összegek bitmaszkja
+        full = (1 << (limit + 1)) - 1
+        reach = 1
+        self.prefix = [reach]
+        for v, _ in self.items:
+            reach |= (reach << v) & full
+            self.prefix.append(reach)
+        self.ways = None  # első count() hívásra készül (a keresésnek nem kell)
+
+    def reachable(self, total: int) -> bool:
+        return 0 < total <= self.limit and (self.prefix[-1] >> total) & 1 == 1
+
+    def count(self, total: int) -> int:
+        if not 0 < total <= self.limit:
+            return 0
+        if self.ways is None:
+            # ways[s]: hány részhalmaz összege pontosan s
+            limit = self.limit
+            ways = [1] + [0] * limit
+            for v, _ in self.items:
+                for s in range(limit, v - 1, -1):
+                    ways[s] += ways[s - v]
+            self.ways = ways
+        return self.ways[total]
+
+    def iter_subsets(self, total: int):
+        # támadó-maszkok, amelyek összege = total (lusta, minden ág megoldáshoz vezet)
+        if not self.reachable(total):
+            return
+        items = self.items
+        prefix = self.prefix
+        stack = [(len(items), total, 0)]
+        while stack:
+            k, rem, mask = stack.pop()
+            if rem == 0:
+                yield mask
+                continue
+            v, idx = items[k - 1]
+            below = prefix[k - 1]
+            if (below >> rem) & 1:
+                stack.append((k - 1, rem, mask))
+            if v <= rem and (below >> (rem - v)) & 1:
+                stack.append((k - 1, rem - v, mask | (1 << idx)))
+
+
+def _side(board: BoardState, side: str | None) -> int:
+    return board.to_move if side is None else SIDES.index(side)
+
+
+def sum_table(board: BoardState, side: str | None = None) -> SumTable:
+    s = _side(board, side)
+    own = board.masks[s]
+    # egy játékon belül a mezők értéke nem változik → a saját maszk elég kulcsnak
+    key = ("sums", own)
+    table = board.cache.get(key)
+    if table is None:
+        if len(board.cache) >= CACHE_LIMIT:
+            board.cache.clear()
+        table = SumTable(board, own)
+        board.cache[key] = table
+    return table
+
+
+def _targets(board: BoardState, s: int, target: int | None):
+    if target is not None:
+        return (target,) if board.owners[target] == 1 - s else ()
+    return iter_bits(board.masks[1 - s])
+
+
+def iter_captures(board: BoardState, side: str | None = None, target: int | None = None):
+    # (cél index, támadó maszk) párok lustán
+    s = _side(board, side)
+    table = sum_table(board, SIDES[s])
+    values = board.values
+    for t in _targets(board, s, target):
+        for mask in table.iter_subsets(values[t]):
+            yield t, mask
+
+
+def _decode_captures(found) -> tuple[tuple[int, int], ...]:
+    return tuple(tuple(m) for m in found)
+
+
+def legal_captures(board: BoardState, side: str | None = None, target: int | None = None) -> tuple[tuple[int, int], ...]:
+    # a megosztott elemzés-cache-en át (ugyanaz az állás később / újraindítás után is);
+    # a cache-elt objektumot adjuk vissza → változtathatatlan (tuple)
+    s = _side(board, side)
+    return analysis.shared().memo(
+        board, f"captures:{s}:{target}",
+        lambda b: tuple(iter_captures(b, SIDES[s], target)), _decode_captures,
+    )
+
+
+def _count(board: BoardState, s: int, target: int | None) -> int:
+    table = sum_table(board, SIDES[s])
+    values = board.values
+    return sum(table.count(values[t]) for t in _targets(board, s, target))
+
+
+def count_captures(board: BoardState, side: str | None = None, target: int | None = None) -> int:
+    s = _side(board, side)
+    return analysis.shared().memo(board, f"count:{s}:{target}", lambda b: _count(b, s, target))
+
+
+def has_capture(board: BoardState, side: str | None = None) -> bool:
+    s = _side(board, side)
+    table = sum_table(board, SIDES[s])
+    values = board.values
+    return any(table.reachable(values[t]) for t in iter_bits(board.masks[1 - s]))
+
+
+def no_captures_left(board: BoardState) -> bool:
+    # egyik oldal sem tud már ütni → a játék nem változhat tovább
+    return not has_capture(board, SIDES[0]) and not has_capture(board, SIDES[1])
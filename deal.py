@@ -0,0 +1,104 @@
+from __future__ import annotations
+import math
+import random
+from dataclasses import dataclass
+from functools import lru_cache
+
+from engine import DEFAULT_CONFIG, SIDES, VALUE_MAX, BoardConfig, BoardState
+
+# Kiegyensúlyozott, seed-elhető osztás: sok véletlen jelöltből azt választjuk,
+# ahol a két oldal kezdő ütés-lehetőségeinek száma a legközelebb van egymáshoz.
+# A részhalmaz-összegek számát egyetlen nagy egészben számoljuk: összegenként
+# egy LANE bites "sáv", bábunként egy eltolás + összeadás (bitset DP).
+
+LANE = 24  # 1..128 különböző számainak legtöbb részhalmaza egy összegre ~4M < 2**24
+FAIRNESS = 0.9         # elfogadható arány: kisebb / nagyobb ütésszám
+MAX_CANDIDATES = 256   # az alap táblán ennyi jelölt után a legjobbat vesszük (nagyobb táblán kevesebb)
+
+
+@lru_cache(maxsize=None)
+def lane_bits(limit: int) -> int:
+    # sávszélesség: egy összeg részhalmazainak száma legfeljebb p(limit) < exp(pi * sqrt(2 * limit / 3))
+    # (partíciószám-becslés); 128-ig a pontos, kisebb LANE is elég
+    if limit <= VALUE_MAX:
+        return LANE
+    return math.ceil(math.pi * math.sqrt(2 * limit / 3) / math.log(2)) + 1
+
+
+def subset_counts(values, limit: int = VALUE_MAX, lane: int = LANE) -> int:
+    # sávos egész: (W >> s*lane) & sávmaszk = hány részhalmaz összege pontosan s
+    full = (1 << ((limit + 1) * lane)) - 1
+    w = 1
+    for v in values:
+        if v <= limit:
+            w = (w + (w << (v * lane))) & full
+    return w
+
+
+def capture_count(own, enemy, limit: int = VALUE_MAX) -> int:
+    # a saját számokból kirakható ütések száma az ellenfél összes bábujára
+    lane = lane_bits(limit)
+    w = subset_counts(own, limit, lane)
+    mask = (1 << lane) - 1
+    return sum((w >> (v * lane)) & mask for v in enemy)
+
+
+@dataclass
+class Deal:
+    seed: int
+    first: str
+    black: list[int]
+    white: list[int]
+    white_captures: int   # Fehér kezdő ütés-lehetőségei
+    black_captures: int
+    candidates: int       # hány jelöltet néztünk meg
+
+    @property
+    def fairness(self) -> float:
+        lo, hi = sorted((self.white_captures, self.black_captures))
+        return lo / hi if hi else 0.0
+
+    @property
+    def dead(self) -> bool:
+        # egyik oldal sem tud ütni: az osztás rögtön véget érne (nem választjuk)
+        return not (self.white_captures or self.black_captures)
+
+
+def candidate_cap(config: BoardConfig, max_candidates: int = MAX_CANDIDATES) -> int:
+    # egy jelölt pontozása ~ bábuszám × legnagyobb érték; a jelöltszámot ennek arányában
+    # csökkentjük, hogy a legrosszabb eset minden táblán hasonló ideig tartson
+    # (alap: 256, 20×20: 16, 30×30: 3) – időmérés nélkül, így a seed mindig ugyanazt adja
+    base = DEFAULT_CONFIG.per_side * DEFAULT_CONFIG.value_max
+    work = config.per_side * config.value_max
+    return max(1, min(max_candidates, max_candidates * base // work))
+
+
+def balanced_deal(seed: int | None = None, fairness: float = FAIRNESS,
+                  max_candidates: int = MAX_CANDIDATES, config: BoardConfig = DEFAULT_CONFIG) -> Deal:
+    # ugyanaz a seed + paraméterek → ugyanaz az osztás
+    if seed is None:
+        seed = random.getrandbits(32)
+    rng = random.Random(seed)
+    first = rng.choice(SIDES)
+    k = config.per_side
+    limit = config.value_max
+    pool = range(config.value_min, config.value_max + 1)
+    cap = candidate_cap(config, max_candidates)
+
+    best = None
+    for tried in range(1, max_candidates + 1):
+        numbers = rng.sample(pool, 2 * k)
+        black, white = numbers[:k], numbers[k:]
+        deal = Deal(seed, first, black, white,
+                    capture_count(white, black, limit), capture_count(black, white, limit), tried)
+        if best is None or (best.dead and not deal.dead) or deal.fairness > best.fairness:
+            best = deal
+        # holt osztás (senki sem tud ütni) helyett a kereten túl is keresünk, max_candidates-ig
+        if best.fairness >= fairness or (tried >= cap and not best.dead):
+            break
+    best.candidates = tried
+    return best
+
+
+def deal_board(board: BoardState, deal: Deal):
+    board.setup(deal.black, deal.white, deal.first)
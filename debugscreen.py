@@ -0,0 +1,79 @@
+from __future__ import annotations
+import os
+from datetime import datetime
+
+from kivy.app import App
+from kivy.clock import Clock
+from kivy.logger import Logger
+from kivy.uix.screenmanager import Screen
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.label import Label
+from kivy.uix.button import Button
+from kivy.utils import platform
+
+import analysis
+import startup
+import tracing
+from hud import cache_text, sched_text
+from ui import SCHED
+
+# Fejlesztői képernyő (lustán betöltve): nyomkövetés, elemzés-cache, ütemező-számlálók.
+
+TRACE_FILE = "trace-{:%Y%m%d-%H%M%S}.json"
+
+
+class DebugScreen(Screen):
+    # fejlesztői menü: nyomkövetés be/ki + mentés Chrome trace JSON-ként
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+        root = BoxLayout(orientation="vertical", padding=16, spacing=12)
+        root.add_widget(Label(text="[b]Fejlesztői menü[/b]", markup=True, font_size="26sp", size_hint=(1, None), height=50))
+        self.lbl_body = Label(text="", font_size="15sp")
+        self.btn_trace = Button(text="", size_hint=(1, None), height=54)
+        btn_dump = Button(text="Nyomkövetés mentése (Chrome trace)", size_hint=(1, None), height=54)
+        btn_clear = Button(text="Puffer ürítése", size_hint=(1, None), height=54)
+        btn_cache = Button(text="Elemzés-cache ürítése", size_hint=(1, None), height=54)
+        btn_counters = Button(text="Ébresztés-számlálók nullázása", size_hint=(1, None), height=54)
+        btn_back = Button(text="Vissza", size_hint=(1, None), height=54)
+
+        self.btn_trace.bind(on_release=lambda *_: self.toggle_trace())
+        btn_dump.bind(on_release=lambda *_: self.dump())
+        btn_clear.bind(on_release=lambda *_: (tracing.clear(), self.refresh()))
+        btn_cache.bind(on_release=lambda *_: (analysis.shared().clear(), self.refresh("Elemzés-cache ürítve.")))
+        btn_counters.bind(on_release=lambda *_: (SCHED.reset_stats(), self.refresh()))
+        btn_back.bind(on_release=lambda *_: setattr(self.manager, "current", "stats"))
+
+        root.add_widget(self.lbl_body)
+        root.add_widget(self.btn_trace)
+        root.add_widget(btn_dump)
+        root.add_widget(btn_clear)
+        root.add_widget(btn_cache)
+        root.add_widget(btn_counters)
+        root.add_widget(btn_back)
+        self.add_widget(root)
+
+    def on_pre_enter(self, *args):
+        self.refresh()
+
+    def refresh(self, msg: str = ""):
+        state = "BE" if tracing.enabled() else "KI"
+        self.btn_trace.text = f"Nyomkövetés: {state}"
+        self.lbl_body.text = (
+            f"Nyomkövetés: {state}\n"
+            f"Események a pufferben: {tracing.count()} / {tracing.RING_SIZE}\n"
+            f"{cache_text(analysis.shared().stats())}\n"
+            f"{sched_text(SCHED.stats(), Clock.frames_displayed)}\n"
+            f"Indulás: {startup.summary(startup.report())}\n\n{msg}"
+        )
+
+    def toggle_trace(self):
+        App.get_running_app().set_tracing(not tracing.enabled())
+        self.refresh()
+
+    def dump(self):
+        app = App.get_running_app()
+        path = os.path.join(app.user_data_dir, TRACE_FILE.format(datetime.now()))
+        n = tracing.dump(path, version=app.version, platform=platform)
+        Logger.info(f"Trace: {n} esemény → {path}")
+        self.refresh(f"Mentve: {path}")
@@ -0,0 +1,339 @@
+from __future__ import annotations
+import random
+from array import array
+from dataclasses import dataclass
+
+# Kivy-független játékmotor: a tábla állapota tömbökben + bitmaszkokban,
+# a darabszám / összérték inkrementálisan frissül (játék vége ellenőrzés O(1)).
+
+WHITE = "Fehér"
+BLACK = "Fekete"
+DRAW = "Döntetlen"
+SIDES = (WHITE, BLACK)  # index = oldal (0 = Fehér, 1 = Fekete)
+
+BOARD_N = 10
+TURN_SECONDS = 5 * 60  # 5 perc / játékos
+VALUE_MIN = 1
+VALUE_MAX = 128
+BOARD_N_LIMIT = 255     # a mentés / napló fejléce egy bájton tárolja n-t
+VALUE_LIMIT = 4095      # a legnagyobb beállítható érték (Zobrist tábla mérete)
+
+EMPTY = -1  # owners[] értéke üres mezőn
+
+# Zobrist kulcsok: (oldal, érték) párokra + "Fekete lép" bit. Egy táblán minden
+# szám egyedi, és az ütés nem függ a mező helyétől, így ez a pozíció kulcsa.
+_zrng = random.Random(0x5A0B)
+ZOBRIST = [[_zrng.getrandbits(64) for _ in range(VALUE_LIMIT + 1)] for _ in range(2)]
+ZOBRIST_BLACK = _zrng.getrandbits(64)
+
+# select() eredményei
+SEL_EMPTY = "empty"
+SEL_TARGET = "target"
+SEL_UNTARGET = "untarget"
+SEL_ATTACKER = "attacker"
+SEL_UNATTACKER = "unattacker"
+
+
+def other(side: str) -> str:
+    return BLACK if side == WHITE else WHITE
+
+
+def iter_bits(mask: int):
+    # bitmaszk beállított bitjeinek indexei, növekvő sorrendben
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+@dataclass(frozen=True)
+class BoardConfig:
+    # táblaméret, értéktartomány, bábuk oldalanként (0 = a tábla fele)
+    n: int = BOARD_N
+    value_min: int = VALUE_MIN
+    value_max: int = VALUE_MAX
+    pieces: int = 0
+
+    def __post_init__(self):
+        if not 2 <= self.n <= BOARD_N_LIMIT:
+            raise ValueError(f"táblaméret: 2..{BOARD_N_LIMIT}")
+        if not 1 <= self.value_min <= self.value_max <= VALUE_LIMIT:
+            raise ValueError(f"értéktartomány: 1..{VALUE_LIMIT}")
+        per_side = self.per_side
+        if per_side < 1 or 2 * per_side > self.n * self.n:
+            raise ValueError("bábuk száma: oldalanként legfeljebb a tábla fele")
+        if self.value_max - self.value_min + 1 < 2 * per_side:
+            raise ValueError("az értéktartomány kisebb, mint a bábuk száma (minden szám egyedi)")
+
+    @property
+    def per_side(self) -> int:
+        return self.pieces or self.n * self.n // 2
+
+    @property
+    def label(self) -> str:
+        return f"{self.n}×{self.n}"
+
+
+DEFAULT_CONFIG = BoardConfig()
+# a menüből választható táblák; a nagyobbakon a BoardView görgethető / nagyítható
+PRESETS = (
+    DEFAULT_CONFIG,
+    BoardConfig(20, VALUE_MIN, 512),
+    BoardConfig(30, VALUE_MIN, 1024),
+)
+
+
+@dataclass
+class GameResult:
+    winner: str  # "Fehér" / "Fekete" / "Döntetlen"
+    white_left: int
+    black_left: int
+    white_sum: int
+    black_sum: int
+    reason: str  # "Idő" / "Elfogyott" / stb.
+    first: str = ""  # ki kezdett (kezdő-előny elemzéshez)
+
+
+class BoardState:
+    def __init__(self, n: int = BOARD_N, config: BoardConfig | None = None):
+        self.config = config or (DEFAULT_CONFIG if n == BOARD_N else BoardConfig(n))
+        self.n = n = self.config.n
+        self.size = n * n
+        self.values = array("H", [0]) * self.size       # ütés után is megmarad (visszavonáshoz)
+        self.owners = array("b", [EMPTY]) * self.size   # 0 / 1 / EMPTY
+        self.masks = [0, 0]   # oldalanként: melyik mezőn van bábu
+        self.counts = [0, 0]
+        self.sums = [0, 0]
+        self.to_move = 0
+        self.first = 0
+        self.zobrist = 0      # inkrementálisan frissített pozíció-kulcs
+
+        # kijelölés: cél mező indexe (-1 = nincs) + támadók bitmaszkja
+        self.target = -1
+        self.attackers = 0
+        self.attack_sum = 0
+
+        # pozícióhoz kötött elemzések (pl. ütés-generátor táblái); új játéknál ürül
+        self.cache: dict = {}
+
+    # ---------- koordináták ----------
+    def index(self, row: int, col: int) -> int:
+        return row * self.n + col
+
+    def pos(self, idx: int) -> tuple[int, int]:
+        return divmod(idx, self.n)
+
+    def copy(self) -> BoardState:
+        # független másolat (pl. háttérszálon futó kereséshez); az elemzés-cache nem öröklődik
+        b = BoardState.__new__(BoardState)
+        b.config = self.config
+        b.n = self.n
+        b.size = self.size
+        b.values = array("H", self.values)
+        b.owners = array("b", self.owners)
+        b.masks = list(self.masks)
+        b.counts = list(self.counts)
+        b.sums = list(self.sums)
+        b.to_move = self.to_move
+        b.first = self.first
+        b.zobrist = self.zobrist
+        b.target = self.target
+        b.attackers = self.attackers
+        b.attack_sum = self.attack_sum
+        b.cache = {}
+        return b
+
+    # ---------- lekérdezések ----------
+    @property
+    def current_player(self) -> str:
+        return SIDES[self.to_move]
+
+    @property
+    def enemy(self) -> str:
+        return SIDES[1 - self.to_move]
+
+    def owner_at(self, idx: int) -> str | None:
+        side = self.owners[idx]
+        return None if side == EMPTY else SIDES[side]
+
+    def value_at(self, idx: int) -> int | None:
+        return None if self.owners[idx] == EMPTY else self.values[idx]
+
+    def count_pieces(self, owner: str) -> int:
+        return self.counts[SIDES.index(owner)]
+
+    def sum_values(self, owner: str) -> int:
+        return self.sums[SIDES.index(owner)]
+
+    def selection_mask(self) -> int:
+        m = self.attackers
+        if self.target >= 0:
+            m |= 1 << self.target
+        return m
+
+    def target_value(self) -> int | None:
+        return None if self.target < 0 else self.values[self.target]
+
+    def is_over(self) -> bool:
+        return self.counts[0] == 0 or self.counts[1] == 0
+
+    # ---------- új játék ----------
+    def configure(self, config: BoardConfig):
+        # más méretű / tartományú tábla; üresen marad (new_game / setup tölti)
+        self.config = config
+        self.n = config.n
+        self.size = config.n * config.n
+        self.reset()
+
+    def reset(self, to_move: int = 0, first: int | None = None):
+        # üres tábla; utána place()-szel tölthető (pl. mentett állásból)
+        self.values = array("H", [0]) * self.size
+        self.owners = array("b", [EMPTY]) * self.size
+        self.masks = [0, 0]
+        self.counts = [0, 0]
+        self.sums = [0, 0]
+        self.to_move = to_move
+        self.first = to_move if first is None else first
+        self.zobrist = ZOBRIST_BLACK if to_move else 0
+        self.target = -1
+        self.attackers = 0
+        self.attack_sum = 0
+        self.cache.clear()
+
+    def place(self, idx: int, side: int, value: int):
+        self._put(idx, side, value)
+
+    def setup(self, black_nums, white_nums, first: str = WHITE):
+        # fekete felülről, fehér alulról (sorfolytonosan); teli táblán felső fele / alsó fele
+        self.reset(SIDES.index(first))
+
+        for i, v in enumerate(black_nums):
+            self._put(i, 1, v)
+        start = self.size - len(white_nums)
+        for i, v in enumerate(white_nums):
+            self._put(start + i, 0, v)
+
+    def new_game(self, rng: random.Random | None = None):
+        rng = rng or random
+        cfg = self.config
+        first = rng.choice(SIDES)
+        # ÚJ JÁTÉKSZABÁLY: minden szám különböző (alaptábla: 100 szám 1..128 között)
+        k = cfg.per_side
+        numbers = rng.sample(range(cfg.value_min, cfg.value_max + 1), 2 * k)
+        self.setup(numbers[:k], numbers[k:], first)
+
+    def _put(self, idx: int, side: int, value: int):
+        self.values[idx] = value
+        self.owners[idx] = side
+        self.masks[side] |= 1 << idx
+        self.counts[side] += 1
+        self.sums[side] += value
+        self.zobrist ^= ZOBRIST[side][value]
+
+    def _take(self, idx: int):
+        side = self.owners[idx]
+        self.masks[side] &= ~(1 << idx)
+        self.counts[side] -= 1
+        self.sums[side] -= self.values[idx]
+        self.zobrist ^= ZOBRIST[side][self.values[idx]]
+        self.owners[idx] = EMPTY
+
+    # ---------- kijelölés ----------
+    def select(self, idx: int) -> str:
+        side = self.owners[idx]
+        if side == EMPTY:
+            self.clear_selection()
+            return SEL_EMPTY
+
+        # cél: ellenség (toggle)
+        if side != self.to_move:
+            if self.target == idx:
+                self.target = -1
+                return SEL_UNTARGET
+            self.target = idx
+            return SEL_TARGET
+
+        # támadók: saját
+        bit = 1 << idx
+        if self.attackers & bit:
+            self.attackers ^= bit
+            self.attack_sum -= self.values[idx]
+            return SEL_UNATTACKER
+        self.attackers |= bit
+        self.attack_sum += self.values[idx]
+        return SEL_ATTACKER
+
+    def clear_selection(self):
+        self.target = -1
+        self.attackers = 0
+        self.attack_sum = 0
+
+    # ---------- lépések ----------
+    def can_capture(self) -> bool:
+        return self.target >= 0 and self.attackers != 0 and self.attack_sum == self.values[self.target]
+
+    def legal_capture(self, target: int, attackers: int) -> bool:
+        # kívülről érkező (pl. hálózati) ütés ellenőrzése, ugyanazzal a szabállyal, mint can_capture
+        s = self.to_move
+        if not 0 <= target < self.size or self.owners[target] != 1 - s:
+            return False
+        if attackers <= 0 or attackers & ~self.masks[s]:
+            return False
+        return sum(self.values[i] for i in iter_bits(attackers)) == self.values[target]
+
+    def capture(self) -> int:
+        # a kijelölt ütés végrehajtása; visszaadja az eltűnt mezők maszkját (0 = nem volt ütés)
+        if not self.can_capture():
+            return 0
+        return self.apply_capture(self.target, self.attackers)
+
+    def apply_capture(self, target: int, attackers: int) -> int:
+        # ÜTÉS: cél + támadók eltűnnek; ha nincs vége, kör váltás
+        removed = attackers | (1 << target)
+        self._take(target)
+        for idx in iter_bits(attackers):
+            self._take(idx)
+        self.clear_selection()
+        if not self.is_over():
+            self._switch()
+        return removed
+
+    def undo_capture(self, target: int, attackers: int, side: int):
+        # apply_capture visszavonása; side = az ütő oldal indexe
+        values = self.values
+        if self.to_move != side:
+            self._switch()
+        self._put(target, 1 - side, values[target])
+        for idx in iter_bits(attackers):
+            self._put(idx, side, values[idx])
+
+    def pass_turn(self):
+        self.clear_selection()
+        self._switch()
+
+    def _switch(self):
+        self.to_move ^= 1
+        self.zobrist ^= ZOBRIST_BLACK
+
+    # ---------- játék vége ----------
+    def finish(self, reason: str) -> GameResult:
+        w_cnt, b_cnt = self.counts
+        w_sum, b_sum = self.sums
+
+        # Győztes logika (időnél is ez)
+        if w_cnt != b_cnt:
+            winner = WHITE if w_cnt > b_cnt else BLACK
+        elif w_sum != b_sum:
+            winner = WHITE if w_sum > b_sum else BLACK
+        else:
+            winner = DRAW
+
+        return GameResult(
+            winner=winner,
+            white_left=w_cnt,
+            black_left=b_cnt,
+            white_sum=w_sum,
+            black_sum=b_sum,
+            reason=reason,
+            first=SIDES[self.first],
+        )
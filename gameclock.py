@@ -0,0 +1,63 @@
+from __future__ import annotations
+import math
+import time
+
+from engine import TURN_SECONDS
+
+# Sakkóra monoton időből: a maradék időt nem tick-enként vonjuk le, hanem az
+# indítás óta eltelt valódi időből számoljuk, így késő frame-ek, szünet és
+# körváltás sem okoz elcsúszást. Kivy-független (a "now" cserélhető teszthez).
+
+
+class GameClock:
+    def __init__(self, seconds: float = TURN_SECONDS, side: int = 0, now=time.monotonic):
+        self.now = now
+        self.reset(seconds, side)
+
+    def reset(self, seconds: float, side: int):
+        self.remaining = [float(seconds), float(seconds)]
+        self.side = side          # kinek fogy az ideje
+        self.finished = False
+        self._started = None      # None = áll
+
+    @property
+    def running(self) -> bool:
+        return self._started is not None
+
+    def start(self):
+        if self._started is None and not self.finished:
+            self._started = self.now()
+
+    def pause(self):
+        if self._started is not None:
+            self.remaining[self.side] -= self.now() - self._started
+            self._started = None
+
+    def switch(self, side: int):
+        # körváltás: az eddigi idő a régi oldalhoz számít, pontosan a váltás pillanatáig
+        if side == self.side:
+            return
+        running = self.running
+        self.pause()
+        self.side = side
+        if running:
+            self.start()
+
+    def stop(self):
+        self.pause()
+        self.finished = True
+
+    def left(self, side: int) -> float:
+        r = self.remaining[side]
+        if self._started is not None and side == self.side:
+            r -= self.now() - self._started
+        return max(0.0, r)
+
+    def expired(self) -> bool:
+        return self.left(self.side) <= 0
+
+    def until_next_second(self) -> float:
+        # mennyi idő múlva változik a kijelzett (egész másodperc) érték
+        left = self.left(self.side)
+        frac = left - math.floor(left)
+        return frac if frac > 0 else 1.0
@@ -0,0 +1,774 @@
+from __future__ import annotations
+import base64
+import os
+import time
+
+from kivy.app import App
+from kivy.clock import Clock
+from kivy.logger import Logger
+from kivy.uix.screenmanager import Screen
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.label import Label
+from kivy.uix.button import Button
+
+from boardview import BoardView
+from ai import PASS, AIPlayer, think_time
+from gameclock import GameClock
+from netclient import NetClient, parse_address
+import puzzles
+import scheduler
+import snapshot
+import tracing
+from hud import HudText, endgame_text, state_text, time_text, turn_text
+import movelog
+from movelog import MoveLog
+from deal import FAIRNESS, balanced_deal, deal_board
+from reach import Reachability
+from captures import count_captures, iter_captures, no_captures_left
+from ui import LAST_GAME_LOG, SCHED, popup
+from engine import (
+    BLACK,
+    BOARD_N,
+    DEFAULT_CONFIG,
+    TURN_SECONDS,
+    SEL_EMPTY,
+    SEL_TARGET,
+    SEL_UNTARGET,
+    SIDES,
+    WHITE,
+    BoardConfig,
+    BoardState,
+    iter_bits,
+)
+
+# A játéktábla képernyője (helyi, gép elleni, online és feladvány mód). Külön modul,
+# hogy a menü első frame-je ne fizesse a gép, a hálózat és az elemzés importját:
+# a LazyScreenManager az első odanavigáláskor tölti be.
+
+SERVER_ENV = "SZAMOS_SERVER"  # online játék szervere: "host:port" (alap: 127.0.0.1:8765)
+TICK_SLACK = 0.01  # a tick a kijelzett másodperc váltása után ennyivel fut
+PUZZLE_NEXT_DELAY = 1.5  # mp; megoldás után ennyivel jön a következő feladvány
+
+
+class GameScreen(Screen):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+        # a teljes játékállapot a motorban van, a képernyő csak kirajzolja
+        self.board = BoardState(BOARD_N)
+        self.board_config = DEFAULT_CONFIG  # a játékos választotta tábla (feladvány / online nem írja át)
+        self.clock = GameClock(TURN_SECONDS)
+        self._paused = False
+        self.moves = MoveLog(self.board)  # az aktuális játék lépésnaplója (visszavonáskor pop)
+        self.redo: list[movelog.Move] = []  # visszavont lépések; új lépésnél ürül
+        self.reach = Reachability(self.board)  # élő kiemelés: ki egészítheti ki a célt
+
+        # gépi ellenfél (None = hot-seat); a keresés háttérszálon fut
+        self.ai = AIPlayer()
+        self.ai_side: str | None = None
+        self._ai_key = None
+
+        # online játék: a szerver a hiteles állás és óra, a kliens csak lépést küld
+        self.net: NetClient | None = None
+        self.net_side: int | None = None
+
+        # feladvány mód: a puzzles.PuzzleBook lustán nyílik, a haladás (szint, sorszám) megmarad
+        self.puzzles: puzzles.PuzzleBook | None = None
+        self.puzzle: puzzles.Puzzle | None = None
+        self.puzzle_progress = (1, 0)
+
+        root = BoxLayout(orientation="vertical", padding=10, spacing=8)
+
+        # ===== HUD (2 sor) =====
+        hud = BoxLayout(orientation="vertical", size_hint=(1, None), height=92, spacing=6, padding=(4, 4))
+        row1 = BoxLayout(orientation="horizontal", size_hint=(1, None), height=44, spacing=8)
+
+        self.lbl_turn = Label(text="Soron: -", font_size="18sp", size_hint=(0.22, 1))
+        self.lbl_time = Label(text=time_text(TURN_SECONDS, TURN_SECONDS), font_size="18sp", size_hint=(0.44, 1))
+        self.lbl_state = Label(text="Cél: - | Összeg: 0", font_size="18sp", size_hint=(0.34, 1))
+
+        row1.add_widget(self.lbl_turn)
+        row1.add_widget(self.lbl_time)
+        row1.add_widget(self.lbl_state)
+
+        row2 = BoxLayout(orientation="horizontal", size_hint=(1, None), height=42, spacing=8)
+        btn_pass = Button(text="Kör vége", size_hint=(0.13, 1))
+        btn_clear = Button(text="Törlés", size_hint=(0.11, 1))
+        btn_hint = Button(text="Tipp", size_hint=(0.09, 1))
+        btn_undo = Button(text="Visszavon", size_hint=(0.12, 1))
+        btn_redo = Button(text="Újra", size_hint=(0.08, 1))
+        self.btn_pause = Button(text="Szünet", size_hint=(0.11, 1))
+        btn_new = Button(text="Új játék", size_hint=(0.13, 1))
+        btn_menu = Button(text="Menü", size_hint=(0.10, 1))
+        btn_stats = Button(text="Statisztika", size_hint=(0.13, 1))
+
+        btn_pass.bind(on_release=lambda *_: self.pass_turn())
+        btn_clear.bind(on_release=lambda *_: self.clear_selections("Kijelölések törölve."))
+        btn_hint.bind(on_release=lambda *_: self.show_hint())
+        btn_undo.bind(on_release=lambda *_: self.undo())
+        btn_redo.bind(on_release=lambda *_: self.redo_move())
+        self.btn_pause.bind(on_release=lambda *_: self.toggle_pause())
+        btn_new.bind(on_release=lambda *_: self.start_new_game())
+        btn_menu.bind(on_release=lambda *_: setattr(self.manager, "current", "menu"))
+        btn_stats.bind(on_release=lambda *_: setattr(self.manager, "current", "stats"))
+
+        row2.add_widget(btn_pass)
+        row2.add_widget(btn_clear)
+        row2.add_widget(btn_hint)
+        row2.add_widget(btn_undo)
+        row2.add_widget(btn_redo)
+        row2.add_widget(self.btn_pause)
+        row2.add_widget(btn_new)
+        row2.add_widget(btn_stats)
+        row2.add_widget(btn_menu)
+
+        hud.add_widget(row1)
+        hud.add_widget(row2)
+
+        # a HUD label-ek csak tényleges szövegváltozáskor kapnak új textúrát
+        self.hud_turn = HudText(self.lbl_turn)
+        self.hud_time = HudText(self.lbl_time)
+        self.hud_state = HudText(self.lbl_state)
+        self.hud_pause = HudText(self.btn_pause)
+
+        # ===== BOARD =====
+        # egyetlen canvas-os widget, csak a változott mezőket rajzolja újra
+        self.view = BoardView(self.board, on_cell=self.on_cell_click, size_hint=(1, 1), scheduler=SCHED)
+
+        self.lbl_info = Label(
+            text="1) CÉL: ellenségre katt. 2) TÁMADÓK: sajátokra katt (vegyesen is). Ha összeg=cél → ütés.",
+            font_size="14sp",
+            size_hint=(1, None),
+            height=44,
+        )
+
+        root.add_widget(hud)
+        root.add_widget(self.view)
+        root.add_widget(self.lbl_info)
+        self.add_widget(root)
+
+    @property
+    def current_player(self) -> str:
+        return self.board.current_player
+
+    @property
+    def time_left(self) -> dict[str, float]:
+        return {WHITE: self.clock.left(0), BLACK: self.clock.left(1)}
+
+    # ---------- lifecycle / timer ----------
+    def on_enter(self, *args):
+        if self.clock.finished or self.paused:
+            return
+        self.clock.start()
+        self._schedule_tick()
+        self._maybe_ai_move()
+
+    def on_leave(self, *args):
+        # a képernyőn kívül az óra áll (mint eddig, amikor nem jött tick); online a szerveré az óra
+        if self.net is None:
+            self.clock.pause()
+        self._cancel_tick()
+        self.ai.cancel()
+
+    @property
+    def paused(self) -> bool:
+        return self._paused
+
+    @paused.setter
+    def paused(self, value: bool):
+        # szünetben az ütemező a játék időzítőit sem élesíti (a tábla kirajzolása mehet)
+        self._paused = value
+        if value:
+            SCHED.suspend(scheduler.PAUSED)
+        else:
+            SCHED.resume(scheduler.PAUSED)
+
+    def _schedule_tick(self):
+        # a következő tick pontosan a kijelzett másodperc váltásakor jön (nem fix 1 mp-enként)
+        SCHED.once("tick", self._tick, self.clock.until_next_second() + TICK_SLACK)
+
+    def _cancel_tick(self):
+        SCHED.cancel("tick")
+
+    def _tick(self, dt):
+        if self.clock.expired():
+            if self.net is not None:
+                # online az időtúllépést a szerver jelenti ("end")
+                self.update_clock()
+                return
+            self.moves.timeout(self.board, self._clocks())
+            self.finish_game(reason="Idő")
+            return
+        self.update_clock()
+        self._schedule_tick()
+
+    def _sync_clock(self):
+        # körváltás után az óra a soron lévő oldalé
+        self.clock.switch(self.board.to_move)
+        if self.clock.running:
+            self._schedule_tick()
+
+    # ---------- new game ----------
+    def start_new_game(self, vs_ai: bool = False, seed: int | None = None, config: BoardConfig | None = None):
+        # config: táblaméret / értéktartomány (None = a legutóbb választott)
+        self.close_online()
+        self._end_puzzle()
+        self.ai.cancel()
+        self.ai_side = BLACK if vs_ai else None
+        self.paused = False
+
+        # random kezdés + különböző számok (felül fekete, alul fehér), a két oldal
+        # kezdő ütés-lehetőségei kiegyensúlyozva; ugyanaz a seed → ugyanaz a tábla
+        if config is not None:
+            self.board_config = config
+        cfg = self.board_config
+        if cfg != self.board.config:
+            self.board.configure(cfg)  # a BoardView a következő rajzoláskor átépül
+        deal = balanced_deal(seed, FAIRNESS, config=cfg)
+        deal_board(self.board, deal)
+        Logger.info(
+            f"Deal: seed={deal.seed} fairness={deal.fairness:.2f} "
+            f"captures={deal.white_captures}/{deal.black_captures} candidates={deal.candidates}"
+        )
+        self._render_all()
+
+        self.clock.reset(TURN_SECONDS, self.board.to_move)
+        self.clock.start()
+        self._schedule_tick()
+        self.moves = MoveLog(self.board, self._clocks())
+        self.redo.clear()
+
+        self.lbl_info.text = (
+            f"Új játék (#{deal.seed})! Kezd: {self.current_player}. "
+            f"(Minden szám egyedi {cfg.value_min}–{cfg.value_max} között.)"
+        )
+        self.update_hud()
+
+        self.manager.current = "game"
+        if self._dead_position():
+            return
+        self._maybe_ai_move()
+
+    # ---------- online ----------
+    def start_online(self):
+        self.close_online()
+        self._end_puzzle()
+        self.ai.cancel()
+        self.ai_side = None
+        self.paused = False
+        self.clock.stop()
+        self._cancel_tick()
+        self.board.configure(DEFAULT_CONFIG)  # a szerver alaptáblán játszik
+        self._render_all()
+
+        host, port = parse_address(os.environ.get(SERVER_ENV))
+        # a kliens háttérszálról hív vissza → üzenetek a Kivy főszálára
+        self.net = NetClient(
+            host, port,
+            on_message=lambda m: Clock.schedule_once(lambda dt: self._on_net_message(m)),
+            on_close=lambda: Clock.schedule_once(lambda dt: self._on_net_closed()),
+        )
+        self.net.connect()
+        self.net_side = None
+        self.lbl_info.text = f"Csatlakozás: {host}:{port}…"
+        self.update_hud()
+        self.manager.current = "game"
+
+    # ---------- puzzles ----------
+    def start_puzzle(self, level: int | None = None, number: int = 0):
+        # feladvány a játéktáblán: óra és gép nélkül, a lépőnek pontosan egy ütése van
+        if self.puzzles is None:
+            self.puzzles = puzzles.open_default()
+        book = self.puzzles
+        if book is None:
+            popup("Feladványok", f"Nincs feladvány-fájl ({puzzles.FILE_NAME}).\nKészítés: python puzzles.py")
+            return
+        if level is None:
+            level, number = self.puzzle_progress
+        # szint vége → következő szint; az utolsó után elölről
+        while level <= len(book.levels) and number >= book.count(level):
+            level, number = level + 1, 0
+        if level > len(book.levels):
+            level, number = 1, 0
+            if not book.count(level):
+                popup("Feladványok", "A feladvány-fájl üres.")
+                return
+
+        self.close_online()
+        self.ai.cancel()
+        self.ai_side = None
+        self.paused = False
+        SCHED.cancel("puzzle.next")
+
+        started = time.perf_counter()
+        self.puzzle = book.load(level, number, self.board)
+        Logger.info(f"Feladvány: {level}. szint #{number + 1} betöltve {(time.perf_counter() - started) * 1000:.2f}ms")
+        self.puzzle_progress = (level, number)
+        self.clock.reset(TURN_SECONDS, self.board.to_move)
+        self.clock.stop()
+        self._cancel_tick()
+        self.moves = MoveLog(self.board, self._clocks())
+        self.redo.clear()
+        self._render_all()
+        self.update_hud()
+        self.lbl_info.text = (
+            f"Feladvány – {level}. szint, {number + 1}/{book.count(level)}: "
+            f"{self.current_player} egyetlen ütését keresd ({level + 1} támadó)!"
+        )
+        self.manager.current = "game"
+
+    def _end_puzzle(self):
+        self.puzzle = None
+        SCHED.cancel("puzzle.next")
+
+    def _puzzle_solved(self, removed: int):
+        p = self.puzzle
+        self._render_mask(removed)
+        self.update_hud()
+        self.puzzle_progress = (p.level, p.number + 1)
+        self.lbl_info.text = "Megoldva! Jön a következő feladvány…"
+        SCHED.once("puzzle.next", lambda dt: self.start_puzzle(), PUZZLE_NEXT_DELAY)
+
+    def close_online(self):
+        if self.net is not None:
+            self.net.close()
+            self.net = None
+            self.net_side = None
+
+    def _online_turn(self) -> bool:
+        # online és nem mi jövünk (vagy még nincs ellenfél)
+        return self.net is not None and self.board.to_move != self.net_side
+
+    def _on_net_message(self, msg: dict):
+        if self.net is None:
+            return
+        op = msg.get("op")
+        if op == "joined":
+            self.net_side = msg["side"]
+            self.lbl_info.text = f"Várakozás ellenfélre… (te: {SIDES[self.net_side]})"
+        elif op == "start":
+            snapshot.loads(base64.b64decode(msg["snap"]), self.board)
+            self.clock.reset(TURN_SECONDS, self.board.to_move)
+            self.clock.start()
+            self._schedule_tick()
+            self.moves = MoveLog(self.board, self._clocks())
+            self.redo.clear()
+            self._render_all()
+            self.update_hud()
+            self.lbl_info.text = f"Online játék! Te: {SIDES[self.net_side]}. Kezd: {self.current_player}."
+        elif op == "move":
+            self._apply_net_move(msg)
+        elif op == "end":
+            r = msg["result"]
+            self.close_online()
+            self.finish_game(r["reason"])
+        elif op == "error":
+            self.lbl_info.text = f"Szerver: {msg.get('msg')}"
+
+    def _apply_net_move(self, msg: dict):
+        b = self.board
+        before = b.selection_mask()
+        b.clear_selection()
+        self._render_mask(before)
+        if msg["kind"] == "pass":
+            b.pass_turn()
+            removed = 0
+            self.moves.pass_turn(b, msg["clock"])
+            self.lbl_info.text = f"{SIDES[1 - b.to_move]} átadta a kört."
+        else:
+            removed = b.apply_capture(msg["t"], msg["a"])
+            self.moves.capture(b, msg["clock"], msg["t"], msg["a"])
+            self.lbl_info.text = "KIÜTÉS! Cél + támadók eltűntek. Kör váltás."
+        # az óra a szerver értékére áll (a hálózati késést is kiegyenlíti)
+        running = self.clock.running
+        self.clock.pause()
+        self.clock.remaining = [float(x) for x in msg["clock"]]
+        self.clock.side = msg["to_move"]
+        if running:
+            self.clock.start()
+            self._schedule_tick()
+        self._render_mask(removed)
+        self.update_hud()
+
+    def _on_net_closed(self):
+        if self.net is None:
+            return
+        self.net = None
+        self.net_side = None
+        self.clock.stop()
+        self._cancel_tick()
+        self.lbl_info.text = "A kapcsolat megszakadt."
+
+    # ---------- rendering ----------
+    def _render_mask(self, mask: int):
+        self.view.refresh(mask)
+
+    def _render_all(self):
+        self.view.refresh_all()
+
+    # ---------- UI helpers ----------
+    def _clocks(self) -> tuple[float, float]:
+        return self.clock.left(0), self.clock.left(1)
+
+    def update_clock(self):
+        self.hud_time.set(time_text(self.clock.left(0), self.clock.left(1)))
+
+    @tracing.traced("update_hud")
+    def update_hud(self):
+        self.hud_turn.set(turn_text(self.current_player))
+        self.update_clock()
+        self.hud_state.set(state_text(self.board.target_value(), self.attack_sum()))
+        self.hud_pause.set("Folytat" if self.paused else "Szünet")
+        self._update_marks()
+
+    @tracing.traced("reach")
+    def _update_marks(self):
+        # kattintásonként csak a kijelölés változását vezetjük át (körönként egy újraépítés)
+        b = self.board
+        if self._ai_turn() or self._online_turn() or self.clock.finished or b.is_over():
+            self.view.set_marks(0, 0)
+            return
+        self.reach.sync()
+        self.view.set_marks(self.reach.completers(), self.reach.dead_targets())
+
+    def toggle_pause(self):
+        self.set_paused(not self.paused)
+
+    def set_paused(self, paused: bool):
+        if self.net is not None or self.clock.finished or paused == self.paused:
+            return
+        self.paused = paused
+        if self.paused:
+            self.clock.pause()
+            self._cancel_tick()
+            self.ai.cancel()
+            self.moves.pause(self.board, self._clocks())
+        else:
+            self.clock.start()
+            self._schedule_tick()
+            self.moves.resume(self.board, self._clocks())
+        self.update_hud()
+        self.lbl_info.text = "SZÜNET" if self.paused else "Folytatás."
+        if not self.paused:
+            self._maybe_ai_move()
+
+    def pass_turn(self):
+        if self._ai_turn():
+            return
+        if self.puzzle is not None:
+            self.lbl_info.text = "Feladványban nincs passz – keresd az ütést!"
+            return
+        if self.net is not None:
+            if not self._online_turn():
+                self.net.send({"op": "pass"})
+            return
+        self._pass()
+        self.lbl_info.text = "Kör átadva."
+        self._maybe_ai_move()
+
+    def _pass(self):
+        changed = self.board.selection_mask()
+        self.board.pass_turn()
+        self.moves.pass_turn(self.board, self._clocks())
+        self.redo.clear()
+        self._sync_clock()
+        self._render_mask(changed)
+        self.update_hud()
+
+    # ---------- undo / redo ----------
+    def _can_rewind(self) -> bool:
+        # online a szerveré az állás; vége után az eredmény már rögzítve
+        return self.net is None and not self.paused and not self.clock.finished
+
+    def undo(self):
+        # az utolsó lépés visszavonása (gép ellen: a gép válaszával együtt); csak a
+        # visszavont delta mezői rajzolódnak újra
+        if not self._can_rewind():
+            return
+        self.ai.cancel()
+        b = self.board
+        changed = b.selection_mask()
+        b.clear_selection()
+        undone = []
+        kept = []  # szünet / folytatás: csak óra-esemény, a naplóban marad
+        while len(self.moves):
+            m = self.moves.pop()
+            if m.kind not in (movelog.CAPTURE, movelog.PASS):
+                kept.append(m)
+                continue
+            changed |= movelog.undo_move(b, m)
+            undone.append(m)
+            if not self._ai_turn():
+                break
+        for m in reversed(kept):
+            self.moves.record(m.kind, b, m.clock)
+        self._render_mask(changed)
+        if not undone:
+            self.lbl_info.text = "Nincs visszavonható lépés."
+            self.update_hud()
+            return
+        self.redo.extend(undone)  # a legkorábban visszavont kerül a verem tetejére
+        self._sync_clock()
+        self.lbl_info.text = f"Visszavonva ({len(undone)} lépés). Soron: {self.current_player}."
+        self.update_hud()
+        self._maybe_ai_move()
+
+    def redo_move(self):
+        if not self._can_rewind() or not self.redo:
+            return
+        self.ai.cancel()
+        b = self.board
+        changed = b.selection_mask()
+        b.clear_selection()
+        done = 0
+        while self.redo:
+            m = self.redo.pop()
+            changed |= movelog.apply_move(b, m)
+            self.moves.record(m.kind, b, self._clocks(), m.target, m.attackers)
+            done += 1
+            if not self._ai_turn() or b.is_over():
+                break
+        self.lbl_info.text = f"Újra végrehajtva ({done} lépés)."
+        if self._after_capture(changed):
+            self._maybe_ai_move()
+
+    def show_hint(self):
+        b = self.board
+        if self.paused or b.is_over() or self._ai_turn() or self._online_turn():
+            return
+        if self.puzzle is not None:
+            # feladványban csak a célt áruljuk el
+            target = self.puzzle.target
+            self.lbl_info.text = f"Tipp: a cél a(z) {b.values[target]}."
+            self.view.show_cell(target)
+            return
+        n = count_captures(b)
+        if n == 0:
+            self.lbl_info.text = f"{self.current_player}: nincs szabályos ütés – add át a kört."
+            return
+        hit = self.ai.tb.best_move(b) if self.ai.tb is not None else None
+        if hit is not None:
+            # végjáték-tábla: a tökéletes lépés (akár a passz is)
+            move, outcome = hit
+            if move is None:
+                self.lbl_info.text = f"Tipp: add át a kört. {endgame_text(outcome, b.to_move)}"
+                return
+            target, attackers = move
+            parts = " + ".join(str(b.values[i]) for i in iter_bits(attackers))
+            self.lbl_info.text = f"Tipp: {b.values[target]} = {parts}. {endgame_text(outcome, b.to_move)}"
+            self.view.show_cell(target)
+            return
+        target, attackers = next(iter_captures(b))
+        parts = " + ".join(str(b.values[i]) for i in iter_bits(attackers))
+        self.lbl_info.text = f"Tipp: {b.values[target]} = {parts}  (összesen {n} lehetséges ütés)"
+        self.view.show_cell(target)
+
+    def clear_selections(self, msg="Kijelölések törölve."):
+        self._clear_all_selections()
+        self.lbl_info.text = msg
+        self.update_hud()
+
+    # ---------- click logic ----------
+    @tracing.traced("on_cell_click")
+    def on_cell_click(self, idx: int):
+        if self.paused:
+            self.lbl_info.text = "Szünet van. Nyomd meg a Folytat gombot."
+            return
+        if self._ai_turn():
+            self.lbl_info.text = "A gép gondolkodik…"
+            return
+        if self._online_turn():
+            self.lbl_info.text = "Az ellenfél jön."
+            return
+
+        b = self.board
+        before = b.selection_mask()
+        kind = b.select(idx)
+
+        if kind == SEL_EMPTY:
+            self._render_mask(before)
+            self.lbl_info.text = "Üres mező – kijelölések törölve."
+            self.update_hud()
+            return
+
+        if kind == SEL_TARGET:
+            self.lbl_info.text = f"Cél kijelölve: {b.owner_at(idx)} {b.values[idx]}"
+        elif kind == SEL_UNTARGET:
+            self.lbl_info.text = "Cél kijelölés törölve."
+
+        self._render_mask(before | b.selection_mask())
+        self.try_capture()
+        self.update_hud()
+
+    def attack_sum(self) -> int:
+        return self.board.attack_sum
+
+    @tracing.traced("try_capture")
+    def try_capture(self):
+        b = self.board
+        if b.target < 0 or not b.attackers:
+            return
+
+        # csak tényt mutatunk
+        self.lbl_info.text = f"Cél={b.target_value()} | Összeg={b.attack_sum}"
+
+        if self.net is not None:
+            # online: a lépést a szerver ellenőrzi és hajtja végre ("move" üzenet)
+            if b.can_capture():
+                self.net.send({"op": "capture", "t": b.target, "a": b.attackers})
+                self.lbl_info.text = "Ütés elküldve…"
+            return
+
+        # ÜTÉS: cél + támadók eltűnnek
+        target, attackers = b.target, b.attackers
+        removed = b.capture()
+        if not removed:
+            return
+        self.moves.capture(b, self._clocks(), target, attackers)
+        self.redo.clear()
+        if self.puzzle is not None:
+            # a feladványban ez az egyetlen szabályos ütés → megoldás
+            self._puzzle_solved(removed)
+            return
+        self.lbl_info.text = "KIÜTÉS! Cél + támadók eltűntek. Kör váltás."
+        if self._after_capture(removed):
+            self._maybe_ai_move()
+
+    def _after_capture(self, removed: int) -> bool:
+        # kirajzolás + játék vége ellenőrzés; True, ha a játék folytatódik
+        b = self.board
+        self._sync_clock()
+        self._render_mask(removed)
+
+        # game over check
+        if b.is_over():
+            self.finish_game(reason="Elfogyott")
+            return False
+        if no_captures_left(b):
+            self.finish_game(reason="Nincs ütés")
+            return False
+        outcome = self.ai.tb.probe(b) if self.ai.tb is not None else None
+        if outcome is not None:
+            self.lbl_info.text = endgame_text(outcome, b.to_move)
+
+        self.update_hud()
+        return True
+
+    def _dead_position(self) -> bool:
+        # osztás / visszaállítás után: ha senki sem tud ütni, nem futtatjuk le az órát
+        if not no_captures_left(self.board):
+            return False
+        self.finish_game(reason="Nincs ütés")
+        return True
+
+    # ---------- computer opponent ----------
+    def _ai_turn(self) -> bool:
+        return self.ai_side is not None and self.ai_side == self.current_player
+
+    def _maybe_ai_move(self):
+        b = self.board
+        if not self._ai_turn() or self.paused or b.is_over() or not self.clock.running:
+            return
+        self._ai_key = b.zobrist
+        self.lbl_info.text = "A gép gondolkodik…"
+        budget = think_time(self.time_left[self.ai_side])
+        # a callback a háttérszálról jön → a lépést a Kivy főszálán hajtjuk végre
+        self.ai.start(b, budget, lambda r: Clock.schedule_once(lambda dt: self._apply_ai_move(r)))
+
+    def _apply_ai_move(self, result):
+        b = self.board
+        # elavult eredmény (új játék, szünet, időtúllépés közben)
+        if not self._ai_turn() or self.paused or b.zobrist != self._ai_key or not self.clock.running:
+            return
+
+        Logger.info(
+            f"AI: depth={result.depth} nodes={result.nodes} "
+            f"time={result.elapsed:.3f}s nps={result.nps:.0f}"
+        )
+        stats = f"({result.depth}. mélység, {result.nps / 1000:.1f}k csomópont/mp)"
+
+        if result.move == PASS:
+            self._pass()
+            self.lbl_info.text = f"A gép átadta a kört. {stats}"
+            return
+
+        target, attackers = result.move
+        parts = " + ".join(str(b.values[i]) for i in iter_bits(attackers))
+        self.lbl_info.text = f"Gép ütött: {b.values[target]} = {parts}  {stats}"
+        before = b.selection_mask()
+        b.clear_selection()
+        self._render_mask(before)
+        removed = b.apply_capture(target, attackers)
+        self.moves.capture(b, self._clocks(), target, attackers)
+        self.redo.clear()
+        self._after_capture(removed)
+
+    def _clear_all_selections(self):
+        changed = self.board.selection_mask()
+        self.board.clear_selection()
+        self._render_mask(changed)
+
+    # ---------- save / resume ----------
+    def in_progress(self) -> bool:
+        b = self.board
+        return not self.clock.finished and not b.is_over()
+
+    def snapshot(self) -> bytes | None:
+        # online játékot (az állás a szerveren van) és feladványt nem mentünk
+        if self.net is not None or self.puzzle is not None or not self.in_progress():
+            return None
+        ai = None if self.ai_side is None else SIDES.index(self.ai_side)
+        return snapshot.dumps(self.board, (self.clock.left(0), self.clock.left(1)), self.paused, ai)
+
+    def restore(self, snap: snapshot.Snapshot):
+        # a snapshot.loads már a self.board-ba töltött; innen egyetlen teljes újrarajzolás
+        self._end_puzzle()
+        self.board_config = self.board.config  # az új játék a mentett méretű táblán folytatódik
+        self.ai.cancel()
+        self.ai_side = None if snap.ai_side is None else SIDES[snap.ai_side]
+        self.clock.reset(TURN_SECONDS, self.board.to_move)
+        self.clock.remaining = list(snap.clock)
+        # a napló a visszaállított állásból indul
+        self.moves = MoveLog(self.board, snap.clock)
+        self.redo.clear()
+        # visszatéréskor szünetben indul, a játékos maga folytatja
+        self.paused = True
+        self._render_all()
+        self.update_hud()
+        self.lbl_info.text = "Mentett játék betöltve. Nyomd meg a Folytat gombot."
+        self.manager.current = "game"
+        self._dead_position()
+
+    # ---------- win / stats ----------
+    def count_pieces(self, owner: str) -> int:
+        return self.board.count_pieces(owner)
+
+    def sum_values(self, owner: str) -> int:
+        return self.board.sum_values(owner)
+
+    def is_game_over_by_empty(self) -> bool:
+        return self.board.is_over()
+
+    def finish_game(self, reason: str):
+        # megállítjuk az órát
+        self.clock.stop()
+        self._cancel_tick()
+        self.ai.cancel()
+
+        result = self.board.finish(reason)
+        app = App.get_running_app()
+        app.record_result(result)
+        app.discard_saved_game()
+        movelog.save(os.path.join(app.user_data_dir, LAST_GAME_LOG), self.moves)
+
+        msg = (
+            f"Ok: {reason}\n\n"
+            f"Maradt bábuk: Fehér {result.white_left} | Fekete {result.black_left}\n"
+            f"Összérték:    Fehér {result.white_sum} | Fekete {result.black_sum}\n\n"
+            f"Győztes: {result.winner}"
+        )
+
+        def _to_stats():
+            self.manager.current = "stats"
+
+        popup("Játék vége", msg, on_ok=_to_stats)
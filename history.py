@@ -0,0 +1,167 @@
+from __future__ import annotations
+import sqlite3
+import time
+from dataclasses import dataclass, field
+
+from engine import GameResult
+
+# Tartós meccstörténet SQLite-ban. A rekordok mellett egy kulcs → számláló
+# táblában futó összesítők frissülnek ugyanabban a tranzakcióban, így a
+# statisztika képernyő a történet hosszától függetlenül O(1).
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    winner TEXT NOT NULL,
+    white_left INTEGER NOT NULL,
+    black_left INTEGER NOT NULL,
+    white_sum INTEGER NOT NULL,
+    black_sum INTEGER NOT NULL,
+    reason TEXT NOT NULL,
+    first TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS results_ts ON results (ts);
+CREATE INDEX IF NOT EXISTS results_reason ON results (reason, id);
+CREATE INDEX IF NOT EXISTS results_winner ON results (winner, id);
+CREATE TABLE IF NOT EXISTS totals (
+    key TEXT PRIMARY KEY,
+    n INTEGER NOT NULL
+);
+"""
+
+_COLUMNS = "id, ts, winner, white_left, black_left, white_sum, black_sum, reason, first"
+
+
+@dataclass
+class HistoryTotals:
+    games: int = 0
+    winners: dict[str, int] = field(default_factory=dict)
+    reasons: dict[str, int] = field(default_factory=dict)
+    white_left: int = 0  # összesen (átlaghoz)
+    black_left: int = 0
+
+    def wins(self, side: str) -> int:
+        return self.winners.get(side, 0)
+
+    def ends(self, reason: str) -> int:
+        return self.reasons.get(reason, 0)
+
+
+def _row_result(row) -> tuple[int, float, GameResult]:
+    rid, ts, winner, wl, bl, ws, bs, reason, first = row
+    return rid, ts, GameResult(winner, wl, bl, ws, bs, reason, first)
+
+
+class MatchHistory:
+    def __init__(self, path: str = ":memory:"):
+        self.db = sqlite3.connect(path)
+        self.db.executescript(_SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    # ---------- írás ----------
+    def add(self, r: GameResult, ts: float | None = None):
+        self.add_many([r], ts)
+
+    def add_many(self, results, ts: float | None = None):
+        ts = time.time() if ts is None else ts
+        deltas: dict[str, int] = {}
+        rows = []
+        for r in results:
+            rows.append((ts, r.winner, r.white_left, r.black_left, r.white_sum, r.black_sum, r.reason, r.first))
+            for key, n in (
+                ("games", 1),
+                ("winner:" + r.winner, 1),
+                ("reason:" + r.reason, 1),
+                ("white_left", r.white_left),
+                ("black_left", r.black_left),
+            ):
+                deltas[key] = deltas.get(key, 0) + n
+        if not rows:
+            return
+
+        with self.db:
+            self.db.executemany(
+                "INSERT INTO results (ts, winner, white_left, black_left, white_sum, black_sum, reason, first) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self.db.executemany("INSERT OR IGNORE INTO totals (key, n) VALUES (?, 0)", ((k,) for k in deltas))
+            self.db.executemany("UPDATE totals SET n = n + ? WHERE key = ?", ((n, k) for k, n in deltas.items()))
+
+    def clear(self):
+        # feltétel nélküli DELETE → az SQLite "truncate" optimalizációja, nem soronként töröl
+        with self.db:
+            self.db.execute("DELETE FROM results")
+            self.db.execute("DELETE FROM totals")
+
+    # ---------- olvasás ----------
+    def totals(self) -> HistoryTotals:
+        t = HistoryTotals()
+        for key, n in self.db.execute("SELECT key, n FROM totals"):
+            kind, _, name = key.partition(":")
+            if kind == "winner":
+                t.winners[name] = n
+            elif kind == "reason":
+                t.reasons[name] = n
+            elif key in ("games", "white_left", "black_left"):
+                setattr(t, key, n)
+        return t
+
+    def last(self) -> GameResult | None:
+        row = self.db.execute(f"SELECT {_COLUMNS} FROM results ORDER BY id DESC LIMIT 1").fetchone()
+        return None if row is None else _row_result(row)[2]
+
+    @staticmethod
+    def _where(reason, winner, since, until, before_id):
+        conds, params = [], []
+        for cond, value in (
+            ("reason = ?", reason),
+            ("winner = ?", winner),
+            ("ts >= ?", since),
+            ("ts < ?", until),
+            ("id < ?", before_id),
+        ):
+            if value is not None:
+                conds.append(cond)
+                params.append(value)
+        return (" WHERE " + " AND ".join(conds)) if conds else "", params
+
+    def query(
+        self,
+        reason: str | None = None,
+        winner: str | None = None,
+        since: float | None = None,
+        until: float | None = None,
+        before_id: int | None = None,
+        limit: int = 50,
+    ) -> list[tuple[int, float, GameResult]]:
+        # legújabb elöl; következő oldal: before_id = az előző oldal utolsó id-je
+        where, params = self._where(reason, winner, since, until, before_id)
+        rows = self.db.execute(
+            f"SELECT {_COLUMNS} FROM results{where} ORDER BY id DESC LIMIT ?",
+            (*params, limit),
+        )
+        return [_row_result(row) for row in rows]
+
+    def count(
+        self,
+        reason: str | None = None,
+        winner: str | None = None,
+        since: float | None = None,
+        until: float | None = None,
+    ) -> int:
+        if since is None and until is None:
+            # szűrés nélkül / okra / győztesre: a futó összesítőkből
+            t = self.totals()
+            if reason is None and winner is None:
+                return t.games
+            if winner is None:
+                return t.ends(reason)
+            if reason is None:
+                return t.wins(winner)
+        where, params = self._where(reason, winner, since, until, None)
+        return self.db.execute(f"SELECT COUNT(*) FROM results{where}", params).fetchone()[0]
+
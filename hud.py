@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from engine import BLACK, DRAW, SIDES, WHITE
+
+# HUD szövegek + változás-alapú frissítés: a label csak akkor kap új szöveget
+# (és ezzel új textúrát), ha a kiírandó szöveg tényleg más. Kivy-független.
+
+
+def mmss(seconds: float) -> str:
+    s = max(0, int(seconds))
+    return f"{s//60:02d}:{s%60:02d}"
+
+
+def time_text(white_left: float, black_left: float) -> str:
+    return f"Idő – F: {mmss(white_left)} | B: {mmss(black_left)}"
+
+
+def turn_text(player: str) -> str:
+    return f"Soron: {player}"
+
+
+def state_text(target: int | None, attack_sum: int) -> str:
+    return f"Cél: {'-' if target is None else target} | Összeg: {attack_sum}"
+
+
+def endgame_text(outcome: tuple[int, int], side: int) -> str:
+    # végjáték-tábla eredménye (a lépő szemszögéből) → ki nyer tökéletes játékkal
+    if outcome == (0, 0):
+        return "Végjáték: döntetlen tökéletes játékkal"
+    winner = SIDES[side] if outcome > (0, 0) else SIDES[1 - side]
+    return f"Végjáték: {winner} nyer tökéletes játékkal"
+
+
+def cache_text(s) -> str:
+    # elemzés-cache számlálói (analysis.CacheStats) a fejlesztői menübe
+    return (
+        f"Elemzés-cache: {s.entries} / {s.capacity} bejegyzés, találati arány {s.hit_rate:.0%}\n"
+        f"  memória {s.hits} | lemez {s.disk_hits} | hiány {s.misses} | kiürítve {s.evictions} | kiírva {s.disk_writes}"
+    )
+
+
+def sched_text(s, frames_displayed: int) -> str:
+    # ütemező számlálói (scheduler.SchedulerStats): ennyiszer ébredt fel az app a saját időzítőire
+    top = ", ".join(f"{name} {n}" for name, n in sorted(s.by_name.items(), key=lambda kv: -kv[1])[:3])
+    state = ", ".join(s.suspended) or "aktív"
+    return (
+        f"Ütemező: {state} ({s.suspended_seconds:.0f} mp felfüggesztve), {s.pending} élesített\n"
+        f"  ébresztések {s.wakeups} ({top or '-'}) | tábla-frame {s.frames} | kirajzolt frame {frames_displayed}"
+    )
+
+
+def stats_text(t, last) -> str:
+    # statisztika képernyő: futó összesítők (HistoryTotals) + az utolsó meccs (GameResult)
+    n = t.games
+    if n == 0 or last is None:
+        return "Még nincs lejátszott meccs."
+
+    return (
+        f"Lejátszott meccsek: {n}\n\n"
+        f"Fehér győzelmek: {t.wins(WHITE)}\n"
+        f"Fekete győzelmek: {t.wins(BLACK)}\n"
+        f"Döntetlenek: {t.wins(DRAW)}\n\n"
+        f"Átlag maradék bábuk:\n"
+        f"  Fehér: {t.white_left / n:.1f}\n"
+        f"  Fekete: {t.black_left / n:.1f}\n\n"
+        f"Befejezés oka:\n"
+        f"  Idő: {t.ends('Idő')}\n"
+        f"  Elfogyott: {t.ends('Elfogyott')}\n"
+        f"  Nincs ütés: {t.ends('Nincs ütés')}\n\n"
+        f"Utolsó meccs:\n"
+        f"  Győztes: {last.winner}\n"
+        f"  Maradt: Fehér {last.white_left} | Fekete {last.black_left}\n"
+        f"  Összérték: Fehér {last.white_sum} | Fekete {last.black_sum}\n"
+        f"  Ok: {last.reason}"
+    )
+
+
+class HudText:
+    # egy label (bármi .text attribútummal) változás-alapú írója
+    __slots__ = ("widget", "shown", "renders")
+
+    def __init__(self, widget):
+        self.widget = widget
+        self.shown = widget.text
+        self.renders = 0  # hányszor kellett ténylegesen új szöveget (textúrát) adni
+
+    def set(self, text: str):
+        if text != self.shown:
+            self.shown = text
+            self.widget.text = text
+            self.renders += 1
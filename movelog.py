@@ -0,0 +1,256 @@
+from __future__ import annotations
+import struct
+
+import snapshot
+from engine import DEFAULT_CONFIG, BoardState, iter_bits
+
+# Lépésnapló: minden ütés, passz, szünet és időtúllépés egy fix hosszú rekord
+# (fajta, cél, támadó bitmaszk, mindkét óra ms-ban). KEYFRAME_EVERY lépésenként
+# egy pillanatkép is készül, így bármelyik lépésre ugrás legfeljebb
+# KEYFRAME_EVERY - 1 lépés újrajátszása (a játék hosszától független).
+#
+# Fájl (v1): "SZML", verzió (B), n (B), kezdőállás hossza (H) + snapshot,
+# lépésszám (I), majd a lépésrekordok. Több játék egy folyamba: LogWriter.
+# v2: nem alapbeállítású tábla (pl. 30×30), a cél index 2 bájt (H, 0xFFFF = nincs).
+# Ha a kezdőállás hossza nem fér 2 bájtba (nagy v2 tábla), a H helyén 0xFFFF áll,
+# utána a valódi hossz (I).
+#
+# A rekordok visszafordítható delták (apply_move / undo_move), így ugyanez a
+# napló a visszavonás / újra alapja is: pop() az utolsó lépést adja vissza.
+
+MAGIC = b"SZML"
+VERSION = 1
+VERSION_WIDE = 2
+KEYFRAME_EVERY = 16
+
+CAPTURE, PASS, PAUSE, RESUME, TIMEOUT = range(5)
+KIND_NAMES = ("ütés", "passz", "szünet", "folytatás", "idő")
+
+_HEADER = struct.Struct("<4sBBH")
+_COUNT = struct.Struct("<I")
+_MOVE = struct.Struct("<BbII")  # fajta, cél (-1 = nincs), Fehér ms, Fekete ms
+_MOVE_WIDE = struct.Struct("<BHII")
+NO_TARGET = 0xFFFF  # v2: nincs cél (255×255-ös táblán a legnagyobb index 65024)
+_LEN = struct.Struct("<I")
+LONG_START = 0xFFFF  # a fejléc hossz-mezőjében: a kezdőállás hossza utána jön (I)
+
+
+class MoveLogError(ValueError):
+    pass
+
+
+def _ms(seconds: float) -> int:
+    return max(0, int(round(seconds * 1000)))
+
+
+class Move:
+    __slots__ = ("kind", "target", "attackers", "clock")
+
+    def __init__(self, kind: int, target: int, attackers: int, clock: tuple[float, float]):
+        self.kind = kind
+        self.target = target
+        self.attackers = attackers
+        self.clock = clock
+
+    def __repr__(self):
+        return f"Move({KIND_NAMES[self.kind]}, {self.target}, {self.attackers:#x}, {self.clock})"
+
+
+class MoveLog:
+    def __init__(self, board: BoardState, clock=(0.0, 0.0)):
+        # a kezdőállás a napló része → a napló önmagában visszajátszható
+        self.n = board.n
+        self.version = VERSION if board.config == DEFAULT_CONFIG else VERSION_WIDE
+        self._move = _MOVE if self.version == VERSION else _MOVE_WIDE
+        self._mask_len = (board.size + 7) // 8
+        self.record_size = self._move.size + self._mask_len
+        self.start = snapshot.dumps(board, clock)
+        self.data = bytearray()
+        self.count = 0
+        self.keyframes = [self.start]  # keyframes[k] = állás k * KEYFRAME_EVERY lépés után
+
+    # ---------- rögzítés (a lépés végrehajtása UTÁN hívandó) ----------
+    def record(self, kind: int, board: BoardState, clock, target: int = -1, attackers: int = 0):
+        if target < 0 and self.version == VERSION_WIDE:
+            target = NO_TARGET
+        self.data += self._move.pack(kind, target, _ms(clock[0]), _ms(clock[1]))
+        self.data += attackers.to_bytes(self._mask_len, "little")
+        self.count += 1
+        if self.count % KEYFRAME_EVERY == 0:
+            self.keyframes.append(snapshot.dumps(board, clock))
+
+    def capture(self, board: BoardState, clock, target: int, attackers: int):
+        self.record(CAPTURE, board, clock, target, attackers)
+
+    def pass_turn(self, board: BoardState, clock):
+        self.record(PASS, board, clock)
+
+    def pause(self, board: BoardState, clock):
+        self.record(PAUSE, board, clock)
+
+    def resume(self, board: BoardState, clock):
+        self.record(RESUME, board, clock)
+
+    def timeout(self, board: BoardState, clock):
+        self.record(TIMEOUT, board, clock)
+
+    # ---------- olvasás ----------
+    def __len__(self) -> int:
+        return self.count
+
+    def move(self, i: int) -> Move:
+        off = i * self.record_size
+        kind, target, w_ms, b_ms = self._move.unpack_from(self.data, off)
+        mask = int.from_bytes(self.data[off + self._move.size:off + self.record_size], "little")
+        if target == NO_TARGET and self.version == VERSION_WIDE:
+            target = -1
+        return Move(kind, target, mask, (w_ms / 1000, b_ms / 1000))
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self.move(i)
+
+    def pop(self) -> Move:
+        # az utolsó rekord eltávolítása (visszavonás); a hozzá tartozó keyframe is megy
+        if not self.count:
+            raise IndexError("üres napló")
+        m = self.move(self.count - 1)
+        if self.count % KEYFRAME_EVERY == 0:
+            self.keyframes.pop()
+        self.count -= 1
+        del self.data[self.count * self.record_size:]
+        return m
+
+    def seek(self, i: int, board: BoardState | None = None) -> snapshot.Snapshot:
+        # állás i lépés után (0 = kezdőállás): legközelebbi keyframe + legfeljebb KEYFRAME_EVERY - 1 lépés
+        if not 0 <= i <= self.count:
+            raise IndexError(i)
+        k = i // KEYFRAME_EVERY
+        snap = snapshot.loads(self.keyframes[k], board)
+        b = snap.board
+        clock = snap.clock
+        for j in range(k * KEYFRAME_EVERY, i):
+            m = self.move(j)
+            apply_move(b, m)
+            clock = m.clock
+        b.clear_selection()
+        snap.clock = clock
+        return snap
+
+    # ---------- sorosítás ----------
+    def to_bytes(self) -> bytes:
+        size = len(self.start)
+        return b"".join((
+            _HEADER.pack(MAGIC, self.version, self.n, min(size, LONG_START)),
+            _LEN.pack(size) if size >= LONG_START else b"",
+            self.start,
+            _COUNT.pack(self.count),
+            bytes(self.data),
+        ))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> MoveLog:
+        magic, version, n, start_len = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise MoveLogError("nem lépésnapló")
+        if version not in (VERSION, VERSION_WIDE):
+            raise MoveLogError(f"ismeretlen verzió: {version}")
+        off = _HEADER.size
+        if start_len == LONG_START:
+            (start_len,) = _LEN.unpack_from(data, off)
+            off += _LEN.size
+        start = snapshot.loads(data[off:off + start_len])
+        off += start_len
+        (count,) = _COUNT.unpack_from(data, off)
+        off += _COUNT.size
+
+        log = cls(start.board, start.clock)
+        if log.version != version:
+            raise MoveLogError("a napló verziója nem egyezik a kezdőállással")
+        body = data[off:off + count * log.record_size]
+        if len(body) != count * log.record_size:
+            raise MoveLogError("csonka lépésnapló")
+        # a keyframe-eket egy végigjátszással építjük újra
+        board = start.board
+        for i in range(count):
+            rec = body[i * log.record_size:(i + 1) * log.record_size]
+            log.data += rec
+            log.count += 1
+            m = log.move(i)
+            apply_move(board, m)
+            if log.count % KEYFRAME_EVERY == 0:
+                log.keyframes.append(snapshot.dumps(board, m.clock))
+        return log
+
+
+def apply_move(board: BoardState, m: Move) -> int:
+    # visszaadja a megváltozott mezők maszkját
+    if m.kind == CAPTURE:
+        return board.apply_capture(m.target, m.attackers)
+    if m.kind == PASS:
+        board.pass_turn()
+    # szünet / folytatás / idő: a tábla nem változik, csak az óra
+    return 0
+
+
+def undo_move(board: BoardState, m: Move) -> int:
+    # apply_move inverze (az utolsó végrehajtott lépésre); a megváltozott mezők maszkja
+    if m.kind == CAPTURE:
+        # a levett bábuk értéke a táblán marad; snapshotból (keyframe) töltött táblán
+        # a korábban levettek értéke nem ismert → ott seek() kell
+        values = board.values
+        if not values[m.target] or any(not values[i] for i in iter_bits(m.attackers)):
+            raise MoveLogError("a levett bábuk értéke nem ismert")
+        # ütés után a kör vált, kivéve ha a játék véget ért → az ütő oldal ebből adódik
+        side = board.to_move if board.is_over() else 1 - board.to_move
+        board.clear_selection()
+        board.undo_capture(m.target, m.attackers, side)
+        return m.attackers | (1 << m.target)
+    if m.kind == PASS:
+        board.pass_turn()  # a passz önmaga inverze
+    return 0
+
+
+class LogWriter:
+    # sok játék naplója egy fájlba, hossz-előtaggal; egyszerre csak egy játék van memóriában
+    def __init__(self, path: str):
+        self.f = open(path, "wb")
+        self.games = 0
+
+    def write(self, log: MoveLog | bytes):
+        data = log.to_bytes() if isinstance(log, MoveLog) else log
+        self.f.write(_LEN.pack(len(data)))
+        self.f.write(data)
+        self.games += 1
+
+    def close(self):
+        self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_logs(path: str):
+    # LogWriter fájl játékonkénti, lusta beolvasása
+    with open(path, "rb") as f:
+        while True:
+            head = f.read(_LEN.size)
+            if not head:
+                return
+            (size,) = _LEN.unpack(head)
+            yield MoveLog.from_bytes(f.read(size))
+
+
+def save(path: str, log: MoveLog):
+    snapshot.save(path, log.to_bytes())
+
+
+def load(path: str) -> MoveLog | None:
+    try:
+        with open(path, "rb") as f:
+            return MoveLog.from_bytes(f.read())
+    except FileNotFoundError:
+        return None
@@ -0,0 +1,72 @@
+from __future__ import annotations
+import asyncio
+import json
+import threading
+
+from server import HOST, MAX_LINE, PORT, encode_message
+
+# Vékony hálózati kliens a server.py-hoz: saját háttérszálon futó asyncio
+# hurok. on_message(msg) és on_close() a háttérszálról hívódik — a Kivy
+# oldalon Clock.schedule_once-szal kell a főszálra átadni (mint az AI-nál).
+
+
+def parse_address(text: str | None) -> tuple[str, int]:
+    # "host:port" / "host" / "" → (host, port)
+    if not text:
+        return HOST, PORT
+    host, _, port = text.rpartition(":")
+    if not host:
+        return port, PORT
+    return host, int(port)
+
+
+class NetClient:
+    def __init__(self, host: str = HOST, port: int = PORT, on_message=None, on_close=None):
+        self.host = host
+        self.port = port
+        self.on_message = on_message
+        self.on_close = on_close
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._thread: threading.Thread | None = None
+        self.closed = False
+
+    def connect(self):
+        self._thread = threading.Thread(target=asyncio.run, args=(self._run(),), daemon=True)
+        self._thread.start()
+
+    async def _run(self):
+        self._loop = asyncio.get_running_loop()
+        try:
+            reader, self._writer = await asyncio.open_connection(self.host, self.port, limit=MAX_LINE)
+            self._writer.write(encode_message({"op": "join"}))
+            while not self.closed:
+                line = await reader.readline()
+                if not line:
+                    break
+                if self.on_message is not None:
+                    self.on_message(json.loads(line))
+        except (OSError, ValueError):
+            pass
+        finally:
+            self.closed = True
+            if self._writer is not None:
+                self._writer.close()
+            if self.on_close is not None:
+                self.on_close()
+
+    # ---------- főszálról hívható ----------
+    def send(self, msg: dict):
+        loop, writer = self._loop, self._writer
+        if self.closed or loop is None or writer is None:
+            return
+        loop.call_soon_threadsafe(writer.write, encode_message(msg))
+
+    def close(self):
+        # a kapcsolat bontása; az on_close már nem hívódik
+        self.on_close = None
+        self.on_message = None
+        self.closed = True
+        loop, writer = self._loop, self._writer
+        if loop is not None and writer is not None:
+            loop.call_soon_threadsafe(writer.close)
@@ -0,0 +1,69 @@
+from __future__ import annotations
+import math
+
+from kivy.core.text import Label as CoreLabel
+from kivy.graphics import ClearBuffers, ClearColor, Color, Rectangle
+from kivy.graphics.fbo import Fbo
+
+from engine import VALUE_MAX, VALUE_MIN
+
+# Előre renderelt szám-atlasz: a VALUE_MIN..VALUE_MAX számok egyszer, egy közös
+# textúrába rajzolva (fehéren, a tábla Color utasítása színezi). Betűméretenként
+# (px), stílusonként és értéktartományonként egy atlasz; új csak akkor készül, ha a
+# méret / DPI vagy a tábla beállítása változik.
+
+COLS = 16  # legalább; nagy tartománynál kb. négyzetes az atlasz
+PAD = 2
+MAX_CACHED = 4  # ennyi különböző méretű atlasz marad meg (pl. forgatás oda-vissza)
+
+
+class NumberAtlas:
+    def __init__(self, font_px: int, bold: bool = False, lo: int = VALUE_MIN, hi: int = VALUE_MAX):
+        self.font_px = font_px
+        self.bold = bold
+        self.lo = lo
+
+        labels = []
+        for v in range(lo, hi + 1):
+            label = CoreLabel(text=str(v), font_size=font_px, bold=bold)
+            label.refresh()
+            labels.append(label.texture)
+
+        cw = max(t.width for t in labels) + PAD
+        ch = max(t.height for t in labels) + PAD
+        cols = max(COLS, math.isqrt(len(labels) - 1) + 1)
+        rows = (len(labels) + cols - 1) // cols
+
+        # az Fbo a rajzoló utasításait megtartja → GL-kontextus vesztés után újrarajzolja magát
+        self.fbo = Fbo(size=(cols * cw, rows * ch))
+        slots = []
+        with self.fbo:
+            ClearColor(0, 0, 0, 0)
+            ClearBuffers()
+            Color(1, 1, 1, 1)
+            for i, tex in enumerate(labels):
+                r, c = divmod(i, cols)
+                x, y = c * cw, r * ch
+                Rectangle(texture=tex, pos=(x, y), size=tex.size)
+                slots.append((x, y, tex.width, tex.height))
+        self.fbo.draw()
+
+        atlas = self.fbo.texture
+        self.regions = [atlas.get_region(*slot) for slot in slots]
+
+    def get(self, value: int):
+        return self.regions[value - self.lo]
+
+
+_atlases: dict[tuple[int, bool, int], NumberAtlas] = {}
+
+
+def number_atlas(font_px: int, bold: bool = False, hi: int = VALUE_MAX) -> NumberAtlas:
+    key = (int(font_px), bold, hi)
+    atlas = _atlases.pop(key, None)
+    if atlas is None:
+        atlas = NumberAtlas(int(font_px), bold, VALUE_MIN, hi)
+        while len(_atlases) >= MAX_CACHED:
+            _atlases.pop(next(iter(_atlases)))
+    _atlases[key] = atlas  # legutóbb használt a végére
+    return atlas
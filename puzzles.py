@@ -0,0 +1,213 @@
+from __future__ import annotations
+import argparse
+import mmap
+import os
+import random
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import snapshot
+from captures import SumTable
+from engine import VALUE_MAX, VALUE_MIN, BoardConfig, BoardState, iter_bits
+
+# Ütés-feladványok: olyan állások, ahol a lépőnek pontosan EGY szabályos ütése van
+# (egy cél, egy támadó-halmaz). Az egyediség ellenőrzése részhalmaz-összeg számlálás
+# (captures.SumTable.count) minden célra, ezért offline, ProcessPoolExecutor-on készül.
+# Nehézség = a megoldás támadóinak száma - 1 (1: két támadó … LEVELS: LEVELS + 1).
+#
+# Fájl: "SZPZ", verzió (B), szintek száma (B); szintenként (első index, darab) "<II";
+# feladványonként (blob eleje, snapshot hossza, cél, maszk hossza) "<IHHB"; utána a
+# blobok: snapshot.dumps + a támadó maszk. Az app mmap-pel nyitja és csak a fejlécet
+# olvassa; egy feladvány betöltése egy bejegyzés + egy snapshot.loads.
+#
+#   python puzzles.py --per-level 500 --workers 8 --out puzzles.pz
+
+MAGIC = b"SZPZ"
+VERSION = 1
+LEVELS = 4
+PER_LEVEL = 500
+CONFIG = BoardConfig(6, VALUE_MIN, VALUE_MAX, pieces=8)  # 6×6, oldalanként 8 bábu
+FILE_NAME = "puzzles.pz"
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), FILE_NAME)
+BATCH = 50            # ennyi feladvány megy egy feladatban a workerekhez
+MAX_TRIES = 100_000   # jelöltek feladványonként (ennyi után a szint nem generálható)
+
+_HEADER = struct.Struct("<4sBB")
+_LEVEL = struct.Struct("<II")
+_ENTRY = struct.Struct("<IHHB")
+
+
+class PuzzleError(ValueError):
+    pass
+
+
+@dataclass
+class Puzzle:
+    level: int
+    number: int
+    snap: snapshot.Snapshot
+    target: int
+    attackers: int
+
+    @property
+    def board(self) -> BoardState:
+        return self.snap.board
+
+
+# ---------- generálás ----------
+def captures_total(board: BoardState) -> int:
+    # a lépő összes szabályos ütése (cél × támadó-halmaz párok száma)
+    s = board.to_move
+    table = SumTable(board, board.masks[s])
+    values = board.values
+    return sum(table.count(values[t]) for t in iter_bits(board.masks[1 - s]) if table.reachable(values[t]))
+
+
+def make_puzzle(rng: random.Random, level: int, config: BoardConfig = CONFIG):
+    # (tábla, cél, támadó maszk): a kijelölt k támadó összege a cél, és ez az egyetlen ütés
+    k = level + 1
+    per_side = config.per_side
+    pool = range(config.value_min, config.value_max + 1)
+    board = BoardState(config=config)
+    for _ in range(MAX_TRIES):
+        attack = rng.sample(pool, k)
+        total = sum(attack)
+        if total > config.value_max or total in attack:
+            continue
+        rest = rng.sample([v for v in pool if v != total and v not in attack], 2 * per_side - k - 1)
+        mine = attack + rest[:per_side - k]
+        theirs = [total] + rest[per_side - k:]
+
+        side = rng.randrange(2)
+        board.reset(side)
+        cells = rng.sample(range(board.size), 2 * per_side)
+        for idx, v in zip(cells, mine):
+            board.place(idx, side, v)
+        for idx, v in zip(cells[per_side:], theirs):
+            board.place(idx, 1 - side, v)
+        if captures_total(board) != 1:
+            continue
+        attackers = 0
+        for idx in cells[:k]:
+            attackers |= 1 << idx
+        return board, cells[per_side], attackers
+    raise PuzzleError(f"{level}. szint: {MAX_TRIES} jelöltből sincs egyértelmű feladvány")
+
+
+def generate_batch(seed: int, level: int, count: int, config: BoardConfig = CONFIG) -> list[tuple[int, bytes, int, int]]:
+    # worker: (szint, snapshot, cél, támadó maszk) rekordok
+    rng = random.Random(seed)
+    found = []
+    for _ in range(count):
+        board, target, attackers = make_puzzle(rng, level, config)
+        found.append((level, snapshot.dumps(board), target, attackers))
+    return found
+
+
+def write(path: str, puzzles: list[tuple[int, bytes, int, int]], levels: int = LEVELS):
+    puzzles = sorted(puzzles, key=lambda p: p[0])  # stabil: szinten belül a generálás sorrendje
+    counts = [0] * levels
+    for p in puzzles:
+        counts[p[0] - 1] += 1
+    offset = _HEADER.size + levels * _LEVEL.size + len(puzzles) * _ENTRY.size
+    entries, blobs = [], []
+    for _, snap, target, attackers in puzzles:
+        mask = attackers.to_bytes((attackers.bit_length() + 7) // 8 or 1, "little")
+        entries.append(_ENTRY.pack(offset, len(snap), target, len(mask)))
+        blobs.append(snap + mask)
+        offset += len(snap) + len(mask)
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, levels))
+        first = 0
+        for n in counts:
+            f.write(_LEVEL.pack(first, n))
+            first += n
+        f.writelines(entries)
+        f.writelines(blobs)
+    os.replace(tmp, path)
+
+
+def generate(path: str, per_level: int = PER_LEVEL, seed: int = 0, workers: int | None = None,
+             config: BoardConfig = CONFIG) -> tuple[int, float]:
+    # a teljes fájl; visszaadja (darab, feladvány / mp)
+    started = time.perf_counter()
+    jobs = []
+    for level in range(1, LEVELS + 1):
+        for start in range(0, per_level, BATCH):
+            jobs.append(((seed << 16) | (level << 12) | start // BATCH, level, min(BATCH, per_level - start)))
+    found = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(generate_batch, s, level, n, config) for s, level, n in jobs]
+        for fut in futures:
+            found.extend(fut.result())
+    elapsed = time.perf_counter() - started
+    write(path, found)
+    return len(found), len(found) / elapsed if elapsed > 0 else 0.0
+
+
+# ---------- olvasás (lusta) ----------
+class PuzzleBook:
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if len(self.mm) < _HEADER.size:
+                raise PuzzleError("rövid fájl")
+            magic, version, levels = _HEADER.unpack_from(self.mm)
+            if magic != MAGIC:
+                raise PuzzleError("nem feladvány-fájl")
+            if version != VERSION:
+                raise PuzzleError(f"ismeretlen verzió: {version}")
+            self.levels = [_LEVEL.unpack_from(self.mm, _HEADER.size + i * _LEVEL.size) for i in range(levels)]
+        except Exception:
+            self.mm.close()
+            raise
+        self._entries = _HEADER.size + levels * _LEVEL.size
+
+    def close(self):
+        self.mm.close()
+
+    def count(self, level: int) -> int:
+        return self.levels[level - 1][1] if 1 <= level <= len(self.levels) else 0
+
+    def load(self, level: int, number: int, board: BoardState | None = None) -> Puzzle:
+        # egyetlen feladvány; board megadásakor abba tölt (mint snapshot.loads)
+        if not 0 <= number < self.count(level):
+            raise IndexError(f"nincs {level}. szintű {number}. feladvány")
+        first = self.levels[level - 1][0]
+        offset, snap_len, target, mask_len = _ENTRY.unpack_from(self.mm, self._entries + (first + number) * _ENTRY.size)
+        snap = snapshot.loads(self.mm[offset:offset + snap_len], board)
+        end = offset + snap_len + mask_len
+        attackers = int.from_bytes(self.mm[offset + snap_len:end], "little")
+        return Puzzle(level, number, snap, target, attackers)
+
+
+def open_default() -> PuzzleBook | None:
+    # a programmal szállított feladványok; ha nincs (még nem generálták), None
+    try:
+        return PuzzleBook(DEFAULT_PATH)
+    except (OSError, ValueError):
+        return None
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Számos Sakk ütés-feladványok generálása")
+    ap.add_argument("--per-level", type=int, default=PER_LEVEL, help=f"feladvány szintenként (1..{LEVELS})")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--out", default=DEFAULT_PATH)
+    args = ap.parse_args(argv)
+
+    n, rate = generate(args.out, args.per_level, args.seed, args.workers)
+    size = os.path.getsize(args.out)
+    print(f"{n} feladvány → {args.out} ({size / 1e3:.0f} kB, {rate:.1f} feladvány/mp)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
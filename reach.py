@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from deal import lane_bits, subset_counts
+from engine import BoardState, iter_bits
+
+# Élő elérhetőség a kijelöléshez: mely saját bábuk egészíthetik még ki a
+# kijelölt cél összegét, és mely ellenséges bábukat nem lehet semmilyen
+# kombinációval ütni. Oldalanként tartjuk a bábuk részhalmaz-összegeinek
+# SZÁMAIT (tables[side][s]); egy bábu ki-/bevétele O(limit) lépés (törlés:
+# ways[s] -= ways[s-v] növekvő s-sel, visszatétel fordítva). Ütés után csak a
+# delta megy át (támadók a lépő, a cél az ellenfél táblájából); teljes
+# újraszámolás csak új osztásnál / nagy változásnál (visszaállítás, méretváltás).
+
+REBUILD_AFTER = 16  # ennél több változott bábunál olcsóbb az oldal tábláját újraszámolni
+
+
+def _remove(ways: list[int], v: int):
+    for s in range(v, len(ways)):
+        ways[s] -= ways[s - v]
+
+
+def _add(ways: list[int], v: int):
+    for s in range(len(ways) - 1, v - 1, -1):
+        ways[s] += ways[s - v]
+
+
+class Reachability:
+    __slots__ = ("board", "key", "own", "free", "limit", "ways", "tables", "have", "dead")
+
+    def __init__(self, board: BoardState):
+        self.board = board
+        self.key = None     # (zobrist, limit): a pozíció, amire a ways épült
+        self.own = 0
+        self.free = 0       # a ways-ben szereplő (nem kijelölt) saját bábuk
+        self.limit = 0
+        self.ways: list[int] = []  # a lépő oldal táblája a kijelölt támadók nélkül
+        self.tables: list[list[int]] = [[], []]  # oldalanként az összes bábu
+        self.have = [0, 0]  # a tables-ben szereplő bábuk maszkja oldalanként
+        self.dead = 0       # dead_targets() a key pozíciójára
+
+    def _count(self, side: int):
+        # egy oldal összes bábuja egyszerre, sávos egészből (deal.subset_counts)
+        b = self.board
+        limit = self.limit
+        lane = lane_bits(limit)
+        w = subset_counts((b.values[i] for i in iter_bits(b.masks[side])), limit, lane)
+        mask = (1 << lane) - 1
+        self.tables[side] = [(w >> (s * lane)) & mask for s in range(limit + 1)]
+        self.have[side] = b.masks[side]
+
+    def _track(self, side: int):
+        # a tábla igazítása az oldal mostani bábuihoz: ütés után néhány bábu kivétele,
+        # visszavonás után visszatétele
+        now = self.board.masks[side]
+        gone = self.have[side] & ~now
+        new = now & ~self.have[side]
+        if not self.tables[side] or bin(gone | new).count("1") > REBUILD_AFTER:
+            self._count(side)
+            return
+        ways = self.tables[side]
+        values = self.board.values
+        for idx in iter_bits(gone):
+            _remove(ways, values[idx])
+        for idx in iter_bits(new):
+            _add(ways, values[idx])
+        self.have[side] = now
+
+    def _rebuild(self):
+        b = self.board
+        self.key = (b.zobrist, b.config.value_max)
+        if self.limit != b.config.value_max:
+            self.limit = b.config.value_max
+            self.tables = [[], []]
+        self._track(0)
+        self._track(1)
+        self.own = b.masks[b.to_move]
+        self.free = self.own
+        self.ways = list(self.tables[b.to_move])
+        full = self.tables[b.to_move]
+        values = b.values
+        limit = self.limit
+        dead = 0
+        for idx in iter_bits(b.masks[1 - b.to_move]):
+            v = values[idx]
+            if v > limit or not full[v]:
+                dead |= 1 << idx
+        self.dead = dead
+
+    def sync(self):
+        # a tábla aktuális kijelöléséhez igazít: pozícióváltáskor a delta átvezetése,
+        # különben csak a támadó-halmaz változása (tipikusan egy bábu)
+        b = self.board
+        if (b.zobrist, b.config.value_max) != self.key:
+            self._rebuild()
+        want = self.own & ~b.attackers
+        values = b.values
+        for idx in iter_bits(self.free & ~want):
+            _remove(self.ways, values[idx])
+        for idx in iter_bits(want & ~self.free):
+            _add(self.ways, values[idx])
+        self.free = want
+
+    def completers(self) -> int:
+        # a szabad saját bábuk maszkja, amelyek benne lehetnek a célt kiegészítő részhalmazban
+        b = self.board
+        if b.target < 0:
+            return 0
+        rem = b.values[b.target] - b.attack_sum
+        if rem <= 0 or rem > self.limit or self.ways[rem] == 0:
+            return 0
+        ways = self.ways
+        values = b.values
+        mask = 0
+        for idx in iter_bits(self.free):
+            v = values[idx]
+            if v > rem:
+                continue
+            # p-t tartalmazó megoldások: ways_(F\p)[rem - v] = sum_k (-1)^k ways_F[rem - (k+1)v]
+            total, sign, t = 0, 1, rem - v
+            while t >= 0:
+                total += sign * ways[t]
+                sign = -sign
+                t -= v
+            if total:
+                mask |= 1 << idx
+        return mask
+
+    def dead_targets(self) -> int:
+        # ellenséges bábuk, amelyeket a saját bábuk semmilyen részhalmaza nem üt
+        b = self.board
+        if (b.zobrist, b.config.value_max) != self.key:
+            self._rebuild()
+        return self.dead
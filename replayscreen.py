@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from kivy.uix.screenmanager import Screen
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.label import Label
+from kivy.uix.button import Button
+from kivy.uix.slider import Slider
+
+from boardview import BoardView
+import movelog
+import snapshot
+from hud import mmss
+from movelog import MoveLog
+from ui import SCHED
+from engine import BOARD_N, TURN_SECONDS, BoardState, iter_bits
+
+# A legutóbbi meccs visszajátszása (lustán betöltött képernyő, mint a GameScreen).
+
+
+class ReplayScreen(Screen):
+    # lépésnapló visszajátszása: a csúszka bármelyik lépésre ugrik (keyframe + néhány lépés)
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.board = BoardState(BOARD_N)
+        self.log: MoveLog | None = None
+        self.ply = 0  # a mutatott állás lépésszáma (a "pos" a Kivy widget helye)
+        self.start_clock = (TURN_SECONDS, TURN_SECONDS)
+
+        root = BoxLayout(orientation="vertical", padding=10, spacing=8)
+        self.lbl_move = Label(text="", font_size="16sp", size_hint=(1, None), height=44)
+        self.view = BoardView(self.board, size_hint=(1, 1), scheduler=SCHED)
+
+        controls = BoxLayout(orientation="horizontal", size_hint=(1, None), height=48, spacing=8)
+        btn_first = Button(text="|<", size_hint=(None, 1), width=56)
+        btn_prev = Button(text="<", size_hint=(None, 1), width=56)
+        self.slider = Slider(min=0, max=1, step=1, value=0)
+        btn_next = Button(text=">", size_hint=(None, 1), width=56)
+        btn_last = Button(text=">|", size_hint=(None, 1), width=56)
+        btn_back = Button(text="Vissza", size_hint=(None, 1), width=110)
+
+        btn_first.bind(on_release=lambda *_: self.seek(0))
+        btn_prev.bind(on_release=lambda *_: self.seek(self.ply - 1))
+        btn_next.bind(on_release=lambda *_: self.seek(self.ply + 1))
+        btn_last.bind(on_release=lambda *_: self.seek(len(self.log or ())))
+        btn_back.bind(on_release=lambda *_: setattr(self.manager, "current", "stats"))
+        self.slider.bind(value=lambda _, v: self.seek(int(v)))
+
+        for w in (btn_first, btn_prev, self.slider, btn_next, btn_last, btn_back):
+            controls.add_widget(w)
+
+        root.add_widget(self.lbl_move)
+        root.add_widget(self.view)
+        root.add_widget(controls)
+        self.add_widget(root)
+
+    def load(self, log: MoveLog):
+        self.log = log
+        self.start_clock = snapshot.loads(log.start).clock
+        self.ply = -1
+        self.slider.max = max(1, len(log))
+        self.seek(len(log))
+
+    def seek(self, i: int):
+        log = self.log
+        if log is None:
+            return
+        i = max(0, min(len(log), i))
+        if i == self.ply:
+            return
+        if i == self.ply + 1 and self.ply >= 0:
+            # egy lépés előre / hátra: a napló deltája, csak az érintett mezők
+            m = log.move(self.ply)
+            self.view.refresh(movelog.apply_move(self.board, m))
+            clock = m.clock
+        elif i == self.ply - 1 and self._undo_step(log.move(i)):
+            clock = log.move(i - 1).clock if i else self.start_clock
+        else:
+            clock = log.seek(i, self.board).clock
+            # a BoardView csak a ténylegesen megváltozott mezőket rajzolja újra
+            self.view.refresh_all()
+        self.ply = i
+        self.slider.value = i
+
+        desc = "Kezdőállás"
+        if i > 0:
+            m = log.move(i - 1)
+            desc = movelog.KIND_NAMES[m.kind]
+            if m.kind == movelog.CAPTURE:
+                parts = " + ".join(str(self.board.values[a]) for a in iter_bits(m.attackers))
+                desc += f": {self.board.values[m.target]} = {parts}"
+        w, b = clock
+        self.lbl_move.text = f"{i}/{len(log)} – {desc}  |  F: {mmss(w)}  B: {mmss(b)}"
+
+    def _undo_step(self, m: movelog.Move) -> bool:
+        # False: a keyframe előtti ütés értékei nem ismertek → seek() tölti újra
+        try:
+            self.view.refresh(movelog.undo_move(self.board, m))
+        except movelog.MoveLogError:
+            return False
+        return True
@@ -0,0 +1,180 @@
+from __future__ import annotations
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+import tracing
+
+# Energiatakarékos ütemező a Kivy Clock fölött: időzítők és kirajzolás-triggerek egy
+# helyen, okokkal felfüggeszthetők (szünet, háttérbe kerülés, menü). Felfüggesztve
+# egyetlen Clock-esemény sincs élesítve; folytatáskor minden pontosan a hátralévő
+# idejével indul újra. Ébresztés- és frame-számlálók a készüléken méréshez.
+# Kivy-független: a clock bármi schedule_once(fn, timeout) → .cancel() API-val.
+
+PAUSED = "szünet"
+BACKGROUND = "háttér"
+IDLE = "menü"
+ALL = frozenset((PAUSED, BACKGROUND, IDLE))
+VISIBLE = frozenset((BACKGROUND, IDLE))  # kirajzolás: szünetben is kell (pl. visszaállított állás)
+
+NEXT_FRAME = -1  # Kivy: a következő frame kirajzolása előtt
+
+
+class _Job:
+    __slots__ = ("name", "fn", "period", "due", "left", "event", "pauses", "frame")
+
+    def __init__(self, name: str, fn, delay: float, period: float | None, pauses: frozenset, frame: bool, now: float):
+        self.name = name
+        self.fn = fn
+        self.period = period
+        self.due = now + max(0.0, delay)
+        self.left = max(0.0, delay) if delay >= 0 else NEXT_FRAME  # felfüggesztéskor a hátralévő idő
+        self.event = None
+        self.pauses = pauses
+        self.frame = frame
+
+
+@dataclass
+class SchedulerStats:
+    wakeups: int
+    frames: int
+    pending: int
+    suspended: tuple[str, ...]
+    suspended_seconds: float
+    by_name: dict[str, int] = field(default_factory=dict)
+
+
+class Trigger:
+    # Clock.create_trigger megfelelője: a hívások a következő frame-ig egy futásba vonódnak
+    __slots__ = ("sched", "name", "fn", "pauses")
+
+    def __init__(self, sched: Scheduler, name: str, fn, pauses: frozenset):
+        self.sched = sched
+        self.name = name
+        self.fn = fn
+        self.pauses = pauses
+
+    def __call__(self, *_):
+        if self not in self.sched.jobs:
+            self.sched._add(self, _Job(self.name, self.fn, NEXT_FRAME, None, self.pauses, True, self.sched.now()))
+
+    def cancel(self):
+        self.sched.cancel(self)
+
+
+class Scheduler:
+    def __init__(self, clock, now=time.monotonic):
+        self.clock = clock
+        self.now = now
+        self.jobs: dict = {}          # kulcs (név vagy Trigger) → _Job
+        self.reasons: set[str] = set()
+        self.wakeups = Counter()      # név → lefutott callbackek
+        self.frames = 0               # lefutott kirajzolás-triggerek
+        self._suspended_at = None
+        self._suspended_total = 0.0
+
+    # ---------- regisztrálás ----------
+    def once(self, name: str, fn, delay: float, pauses: frozenset = ALL):
+        # ugyanazzal a névvel a korábbi ütemezést felülírja
+        self._add(name, _Job(name, fn, delay, None, pauses, False, self.now()))
+
+    def interval(self, name: str, fn, period: float, pauses: frozenset = ALL):
+        self._add(name, _Job(name, fn, period, period, pauses, False, self.now()))
+
+    def trigger(self, name: str, fn, pauses: frozenset = VISIBLE) -> Trigger:
+        return Trigger(self, name, fn, pauses)
+
+    def cancel(self, key):
+        job = self.jobs.pop(key, None)
+        if job is not None and job.event is not None:
+            job.event.cancel()
+
+    def pending(self, key) -> bool:
+        return key in self.jobs
+
+    def _add(self, key, job: _Job):
+        self.cancel(key)
+        self.jobs[key] = job
+        if self._active(job):
+            self._arm(key, job)
+
+    def _active(self, job: _Job) -> bool:
+        return not (job.pauses & self.reasons)
+
+    def _arm(self, key, job: _Job):
+        delay = job.left if job.left == NEXT_FRAME else max(0.0, job.due - self.now())
+        job.event = self.clock.schedule_once(lambda dt: self._fire(key, job, dt), delay)
+
+    def _fire(self, key, job: _Job, dt):
+        job.event = None
+        if self.jobs.get(key) is not job:
+            return
+        self.wakeups[job.name] += 1
+        if job.frame:
+            self.frames += 1
+        if job.period is None:
+            # egyszeri: a callback újra ütemezheti ugyanazzal a névvel
+            del self.jobs[key]
+            job.fn(dt)
+            return
+        job.due = self.now() + job.period
+        job.left = job.period
+        job.fn(dt)
+        if self.jobs.get(key) is job and job.event is None and self._active(job):
+            self._arm(key, job)
+
+    # ---------- felfüggesztés ----------
+    def suspend(self, reason: str):
+        if reason in self.reasons:
+            return
+        if not self.reasons:
+            self._suspended_at = self.now()
+        self.reasons.add(reason)
+        now = self.now()
+        for job in self.jobs.values():
+            if job.event is not None and not self._active(job):
+                job.event.cancel()
+                job.event = None
+                if job.left != NEXT_FRAME:
+                    job.left = max(0.0, job.due - now)
+        tracing.instant("sched.suspend", cat="sched", reason=reason)
+
+    def resume(self, reason: str):
+        if reason not in self.reasons:
+            return
+        self.reasons.discard(reason)
+        now = self.now()
+        if not self.reasons and self._suspended_at is not None:
+            self._suspended_total += now - self._suspended_at
+            self._suspended_at = None
+        for key, job in self.jobs.items():
+            if job.event is None and self._active(job):
+                # pontosan a felfüggesztéskor hátralévő idővel
+                if job.left != NEXT_FRAME:
+                    job.due = now + job.left
+                self._arm(key, job)
+        tracing.instant("sched.resume", cat="sched", reason=reason)
+
+    def suspended(self, reason: str | None = None) -> bool:
+        return bool(self.reasons) if reason is None else reason in self.reasons
+
+    # ---------- számlálók ----------
+    def stats(self) -> SchedulerStats:
+        total = self._suspended_total
+        if self._suspended_at is not None:
+            total += self.now() - self._suspended_at
+        return SchedulerStats(
+            wakeups=sum(self.wakeups.values()),
+            frames=self.frames,
+            pending=sum(1 for job in self.jobs.values() if job.event is not None),
+            suspended=tuple(sorted(self.reasons)),
+            suspended_seconds=total,
+            by_name=dict(self.wakeups),
+        )
+
+    def reset_stats(self):
+        self.wakeups.clear()
+        self.frames = 0
+        self._suspended_total = 0.0
+        if self._suspended_at is not None:
+            self._suspended_at = self.now()
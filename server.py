@@ -0,0 +1,270 @@
+from __future__ import annotations
+import argparse
+import asyncio
+import base64
+import itertools
+import json
+import random
+import sys
+import time
+from collections import deque
+from dataclasses import asdict
+
+import snapshot
+from captures import no_captures_left
+from deal import balanced_deal, deal_board
+from engine import TURN_SECONDS, BoardState, GameResult
+from gameclock import GameClock
+
+# Fej nélküli asyncio játékszerver: sok párhuzamos játék egy processzben. Az
+# állás és az órák a szerveré; a kliensek csak kis delta-üzeneteket küldenek
+# (cél + támadó maszk), a szerver ugyanazzal a szabállyal ellenőriz, mint a
+# GameScreen.try_capture (BoardState.legal_capture).
+#
+# Protokoll: soronként egy JSON objektum.
+#   kliens → szerver  {"op": "join"} | {"op": "capture", "t": 17, "a": <maszk>} | {"op": "pass"} | {"op": "stats"}
+#   szerver → kliens  {"op": "joined", "game": id, "side": 0/1}
+#                     {"op": "start", "snap": <base64 snapshot>}
+#                     {"op": "move", "kind": "capture"/"pass", "t", "a", "clock": [F, B], "to_move"}
+#                     {"op": "end", "result": {...GameResult}} | {"op": "error", "msg": "..."}
+#
+#   python server.py --port 8765
+
+HOST = "127.0.0.1"
+PORT = 8765
+MAX_SESSIONS = 10000
+MAX_LINE = 1024           # egy üzenet legfeljebb ennyi bájt (a maszk is belefér)
+LATENCY_SAMPLES = 10000   # a p50/p99 az utolsó ennyi lépésből
+STATS_EVERY = 30.0        # mp; 0 = nincs időszakos napló
+
+
+def encode_message(msg: dict) -> bytes:
+    return json.dumps(msg, separators=(",", ":"), ensure_ascii=False).encode() + b"\n"
+
+
+def percentile(samples, q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Session:
+    __slots__ = ("id", "board", "clock", "players", "timer")
+
+    def __init__(self, sid: int, rng: random.Random):
+        self.id = sid
+        self.board = BoardState()
+        # ugyanaz a kiegyensúlyozott osztás, mint a GameScreen-en; a szerver seedje → a játékok seedjei
+        deal_board(self.board, balanced_deal(rng.getrandbits(32)))
+        self.clock = GameClock(TURN_SECONDS, self.board.to_move)
+        self.players: list[asyncio.StreamWriter | None] = [None, None]
+        self.timer: asyncio.TimerHandle | None = None
+
+    def send(self, msg: dict):
+        data = encode_message(msg)
+        for w in self.players:
+            if w is not None and not w.is_closing():
+                w.write(data)
+
+
+class GameServer:
+    def __init__(self, max_sessions: int = MAX_SESSIONS, seed: int | None = None):
+        self.max_sessions = max_sessions
+        self.rng = random.Random(seed)
+        self.sessions: dict[int, Session] = {}
+        self.waiting: Session | None = None
+        self.latency = deque(maxlen=LATENCY_SAMPLES)
+        self.moves = 0
+        self.finished = 0
+        self._ids = itertools.count(1)
+
+    # ---------- kapcsolatok ----------
+    async def start(self, host: str = HOST, port: int = PORT) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self.handle, host, port, limit=MAX_LINE)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        session, side = None, -1
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    self._error(writer, "túl hosszú üzenet")
+                    break
+                if not line:
+                    break
+                started = time.perf_counter()
+                try:
+                    msg = json.loads(line)
+                    op = msg["op"]
+                except (ValueError, KeyError, TypeError):
+                    self._error(writer, "hibás üzenet")
+                    continue
+
+                if op == "join":
+                    if session is None:
+                        session, side = self._join(writer)
+                elif op == "stats":
+                    writer.write(encode_message({"op": "stats", **self.stats()}))
+                elif session is None or session.id not in self.sessions:
+                    self._error(writer, "nincs játékban")
+                elif op in ("capture", "pass"):
+                    if self._move(session, side, op, msg):
+                        self.latency.append(time.perf_counter() - started)
+                else:
+                    self._error(writer, f"ismeretlen művelet: {op}")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            if session is not None:
+                self._leave(session, side)
+            writer.close()
+
+    def _error(self, writer: asyncio.StreamWriter, msg: str):
+        writer.write(encode_message({"op": "error", "msg": msg}))
+
+    # ---------- párosítás ----------
+    def _join(self, writer) -> tuple[Session | None, int]:
+        s = self.waiting
+        if s is None:
+            if len(self.sessions) >= self.max_sessions:
+                self._error(writer, "a szerver megtelt")
+                return None, -1
+            s = Session(next(self._ids), self.rng)
+            self.sessions[s.id] = s
+            s.players[0] = writer
+            self.waiting = s
+            writer.write(encode_message({"op": "joined", "game": s.id, "side": 0}))
+            return s, 0
+
+        self.waiting = None
+        s.players[1] = writer
+        writer.write(encode_message({"op": "joined", "game": s.id, "side": 1}))
+        s.send({"op": "start", "snap": base64.b64encode(snapshot.dumps(s.board)).decode()})
+        s.clock.start()
+        if no_captures_left(s.board):
+            self._end(s, "Nincs ütés")
+        else:
+            self._arm_timer(s)
+        return s, 1
+
+    def _leave(self, s: Session, side: int):
+        if s.id not in self.sessions:
+            return
+        s.players[side] = None
+        if self.waiting is s:
+            self.waiting = None
+            self._close(s)
+        else:
+            self._end(s, "Kilépett")
+
+    # ---------- játék ----------
+    def _move(self, s: Session, side: int, op: str, msg: dict) -> bool:
+        b = s.board
+        writer = s.players[side]
+        if s.players[1 - side] is None:
+            self._error(writer, "még nincs ellenfél")
+            return False
+        if b.to_move != side:
+            self._error(writer, "nem te jössz")
+            return False
+        if s.clock.expired():
+            self._end(s, "Idő")
+            return False
+
+        if op == "pass":
+            b.pass_turn()
+            t, a = -1, 0
+        else:
+            t, a = msg.get("t"), msg.get("a")
+            if not isinstance(t, int) or not isinstance(a, int) or not b.legal_capture(t, a):
+                self._error(writer, "szabálytalan ütés")
+                return False
+            b.apply_capture(t, a)
+
+        self.moves += 1
+        s.clock.switch(b.to_move)
+        s.send({
+            "op": "move", "kind": op, "t": t, "a": a,
+            "clock": [round(s.clock.left(0), 3), round(s.clock.left(1), 3)],
+            "to_move": b.to_move,
+        })
+
+        if b.is_over():
+            self._end(s, "Elfogyott")
+        elif no_captures_left(b):
+            self._end(s, "Nincs ütés")
+        else:
+            self._arm_timer(s)
+        return True
+
+    def _arm_timer(self, s: Session):
+        # egyetlen időzítő játékonként: a soron lévő oldal idejének lejártára
+        if s.timer is not None:
+            s.timer.cancel()
+        loop = asyncio.get_running_loop()
+        s.timer = loop.call_later(s.clock.left(s.clock.side) + 0.001, self._timeout, s)
+
+    def _timeout(self, s: Session):
+        s.timer = None
+        if s.id in self.sessions and s.clock.expired():
+            self._end(s, "Idő")
+        elif s.id in self.sessions:
+            self._arm_timer(s)
+
+    def _end(self, s: Session, reason: str) -> GameResult:
+        s.clock.stop()
+        result = s.board.finish(reason)
+        s.send({"op": "end", "result": asdict(result)})
+        self.finished += 1
+        self._close(s)
+        return result
+
+    def _close(self, s: Session):
+        if s.timer is not None:
+            s.timer.cancel()
+            s.timer = None
+        self.sessions.pop(s.id, None)
+
+    # ---------- mérés ----------
+    def stats(self) -> dict:
+        lat = self.latency
+        return {
+            "sessions": len(self.sessions),
+            "moves": self.moves,
+            "finished": self.finished,
+            "p50_ms": round(percentile(lat, 0.50) * 1000, 3),
+            "p99_ms": round(percentile(lat, 0.99) * 1000, 3),
+        }
+
+
+async def serve(host: str, port: int, max_sessions: int, stats_every: float):
+    server = GameServer(max_sessions)
+    srv = await server.start(host, port)
+    print(f"Számos Sakk szerver: {host}:{port}", flush=True)
+    async with srv:
+        if stats_every <= 0:
+            await srv.serve_forever()
+        while True:
+            await asyncio.sleep(stats_every)
+            print(json.dumps(server.stats()), flush=True)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Számos Sakk asyncio játékszerver")
+    ap.add_argument("--host", default=HOST)
+    ap.add_argument("--port", type=int, default=PORT)
+    ap.add_argument("--max-sessions", type=int, default=MAX_SESSIONS)
+    ap.add_argument("--stats-every", type=float, default=STATS_EVERY)
+    args = ap.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.max_sessions, args.stats_every))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
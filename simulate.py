@@ -0,0 +1,290 @@
+from __future__ import annotations
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import asdict
+
+from ai import PASS, AIPlayer
+from captures import no_captures_left, sum_table
+from deal import balanced_deal, deal_board
+from history import MatchHistory
+import snapshot
+from movelog import LogWriter, MoveLog
+from engine import DRAW, SIDES, TURN_SECONDS, BoardState, GameResult, iter_bits
+
+# Fej nélküli önjáték-szimulátor (Kivy nélkül): N játék ProcessPoolExecutor-on,
+# seedelt táblákkal és cserélhető játékos-stratégiákkal. Ugyanazokat a GameResult
+# rekordokat adja, mint a SzamosSakkApp.record_result.
+#
+#   python simulate.py --games 100000 --white greedy --black random --out results.jsonl
+
+MOVE_TIME = (2.0, 12.0)   # egy lépés szimulált gondolkodási ideje (mp)
+RANDOM_PASS = 0.10        # a random játékos ennyi eséllyel passzol akkor is, ha tudna ütni
+RANDOM_SUBSETS = 4        # célonként ennyi támadó-kombináció közül választ
+GREEDY_SUBSETS = 16       # a mohó játékos célonként ennyi kombinációt vizsgál
+AI_TIME = 0.05            # gépi játékos valós gondolkodási ideje lépésenként (mp)
+BATCH = 64                # ennyi játék megy egy feladatban a workerekhez
+IN_FLIGHT = 2             # workerenként legfeljebb ennyi feladat él egyszerre (korlátos memória)
+
+
+# ---------- stratégiák: policy(board, rng) -> (cél, támadó maszk) vagy PASS ----------
+def _reachable_targets(board: BoardState) -> list[int]:
+    s = board.to_move
+    table = sum_table(board)
+    values = board.values
+    return [t for t in iter_bits(board.masks[1 - s]) if table.reachable(values[t])]
+
+
+def random_policy(board: BoardState, rng: random.Random):
+    targets = _reachable_targets(board)
+    if not targets or rng.random() < RANDOM_PASS:
+        return PASS
+    target = rng.choice(targets)
+    options = []
+    for mask in sum_table(board).iter_subsets(board.values[target]):
+        options.append(mask)
+        if len(options) == RANDOM_SUBSETS:
+            break
+    return target, rng.choice(options)
+
+
+def greedy_policy(board: BoardState, rng: random.Random):
+    # mindig üt, ha tud: a legkevesebb támadóval, azon belül a legnagyobb célra
+    best, best_key = PASS, None
+    table = sum_table(board)
+    values = board.values
+    for target in _reachable_targets(board):
+        for i, mask in enumerate(table.iter_subsets(values[target])):
+            if i == GREEDY_SUBSETS:
+                break
+            key = (bin(mask).count("1"), -values[target])
+            if best_key is None or key < best_key:
+                best, best_key = (target, mask), key
+    return best
+
+
+class _AIPolicy:
+    # processzenként egy AIPlayer (a transzpozíciós tábla játékok között is hasznos)
+    def __init__(self, budget: float):
+        self.budget = budget
+        self.player = AIPlayer()
+
+    def __call__(self, board: BoardState, rng: random.Random):
+        return self.player.search(board, self.budget).move
+
+
+POLICIES = ("random", "greedy", "ai")
+
+
+def make_policy(name: str, ai_time: float = AI_TIME):
+    if name == "random":
+        return random_policy
+    if name == "greedy":
+        return greedy_policy
+    if name == "ai":
+        return _AIPolicy(ai_time)
+    raise ValueError(f"ismeretlen stratégia: {name}")
+
+
+# ---------- egy játék ----------
+def game_seed(seed: int, index: int) -> int:
+    return (seed << 32) | index
+
+
+def play_game(seed: int, white, black, move_time=MOVE_TIME, start: bytes | None = None,
+              logs: list | None = None, fairness: float | None = None) -> GameResult:
+    # start: mentett állás (snapshot.dumps), különben seedelt új játék
+    # logs: ha megadott, a játék lépésnaplója (MoveLog.to_bytes) ide kerül
+    # fairness: ha megadott, kiegyensúlyozott osztás (deal.balanced_deal) ezzel a céllal
+    rng = random.Random(seed)
+    if start is None:
+        board = BoardState()
+        if fairness is None:
+            board.new_game(rng)
+        else:
+            deal_board(board, balanced_deal(seed, fairness))
+        time_left = [TURN_SECONDS, TURN_SECONDS]
+    else:
+        snap = snapshot.loads(start)
+        board = snap.board
+        board.clear_selection()
+        time_left = list(snap.clock)
+    policies = (white, black)
+    log = MoveLog(board, time_left) if logs is not None else None
+
+    def end(reason: str) -> GameResult:
+        if log is not None:
+            logs.append(log.to_bytes())
+        return board.finish(reason)
+
+    while True:
+        s = board.to_move
+        move = policies[s](board, rng)
+
+        # az óra a gondolkodás alatt fogy (mint GameScreen._tick)
+        time_left[s] = max(0.0, time_left[s] - rng.uniform(*move_time))
+        if time_left[s] <= 0:
+            if log is not None:
+                log.timeout(board, time_left)
+            return end("Idő")
+
+        if move == PASS:
+            board.pass_turn()
+            if log is not None:
+                log.pass_turn(board, time_left)
+            continue
+
+        board.apply_capture(*move)
+        if log is not None:
+            log.capture(board, time_left, *move)
+        if board.is_over():
+            return end("Elfogyott")
+        if no_captures_left(board):
+            return end("Nincs ütés")
+
+
+def run_batch(seed: int, start: int, count: int, white: str, black: str, ai_time: float,
+              position: bytes | None = None, record: bool = False,
+              fairness: float | None = None) -> tuple[list[GameResult], list[bytes]]:
+    wp = make_policy(white, ai_time)
+    bp = make_policy(black, ai_time)
+    logs = [] if record else None
+    results = [
+        play_game(game_seed(seed, i), wp, bp, start=position, logs=logs, fairness=fairness)
+        for i in range(start, start + count)
+    ]
+    return results, logs or []
+
+
+# ---------- összesítés ----------
+class Summary:
+    # inkrementális összesítő: milliónyi játéknál sem tartja memóriában a rekordokat
+    def __init__(self):
+        self.games = 0
+        self.winners = Counter()
+        self.reasons = Counter()
+        self.first_wins = 0
+        self.decided = 0
+        self.left = (Counter(), Counter())
+
+    def add(self, r: GameResult):
+        self.games += 1
+        self.winners[r.winner] += 1
+        self.reasons[r.reason] += 1
+        if r.winner != DRAW:
+            self.decided += 1
+            self.first_wins += r.winner == r.first
+        self.left[0][r.white_left] += 1
+        self.left[1][r.black_left] += 1
+
+    @staticmethod
+    def _quantiles(dist: Counter, qs=(0.0, 0.25, 0.5, 0.75, 1.0)) -> list[int]:
+        total = sum(dist.values())
+        keys = sorted(dist)
+        out = []
+        for q in qs:
+            need, seen = max(1, math.ceil(q * total)), 0
+            for k in keys:
+                seen += dist[k]
+                if seen >= need:
+                    out.append(k)
+                    break
+        return out
+
+    def report(self, elapsed: float) -> str:
+        n = self.games
+        if n == 0:
+            return "Nem futott játék."
+        lines = [
+            f"Játékok: {n}  ({elapsed:.1f} mp, {n / elapsed:.1f} játék/mp)",
+            "Győztes: " + ", ".join(f"{w} {self.winners[w] / n:.1%}" for w in (*SIDES, DRAW)),
+            f"Kezdő nyer (döntött játékokból): {self.first_wins / self.decided:.1%}" if self.decided else "Kezdő nyer: -",
+            "Befejezés oka: " + ", ".join(f"{k} {v / n:.1%}" for k, v in self.reasons.most_common()),
+        ]
+        for side, dist in zip(SIDES, self.left):
+            mean = sum(k * v for k, v in dist.items()) / n
+            q = self._quantiles(dist)
+            lines.append(f"Maradt ({side}): átlag {mean:.1f}, min/q1/med/q3/max {'/'.join(map(str, q))}")
+        return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Számos Sakk fej nélküli önjáték-szimuláció")
+    ap.add_argument("--games", type=int, default=1000)
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--white", choices=POLICIES, default="random")
+    ap.add_argument("--black", choices=POLICIES, default="random")
+    ap.add_argument("--ai-time", type=float, default=AI_TIME, help="AI gondolkodási idő lépésenként (mp)")
+    ap.add_argument("--batch", type=int, default=BATCH)
+    ap.add_argument("--out", help="GameResult rekordok JSON Lines fájlba")
+    ap.add_argument("--db", help="GameResult rekordok meccstörténet-adatbázisba (history.sqlite3)")
+    ap.add_argument("--position", help="minden játék ebből a mentett állásból indul (game.snap)")
+    ap.add_argument("--moves", help="lépésnaplók folyamatos kiírása ebbe a fájlba (movelog.iter_logs olvassa)")
+    ap.add_argument("--fairness", type=float, help="kiegyensúlyozott osztás ezzel a céllal (pl. 0.9), mint a játékban")
+    args = ap.parse_args(argv)
+
+    position = None
+    if args.position:
+        with open(args.position, "rb") as f:
+            position = f.read()
+        snapshot.loads(position)  # hibás fájlnál itt álljon meg, ne a workerekben
+
+    summary = Summary()
+    out = open(args.out, "w", encoding="utf-8") if args.out else None
+    db = MatchHistory(args.db) if args.db else None
+    moves = LogWriter(args.moves) if args.moves else None
+    started = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            # a feladatokat csúszó ablakban adjuk be: a kész eredmények kiírás után
+            # felszabadulnak, így a memória nem nő a játékok számával
+            starts = iter(range(0, args.games, args.batch))
+            window = max(1, args.workers) * IN_FLIGHT
+            pending = set()
+            while True:
+                for start in starts:
+                    pending.add(pool.submit(run_batch, args.seed, start, min(args.batch, args.games - start),
+                                            args.white, args.black, args.ai_time, position, moves is not None,
+                                            args.fairness))
+                    if len(pending) >= window:
+                        break
+                if not pending:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                while done:
+                    # a future-t és a naplókat kiírás után rögtön eldobjuk (a hullám többi
+                    # eredményére várva se maradjanak a memóriában)
+                    fut = done.pop()
+                    batch, logs = fut.result()
+                    del fut
+                    for log in logs:
+                        moves.write(log)
+                    del logs
+                    for r in batch:
+                        summary.add(r)
+                        if out is not None:
+                            out.write(json.dumps(asdict(r), ensure_ascii=False) + "\n")
+                    if db is not None:
+                        db.add_many(batch)
+                    del batch
+    finally:
+        if out is not None:
+            out.close()
+        if db is not None:
+            db.close()
+        if moves is not None:
+            moves.close()
+
+    print(summary.report(time.perf_counter() - started))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
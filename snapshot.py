@@ -0,0 +1,182 @@
+from __future__ import annotations
+import os
+import struct
+import sys
+import zlib
+from array import array
+from dataclasses import dataclass
+
+from engine import DEFAULT_CONFIG, TURN_SECONDS, BoardConfig, BoardState, iter_bits
+
+# Tömör, verziózott bináris pillanatkép egy folyamatban lévő játékról.
+# v1 elrendezés (little endian):
+#   fejléc   "SZSK", verzió (B), táblaméret n (B)
+#   értékek  n*n bájt, mezőnként (0 = üres)
+#   fehér    a fehér bábuk bitmaszkja, ceil(n*n/8) bájt (a többi nem üres mező fekete)
+#   állapot  soron (b), kezdő (b), cél (b, -1 = nincs), jelzők (B: szünet, gép, gép = Fekete)
+#   támadók  bitmaszk, ceil(n*n/8) bájt
+#   óra      Fehér, Fekete maradék ideje (d, d)
+#   crc32    az előző bájtokra (I)
+# 10×10-es táblán az értékek + tulajdonosok 113 bájt, az egész 156.
+#
+# v2 (nem alapbeállítású tábla, pl. 30×30): a fejléc után a BoardConfig
+# (érték min, max, bábuk oldalanként: H, H, H), az értékek mezőnként 2 bájt,
+# a cél index 2 bájt (H, 0xFFFF = nincs; 255×255-ig elég); a többi ugyanaz.
+# Az alaptábla továbbra is v1.
+
+MAGIC = b"SZSK"
+VERSION = 1
+VERSION_WIDE = 2
+
+_HEADER = struct.Struct("<4sBB")
+_CONFIG = struct.Struct("<HHH")
+_STATE = struct.Struct("<bbbB")
+_STATE_WIDE = struct.Struct("<bbHB")
+NO_TARGET = 0xFFFF  # v2: nincs cél (a legnagyobb index 255 * 255 - 1 = 65024)
+_CLOCK = struct.Struct("<dd")
+_CRC = struct.Struct("<I")
+
+FLAG_PAUSED = 1
+FLAG_AI = 2
+FLAG_AI_BLACK = 4
+
+
+class SnapshotError(ValueError):
+    pass
+
+
+@dataclass
+class Snapshot:
+    board: BoardState
+    clock: tuple[float, float] = (TURN_SECONDS, TURN_SECONDS)
+    paused: bool = False
+    ai_side: int | None = None  # 0 / 1 / None (hot-seat)
+
+
+def _mask_bytes(size: int) -> int:
+    return (size + 7) // 8
+
+
+def dumps(board: BoardState, clock=(TURN_SECONDS, TURN_SECONDS), paused: bool = False, ai_side: int | None = None) -> bytes:
+    size = board.size
+    nb = _mask_bytes(size)
+    cfg = board.config
+    wide = cfg != DEFAULT_CONFIG
+    values = array("H", [0]) * size if wide else array("B", bytes(size))
+    for side in (0, 1):
+        for idx in iter_bits(board.masks[side]):
+            values[idx] = board.values[idx]
+
+    flags = FLAG_PAUSED if paused else 0
+    if ai_side is not None:
+        flags |= FLAG_AI | (FLAG_AI_BLACK if ai_side else 0)
+
+    if wide:
+        state = _STATE_WIDE.pack(board.to_move, board.first, NO_TARGET if board.target < 0 else board.target, flags)
+    else:
+        state = _STATE.pack(board.to_move, board.first, board.target, flags)
+
+    if wide and sys.byteorder == "big":
+        values.byteswap()
+    body = b"".join((
+        _HEADER.pack(MAGIC, VERSION_WIDE if wide else VERSION, board.n),
+        _CONFIG.pack(cfg.value_min, cfg.value_max, cfg.pieces) if wide else b"",
+        values.tobytes(),
+        board.masks[0].to_bytes(nb, "little"),
+        state,
+        board.attackers.to_bytes(nb, "little"),
+        _CLOCK.pack(*clock),
+    ))
+    return body + _CRC.pack(zlib.crc32(body))
+
+
+def loads(data: bytes, board: BoardState | None = None) -> Snapshot:
+    # board megadásakor abba tölt (a kirajzoló widget ugyanazt az objektumot látja)
+    if len(data) < _HEADER.size + _CRC.size:
+        raise SnapshotError("túl rövid pillanatkép")
+    magic, version, n = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise SnapshotError("nem pillanatkép")
+    if version not in (VERSION, VERSION_WIDE):
+        raise SnapshotError(f"ismeretlen verzió: {version}")
+    body, (crc,) = data[:-_CRC.size], _CRC.unpack_from(data, len(data) - _CRC.size)
+    if zlib.crc32(body) != crc:
+        raise SnapshotError("sérült pillanatkép (crc)")
+
+    wide = version == VERSION_WIDE
+    size = n * n
+    nb = _mask_bytes(size)
+    state = _STATE_WIDE if wide else _STATE
+    value_bytes = 2 * size if wide else size
+    head = _HEADER.size + (_CONFIG.size if wide else 0)
+    if len(body) != head + value_bytes + 2 * nb + state.size + _CLOCK.size:
+        raise SnapshotError("hibás hossz")
+
+    if wide:
+        try:
+            cfg = BoardConfig(n, *_CONFIG.unpack_from(body, _HEADER.size))
+        except (ValueError, TypeError) as e:
+            raise SnapshotError(f"hibás táblabeállítás: {e}") from None
+    elif n == DEFAULT_CONFIG.n:
+        cfg = DEFAULT_CONFIG
+    else:
+        raise SnapshotError(f"v1 pillanatkép csak {DEFAULT_CONFIG.label} táblára: {n}")
+
+    # board megadásakor az a mentett méretre / tartományra áll át (a BoardView ezt észleli)
+    if board is None:
+        board = BoardState(config=cfg)
+    elif board.config != cfg:
+        board.configure(cfg)
+
+    off = head
+    values = array("H" if wide else "B", body[off:off + value_bytes])
+    if wide and sys.byteorder == "big":
+        values.byteswap()
+    off += value_bytes
+    white = int.from_bytes(body[off:off + nb], "little")
+    off += nb
+    to_move, first, target, flags = state.unpack_from(body, off)
+    off += state.size
+    attackers = int.from_bytes(body[off:off + nb], "little")
+    off += nb
+    clock = _CLOCK.unpack_from(body, off)
+
+    board.reset(to_move, first)
+    for idx, v in enumerate(values):
+        if v:
+            board.place(idx, 0 if white >> idx & 1 else 1, v)
+
+    # kijelölés: csak érvényes (létező, megfelelő oldalú) mezők; a NO_TARGET is kiesik
+    if 0 <= target < size and board.owners[target] == 1 - to_move:
+        board.target = target
+    board.attackers = attackers & board.masks[to_move]
+    board.attack_sum = sum(board.values[i] for i in iter_bits(board.attackers))
+
+    ai_side = (1 if flags & FLAG_AI_BLACK else 0) if flags & FLAG_AI else None
+    return Snapshot(board, (clock[0], clock[1]), bool(flags & FLAG_PAUSED), ai_side)
+
+
+def save(path: str, data: bytes):
+    # atomikus: ideiglenes fájl + fsync + csere, így félbeszakadt írás nem ront el mentést
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def load(path: str, board: BoardState | None = None) -> Snapshot | None:
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    return loads(data, board)
+
+
+def discard(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,56 @@
+from __future__ import annotations
+import json
+import time
+from contextlib import contextmanager
+
+# Indulási idő mérése: a modul importja a t0, ezért a main.py legelején kell
+# importálni. Pontok (mark) és szakaszok (span) a t0-hoz képest, mp-ben.
+
+_T0 = time.perf_counter()
+_marks: list[tuple[str, float]] = []
+_spans: dict[str, float] = {}
+
+
+def elapsed() -> float:
+    return time.perf_counter() - _T0
+
+
+def mark(name: str):
+    _marks.append((name, elapsed()))
+
+
+@contextmanager
+def span(name: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _spans[name] = _spans.get(name, 0.0) + time.perf_counter() - start
+
+
+def report(**meta) -> dict:
+    # mark-ok: t0-tól mért idő + az előző ponthoz képesti növekmény
+    points, prev = [], 0.0
+    for name, t in _marks:
+        points.append({"name": name, "at_ms": round(t * 1000, 2), "delta_ms": round((t - prev) * 1000, 2)})
+        prev = t
+    return {
+        **meta,
+        "time": time.time(),
+        "marks": points,
+        "spans_ms": {k: round(v * 1000, 2) for k, v in _spans.items()},
+    }
+
+
+def write_report(path: str, **meta) -> dict:
+    # indításonként egy sor (JSON Lines) → verziók között összevethető
+    data = report(**meta)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(data, ensure_ascii=False) + "\n")
+    return data
+
+
+def summary(data: dict) -> str:
+    parts = [f"{m['name']}={m['at_ms']:.0f}ms" for m in data["marks"]]
+    parts += [f"{k}={v:.0f}ms" for k, v in data["spans_ms"].items()]
+    return " ".join(parts)
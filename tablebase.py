@@ -0,0 +1,309 @@
+from __future__ import annotations
+import argparse
+import mmap
+import os
+import struct
+import sys
+import time
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import combinations
+
+from engine import VALUE_MAX, BoardState, iter_bits
+
+# Végjáték-tábla: oldalanként legfeljebb PIECES bábus állások pontos értéke
+# tökéletes játékkal. Az ütés nem függ a mező helyétől, így az állás = (a lépő
+# számai, az ellenfél számai); a színek cseréje ugyanaz az állás. Csak azokat
+# tároljuk, ahol valamelyik oldal még üthet – a többi értéke a statikus végeredmény.
+#
+# Érték (a lépő szemszögéből): (bábuszám-különbség, összérték-különbség) a játék
+# végén, ugyanaz a sorrend, mint BoardState.finish. A passz-kör (mindkét fél passzol,
+# amíg lejár az idő) értéke a statikus végeredmény, így:
+#   V(M, O) = max(legjobb saját ütés, min(-(ellenfél legjobb ütése), statikus))
+#
+# Fájl: "SZTB", verzió (B), PIECES (B), kulcs-bájt / szám (B), value_max (H), rekordszám (I),
+# majd kulcs szerint rendezett rekordok: kulcs (M, O növekvő számai 0-val kiegészítve,
+# big-endian → bájtsorrend = rendezés) + érték "<bh". Az app mmap-pel nyitja, a
+# keresés bináris (a tábla nem kerül a memóriába).
+#
+#   python tablebase.py --pieces 2 --workers 8 --out endgame.tb
+
+MAGIC = b"SZTB"
+VERSION = 1
+PIECES = 2            # oldalanként; 3-tól a generálás órákig tart (a tábla ~10^10 állás)
+FILE_NAME = "endgame.tb"
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), FILE_NAME)
+CHUNK = 256           # ennyi lépő-halmaz megy egy feladatban a workerekhez
+
+_HEADER = struct.Struct("<4sBBBHI")
+_VALUE = struct.Struct("<bh")
+
+
+class TablebaseError(ValueError):
+    pass
+
+
+# ---------- megoldó (Kivy- és tábla-független, a számhalmazokon) ----------
+def _final(mine: tuple, theirs: tuple) -> tuple[int, int]:
+    return len(mine) - len(theirs), sum(mine) - sum(theirs)
+
+
+def _neg(out: tuple[int, int]) -> tuple[int, int]:
+    return -out[0], -out[1]
+
+
+def _captures(mine: tuple, theirs: tuple):
+    # (támadók, cél) párok: legalább két saját szám összege = egy ellenséges szám
+    targets = set(theirs)
+    for k in range(2, len(mine) + 1):
+        for attackers in combinations(mine, k):
+            total = sum(attackers)
+            if total in targets:
+                yield attackers, total
+
+
+def _best_capture(mine: tuple, theirs: tuple):
+    best = None
+    for attackers, target in _captures(mine, theirs):
+        rest = tuple(v for v in mine if v not in attackers)
+        left = tuple(v for v in theirs if v != target)
+        if not rest or not left:
+            out = _final(rest, left)
+        else:
+            out = _neg(solve(left, rest))
+        if best is None or out > best:
+            best = out
+    return best
+
+
+@lru_cache(maxsize=None)
+def solve(mine: tuple, theirs: tuple) -> tuple[int, int]:
+    # a lépő értéke; mindkét halmaz nem üres, növekvő sorrendű
+    stay = _final(mine, theirs)
+    reply = _best_capture(theirs, mine)
+    if reply is not None:
+        stay = min(stay, _neg(reply))
+    best = _best_capture(mine, theirs)
+    return stay if best is None or best < stay else best
+
+
+# ---------- generálás ----------
+def _sums(values: tuple, limit: int) -> set[int]:
+    # legalább két szám részhalmaz-összegei (ezekkel lehet ütni)
+    found = set()
+    for k in range(2, len(values) + 1):
+        for c in combinations(values, k):
+            total = sum(c)
+            if total <= limit:
+                found.add(total)
+    return found
+
+
+def _parts(total: int, k: int, lo: int, banned: set):
+    # total felbontása pontosan k különböző, lo-nál nem kisebb, nem tiltott részre
+    if k == 1:
+        if total >= lo and total not in banned:
+            yield (total,)
+        return
+    v = lo
+    while v * k + k * (k - 1) // 2 <= total:
+        if v not in banned:
+            for rest in _parts(total - v, k - 1, v + 1, banned):
+                yield (v, *rest)
+        v += 1
+
+
+def _extend(base: tuple, pieces: int, limit: int, banned: set):
+    # base összes legfeljebb pieces elemű bővítése a nem tiltott számokkal
+    free = [v for v in range(1, limit + 1) if v not in banned and v not in base]
+    for k in range(pieces - len(base) + 1):
+        for extra in combinations(free, k):
+            yield tuple(sorted(base + extra))
+
+
+def opponents(mine: tuple, pieces: int, limit: int) -> set[tuple]:
+    # az ellenfél-halmazok, ahol valamelyik oldal üthet (csak ezek kerülnek a táblába)
+    banned = set(mine)
+    found = set()
+    for total in _sums(mine, limit) - banned:
+        found.update(_extend((total,), pieces, limit, banned))
+    for m in mine:
+        for k in range(2, pieces + 1):
+            for parts in _parts(m, k, 1, banned):
+                found.update(_extend(parts, pieces, limit, banned))
+    return found
+
+
+def _key(mine, theirs, pieces: int, width: int) -> bytes:
+    pad = (0,) * pieces
+    return b"".join(v.to_bytes(width, "big") for v in (tuple(mine) + pad)[:pieces] + (tuple(theirs) + pad)[:pieces])
+
+
+def _width(limit: int) -> int:
+    return 1 if limit < 256 else 2
+
+
+def solve_chunk(sides: list[tuple], pieces: int, limit: int) -> list[bytes]:
+    # worker: a megadott lépő-halmazok összes nem triviális állása, kész rekordokként
+    width = _width(limit)
+    records = []
+    for mine in sides:
+        for theirs in opponents(mine, pieces, limit):
+            records.append(_key(mine, theirs, pieces, width) + _VALUE.pack(*solve(mine, theirs)))
+    return records
+
+
+def generate(path: str, pieces: int = PIECES, limit: int = VALUE_MAX, workers: int | None = None) -> int:
+    # a tábla kiszámítása ProcessPoolExecutor-on és kiírása; visszaadja a rekordszámot
+    sides = [c for k in range(1, pieces + 1) for c in combinations(range(1, limit + 1), k)]
+    chunks = [sides[i:i + CHUNK] for i in range(0, len(sides), CHUNK)]
+    records: list[bytes] = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for part in pool.map(solve_chunk, chunks, [pieces] * len(chunks), [limit] * len(chunks)):
+            records.extend(part)
+    # a rekord a kulccsal kezdődik → bájtsorrend = kulcssorrend; a kulcs egyedi
+    records.sort()
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, pieces, _width(limit), limit, len(records)))
+        f.writelines(records)
+    os.replace(tmp, path)
+    return len(records)
+
+
+# ---------- lekérdezés ----------
+class _Keys:
+    # a rekordok kulcsai sorozatként (bisect ezen keres, egyenként olvasva az mmap-ből)
+    __slots__ = ("mm", "start", "size", "key_len", "count")
+
+    def __init__(self, mm, start: int, size: int, key_len: int, count: int):
+        self.mm = mm
+        self.start = start
+        self.size = size
+        self.key_len = key_len
+        self.count = count
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, i: int) -> bytes:
+        off = self.start + i * self.size
+        return self.mm[off:off + self.key_len]
+
+
+class Tablebase:
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if len(self.mm) < _HEADER.size:
+                raise TablebaseError("rövid fájl")
+            magic, version, pieces, width, limit, count = _HEADER.unpack_from(self.mm)
+            if magic != MAGIC:
+                raise TablebaseError("nem végjáték-tábla")
+            if version != VERSION:
+                raise TablebaseError(f"ismeretlen verzió: {version}")
+            key_len = 2 * pieces * width
+            size = key_len + _VALUE.size
+            if len(self.mm) != _HEADER.size + count * size:
+                raise TablebaseError("csonka fájl")
+        except Exception:
+            self.mm.close()
+            raise
+        self.pieces = pieces
+        self.width = width
+        self.limit = limit
+        self.record_size = size
+        self._keys = _Keys(self.mm, _HEADER.size, size, key_len, count)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def close(self):
+        self.mm.close()
+
+    def _sides(self, board: BoardState):
+        # (lépő, ellenfél) növekvő számai, ha az állás a tábla hatókörében van
+        s = board.to_move
+        if not (0 < board.counts[s] <= self.pieces and 0 < board.counts[1 - s] <= self.pieces):
+            return None
+        values = board.values
+        mine = sorted(values[i] for i in iter_bits(board.masks[s]))
+        theirs = sorted(values[i] for i in iter_bits(board.masks[1 - s]))
+        if mine[-1] > self.limit or theirs[-1] > self.limit:
+            return None
+        return mine, theirs
+
+    def lookup(self, mine, theirs) -> tuple[int, int]:
+        key = _key(mine, theirs, self.pieces, self.width)
+        keys = self._keys
+        i = bisect_left(keys, key)
+        if i < len(keys) and keys[i] == key:
+            off = keys.start + i * keys.size + keys.key_len
+            return _VALUE.unpack_from(self.mm, off)
+        # nincs a táblában: egyik oldal sem üthet → a statikus végeredmény
+        return _final(mine, theirs)
+
+    def probe(self, board: BoardState) -> tuple[int, int] | None:
+        # a lépő végeredménye tökéletes játékkal; None, ha az állás nincs a hatókörben
+        sides = self._sides(board)
+        return None if sides is None else self.lookup(*sides)
+
+    def best_move(self, board: BoardState):
+        # ((cél, támadó maszk) vagy None = passz, érték); None, ha nincs a hatókörben
+        outcome = self.probe(board)
+        if outcome is None:
+            return None
+        b = board.copy()
+        s = b.to_move
+        values = b.values
+        by_value = {values[i]: i for i in iter_bits(b.masks[s])}
+        targets = {values[i]: i for i in iter_bits(b.masks[1 - s])}
+        mine = sorted(by_value)
+        for attackers, total in _captures(tuple(mine), tuple(sorted(targets))):
+            # ugyanaz a kiértékelés, mint a megoldóban; a passznál jobb vagy egyenlő ütés előre
+            rest = tuple(v for v in mine if v not in attackers)
+            left = tuple(sorted(v for v in targets if v != total))
+            out = _final(rest, left) if not rest or not left else _neg(self.lookup(left, rest))
+            if out == outcome:
+                mask = 0
+                for v in attackers:
+                    mask |= 1 << by_value[v]
+                return (targets[total], mask), outcome
+        return None, outcome
+
+
+_default: Tablebase | None = None
+_default_tried = False
+
+
+def default() -> Tablebase | None:
+    # a programmal szállított tábla (DEFAULT_PATH), első híváskor nyitva; ha nincs, None
+    global _default, _default_tried
+    if not _default_tried:
+        _default_tried = True
+        try:
+            _default = Tablebase(DEFAULT_PATH)
+        except (OSError, ValueError):
+            _default = None
+    return _default
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Számos Sakk végjáték-tábla generálása")
+    ap.add_argument("--pieces", type=int, default=PIECES, help="bábuk oldalanként legfeljebb")
+    ap.add_argument("--value-max", type=int, default=VALUE_MAX, help="a legnagyobb szám (az alaptáblán 128)")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--out", default=DEFAULT_PATH)
+    args = ap.parse_args(argv)
+
+    started = time.perf_counter()
+    n = generate(args.out, args.pieces, args.value_max, args.workers)
+    size = os.path.getsize(args.out)
+    print(f"{n} állás → {args.out} ({size / 1e6:.1f} MB, {time.perf_counter() - started:.1f} mp)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
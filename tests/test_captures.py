@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import random
+from itertools import combinations
+
+from captures import (SumTable, count_captures, has_capture, iter_captures, legal_captures,
+                      no_captures_left)
+from engine import SIDES, BoardConfig, BoardState, iter_bits
+
+# Ütés-generálás és -számlálás (SumTable bitset DP) a nyers erővel, azaz a
+# saját bábuk összes részhalmazának végignézésével összevetve.
+
+CONFIG = BoardConfig(5, 1, 40, pieces=7)
+
+
+def _random_board(rng: random.Random, pieces: int) -> BoardState:
+    board = BoardState(config=CONFIG)
+    board.reset(rng.randrange(2))
+    numbers = rng.sample(range(CONFIG.value_min, CONFIG.value_max + 1), 2 * pieces)
+    cells = rng.sample(range(board.size), 2 * pieces)
+    for k, (idx, v) in enumerate(zip(cells, numbers)):
+        board.place(idx, k % 2, v)
+    return board
+
+
+def _brute_captures(board: BoardState, s: int) -> set[tuple[int, int]]:
+    own = list(iter_bits(board.masks[s]))
+    values = board.values
+    found = set()
+    for t in iter_bits(board.masks[1 - s]):
+        for k in range(1, len(own) + 1):
+            for subset in combinations(own, k):
+                if sum(values[i] for i in subset) == values[t]:
+                    found.add((t, sum(1 << i for i in subset)))
+    return found
+
+
+def test_captures_match_brute_force():
+    rng = random.Random(11)
+    for _ in range(60):
+        board = _random_board(rng, rng.randint(1, CONFIG.per_side))
+        for s, side in enumerate(SIDES):
+            brute = _brute_captures(board, s)
+            assert set(iter_captures(board, side)) == brute
+            assert len(list(iter_captures(board, side))) == len(brute)
+            assert set(legal_captures(board, side)) == brute
+            assert count_captures(board, side) == len(brute)
+            assert has_capture(board, side) == bool(brute)
+            for t in iter_bits(board.masks[1 - s]):
+                assert count_captures(board, side, t) == sum(1 for m in brute if m[0] == t)
+        assert no_captures_left(board) == (not _brute_captures(board, 0) and not _brute_captures(board, 1))
+
+
+def test_sum_table_counts():
+    rng = random.Random(12)
+    for _ in range(40):
+        board = _random_board(rng, CONFIG.per_side)
+        own = board.masks[board.to_move]
+        table = SumTable(board, own)
+        values = [board.values[i] for i in iter_bits(own)]
+        ways = [0] * (CONFIG.value_max + 2)
+        for k in range(1, len(values) + 1):
+            for subset in combinations(values, k):
+                if sum(subset) <= CONFIG.value_max:
+                    ways[sum(subset)] += 1
+        for total in range(CONFIG.value_max + 2):
+            assert table.count(total) == (ways[total] if total <= CONFIG.value_max else 0)
+            assert table.reachable(total) == (table.count(total) > 0)
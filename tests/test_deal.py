@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from captures import count_captures, no_captures_left
+from deal import MAX_CANDIDATES, balanced_deal, candidate_cap, deal_board
+from engine import BLACK, DEFAULT_CONFIG, PRESETS, WHITE, BoardConfig, BoardState
+
+# Kiegyensúlyozott osztás: seedre determinisztikus (nincs időkeret), a sávos
+# ütésszám egyezik a táblán számolttal, és nem ad holt (ütés nélküli) osztást.
+
+TINY = BoardConfig(3, 1, 40, pieces=2)  # itt a véletlen osztások nagy része holt
+
+
+def test_same_seed_same_deal():
+    for config in PRESETS[:2]:
+        for seed in (1, 2, 3):
+            assert balanced_deal(seed, config=config) == balanced_deal(seed, config=config)
+
+
+def test_candidate_cap():
+    assert candidate_cap(DEFAULT_CONFIG) == MAX_CANDIDATES
+    caps = [candidate_cap(config) for config in PRESETS]
+    assert caps == sorted(caps, reverse=True)
+    assert caps[-1] >= 1
+    assert candidate_cap(TINY) == MAX_CANDIDATES
+
+
+def test_capture_counts_match_board():
+    for config in (DEFAULT_CONFIG, TINY):
+        for seed in range(5):
+            deal = balanced_deal(seed, config=config)
+            board = BoardState(config=config)
+            deal_board(board, deal)
+            assert deal.white_captures == count_captures(board, WHITE)
+            assert deal.black_captures == count_captures(board, BLACK)
+            assert deal.dead == no_captures_left(board)
+
+
+def test_no_dead_deal():
+    for seed in range(40):
+        deal = balanced_deal(seed, config=TINY)
+        assert not deal.dead
+        board = BoardState(config=TINY)
+        deal_board(board, deal)
+        assert not no_captures_left(board)
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import random
+
+from captures import legal_captures
+from engine import BoardConfig, BoardState, iter_bits
+
+# Ütés + visszavonás oda-vissza: minden lépés után a teljes állapot (a
+# zobrist-kulcs is) egyezik a nulláról felrakott táblával, visszavonva pedig
+# lépésről lépésre a korábbival.
+
+CONFIG = BoardConfig(6, 1, 60, pieces=8)
+
+
+def _state(board: BoardState):
+    return (bytes(board.owners), list(board.masks), list(board.counts), list(board.sums),
+            board.to_move, board.zobrist)
+
+
+def _rebuilt(board: BoardState) -> BoardState:
+    # ugyanaz az állás place()-szel felrakva: a kulcs így nem inkrementális
+    fresh = BoardState(config=board.config)
+    fresh.reset(board.to_move)
+    for side in (0, 1):
+        for idx in iter_bits(board.masks[side]):
+            fresh.place(idx, side, board.values[idx])
+    return fresh
+
+
+def _random_board(rng: random.Random) -> BoardState:
+    board = BoardState(config=CONFIG)
+    board.reset(rng.randrange(2))
+    numbers = rng.sample(range(CONFIG.value_min, CONFIG.value_max + 1), 2 * CONFIG.per_side)
+    cells = rng.sample(range(board.size), 2 * CONFIG.per_side)
+    for k, (idx, v) in enumerate(zip(cells, numbers)):
+        board.place(idx, k % 2, v)
+    return board
+
+
+def test_capture_undo_round_trip():
+    rng = random.Random(7)
+    played = 0
+    for _ in range(30):
+        board = _random_board(rng)
+        history = []
+        while not board.is_over():
+            captures = legal_captures(board)
+            if not captures:
+                break
+            before = _state(board)
+            board.pass_turn()
+            board.pass_turn()
+            assert _state(board) == before
+            target, attackers = rng.choice(captures)
+            side = board.to_move
+            assert board.apply_capture(target, attackers) == attackers | (1 << target)
+            history.append((before, target, attackers, side))
+            assert _state(board) == _state(_rebuilt(board))
+        played += len(history)
+
+        for before, target, attackers, side in reversed(history):
+            board.undo_capture(target, attackers, side)
+            assert _state(board) == before
+    assert played >= 30
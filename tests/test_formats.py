@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import movelog
+import snapshot
+from engine import BOARD_N_LIMIT, VALUE_LIMIT, BoardConfig, BoardState
+
+# v2 (széles) pillanatkép és lépésnapló a legnagyobb táblán: a cél index a
+# legutolsó mező (BOARD_N_LIMIT² - 1), ami már nem fér el előjeles 2 bájtban.
+
+LIMIT = BoardConfig(BOARD_N_LIMIT, 1, VALUE_LIMIT, pieces=2)
+LAST = BOARD_N_LIMIT * BOARD_N_LIMIT - 1
+
+
+def _board() -> BoardState:
+    # Fehér (lépő) 1 + 2, Fekete 3 a legutolsó mezőn és 10 az elején
+    board = BoardState(config=LIMIT)
+    board.reset(0)
+    board.place(LAST - 2, 0, 1)
+    board.place(LAST - 1, 0, 2)
+    board.place(LAST, 1, 3)
+    board.place(0, 1, 10)
+    return board
+
+
+def test_snapshot_target_at_limit():
+    board = _board()
+    board.select(LAST)
+    board.select(LAST - 2)
+    assert board.target == LAST
+
+    snap = snapshot.loads(snapshot.dumps(board))
+    assert snap.board.config == LIMIT
+    assert snap.board.target == LAST
+    assert snap.board.attackers == 1 << (LAST - 2)
+
+
+def test_snapshot_no_target():
+    snap = snapshot.loads(snapshot.dumps(_board()))
+    assert snap.board.target == -1
+
+
+def test_movelog_round_trip_at_limit():
+    board = _board()
+    log = movelog.MoveLog(board)
+    log.pass_turn(board, (1.0, 2.0))
+    board.pass_turn()
+    board.pass_turn()
+    attackers = (1 << (LAST - 2)) | (1 << (LAST - 1))
+    board.apply_capture(LAST, attackers)
+    log.capture(board, (3.0, 4.0), LAST, attackers)
+
+    moves = list(movelog.MoveLog.from_bytes(log.to_bytes()))
+    assert [(m.kind, m.target, m.attackers) for m in moves] == [
+        (movelog.PASS, -1, 0),
+        (movelog.CAPTURE, LAST, attackers),
+    ]
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+# Kivy nélkül (vagy GL-képes SDL nélkül) a modul kimarad; a Kivy ne értelmezze a
+# pytest argumentumait, és ablak helyett a képernyőn kívüli SDL-driverrel fusson
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+os.environ.setdefault("KIVY_NO_CONSOLELOG", "1")
+os.environ.setdefault("SDL_VIDEODRIVER", "offscreen")
+pytest.importorskip("kivy")
+
+from kivy.uix.screenmanager import Screen, ScreenManager  # noqa: E402
+
+import movelog  # noqa: E402
+import snapshot  # noqa: E402
+from captures import legal_captures, no_captures_left  # noqa: E402
+from engine import BoardConfig, iter_bits  # noqa: E402
+from gamescreen import GameScreen  # noqa: E402
+
+# A GameScreen játékmenete fej nélkül: visszavonás / újra a lépésnaplóval
+# (a szünet-rekordok megmaradnak) és a holt osztás / állás azonnali vége.
+
+TINY = BoardConfig(3, 1, 40, pieces=2)
+
+
+@pytest.fixture
+def game():
+    sm = ScreenManager()
+    screen = GameScreen(name="game")
+    sm.add_widget(screen)
+    sm.add_widget(Screen(name="stats"))
+    screen.finished = []
+    screen.finish_game = lambda reason: screen.finished.append(reason)  # app / popup nélkül
+    yield screen
+    screen.clock.stop()
+    screen._cancel_tick()
+
+
+def _kinds(game: GameScreen) -> list[int]:
+    return [m.kind for m in game.moves]
+
+
+def _capture(game: GameScreen):
+    b = game.board
+    target, attackers = legal_captures(b)[0]
+    b.select(target)
+    for idx in iter_bits(attackers):
+        b.select(idx)
+    game.try_capture()
+    return target, attackers
+
+
+def test_undo_redo_keeps_pause_records(game):
+    game.start_new_game(seed=1)
+    game._pass()
+    before = snapshot.dumps(game.board)
+    target, attackers = _capture(game)
+    after = snapshot.dumps(game.board)
+    game.set_paused(True)
+    game.set_paused(False)
+    assert _kinds(game) == [movelog.PASS, movelog.CAPTURE, movelog.PAUSE, movelog.RESUME]
+
+    game.undo()
+    assert _kinds(game) == [movelog.PASS, movelog.PAUSE, movelog.RESUME]
+    assert [(m.kind, m.target, m.attackers) for m in game.redo] == [(movelog.CAPTURE, target, attackers)]
+    assert snapshot.dumps(game.board) == before
+
+    game.undo()
+    assert _kinds(game) == [movelog.PAUSE, movelog.RESUME]
+    assert [m.kind for m in game.redo] == [movelog.CAPTURE, movelog.PASS]
+
+    game.redo_move()
+    game.redo_move()
+    assert _kinds(game) == [movelog.PAUSE, movelog.RESUME, movelog.PASS, movelog.CAPTURE]
+    assert not game.redo
+    assert snapshot.dumps(game.board) == after
+    assert game.finished == []
+
+
+def test_new_deal_is_never_dead(game):
+    for seed in range(10):
+        game.start_new_game(seed=seed, config=TINY)
+        assert not no_captures_left(game.board)
+    assert game.finished == []
+
+
+def test_dead_position_ends_on_restore(game):
+    game.start_new_game(seed=1, config=TINY)
+    b = game.board
+    b.reset(0)
+    b.place(0, 0, 5)
+    b.place(1, 1, 7)
+    game.restore(snapshot.loads(snapshot.dumps(b), game.board))
+    assert game.finished == ["Nincs ütés"]
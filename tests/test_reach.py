@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import random
+from itertools import combinations
+
+from captures import legal_captures
+from engine import BoardConfig, BoardState, iter_bits
+from reach import Reachability
+
+# Élő kiemelés (reach.Reachability) a nyers erővel összevetve, véletlen
+# kijelölések, ütések, visszavonások és passzok során – így az inkrementális
+# (kattintásonkénti és ütésenkénti) frissítés is ellenőrzött.
+
+CONFIG = BoardConfig(5, 1, 40, pieces=8)
+
+
+def _random_board(rng: random.Random) -> BoardState:
+    board = BoardState(config=CONFIG)
+    board.reset(rng.randrange(2))
+    numbers = rng.sample(range(CONFIG.value_min, CONFIG.value_max + 1), 2 * CONFIG.per_side)
+    cells = rng.sample(range(board.size), 2 * CONFIG.per_side)
+    for k, (idx, v) in enumerate(zip(cells, numbers)):
+        board.place(idx, k % 2, v)
+    return board
+
+
+def _subset_sums(values, idxs) -> dict[int, list[int]]:
+    # összeg → a részhalmazok maszkjai (nem üres részhalmazok)
+    sums: dict[int, list[int]] = {}
+    for k in range(1, len(idxs) + 1):
+        for subset in combinations(idxs, k):
+            sums.setdefault(sum(values[i] for i in subset), []).append(sum(1 << i for i in subset))
+    return sums
+
+
+def _brute_completers(board: BoardState) -> int:
+    if board.target < 0:
+        return 0
+    rem = board.values[board.target] - board.attack_sum
+    free = [i for i in iter_bits(board.masks[board.to_move] & ~board.attackers)]
+    mask = 0
+    for subset in _subset_sums(board.values, free).get(rem, ()):
+        mask |= subset
+    return mask
+
+
+def _brute_dead(board: BoardState) -> int:
+    sums = _subset_sums(board.values, list(iter_bits(board.masks[board.to_move])))
+    dead = 0
+    for t in iter_bits(board.masks[1 - board.to_move]):
+        if board.values[t] not in sums:
+            dead |= 1 << t
+    return dead
+
+
+def _check(reach: Reachability, board: BoardState):
+    reach.sync()
+    assert reach.completers() == _brute_completers(board)
+    assert reach.dead_targets() == _brute_dead(board)
+
+
+def test_reachability_matches_brute_force():
+    rng = random.Random(13)
+    for _ in range(20):
+        board = _random_board(rng)
+        reach = Reachability(board)
+        history = []
+        for _ in range(12):
+            own = list(iter_bits(board.masks[board.to_move]))
+            enemy = list(iter_bits(board.masks[1 - board.to_move]))
+            if not own or not enemy:
+                break
+            board.select(rng.choice(enemy))
+            _check(reach, board)
+            for _ in range(rng.randint(1, 4)):
+                board.select(rng.choice(own))  # be / ki
+                _check(reach, board)
+            board.clear_selection()
+
+            captures = legal_captures(board)
+            if history and rng.random() < 0.3:
+                board.undo_capture(*history.pop())
+            elif captures:
+                target, attackers = rng.choice(captures)
+                history.append((target, attackers, board.to_move))
+                board.apply_capture(target, attackers)
+            else:
+                board.pass_turn()
+            _check(reach, board)
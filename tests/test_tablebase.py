@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import random
+from itertools import combinations
+
+import tablebase
+from captures import iter_captures
+from engine import BoardConfig, BoardState
+
+# A végjáték-megoldó (tablebase.solve) és a generált fájl a táblán játszott
+# teljes minimax-szal összevetve: ütés vagy passz; két egymás utáni passz (a
+# lejáró idő) a statikus végeredményt adja; elfogyott oldalnál vége.
+
+PIECES = 2
+LIMIT = 14
+CONFIG = BoardConfig(4, 1, LIMIT, pieces=3)
+
+
+def _static(board: BoardState) -> tuple[int, int]:
+    s = board.to_move
+    return board.counts[s] - board.counts[1 - s], board.sums[s] - board.sums[1 - s]
+
+
+def _brute(board: BoardState, passed: bool = False) -> tuple[int, int]:
+    # a lépő értéke tökéletes játékkal
+    if passed:
+        best = _static(board)
+    else:
+        board.pass_turn()
+        reply = _brute(board, True)
+        board.pass_turn()
+        best = (-reply[0], -reply[1])
+    s = board.to_move
+    for target, attackers in list(iter_captures(board)):
+        board.apply_capture(target, attackers)
+        if board.is_over():
+            out = board.counts[s] - board.counts[1 - s], board.sums[s] - board.sums[1 - s]
+        else:
+            reply = _brute(board)
+            out = -reply[0], -reply[1]
+        board.undo_capture(target, attackers, s)
+        best = max(best, out)
+    return best
+
+
+def _board(mine, theirs) -> BoardState:
+    board = BoardState(config=CONFIG)
+    board.reset(0)
+    for k, v in enumerate(mine):
+        board.place(k, 0, v)
+    for k, v in enumerate(theirs):
+        board.place(8 + k, 1, v)
+    return board
+
+
+def test_solve_matches_brute_force():
+    rng = random.Random(17)
+    for _ in range(150):
+        mine_n, theirs_n = rng.randint(1, 3), rng.randint(1, 3)
+        numbers = rng.sample(range(1, LIMIT + 1), mine_n + theirs_n)
+        mine, theirs = tuple(sorted(numbers[:mine_n])), tuple(sorted(numbers[mine_n:]))
+        assert tablebase.solve(mine, theirs) == _brute(_board(mine, theirs)), (mine, theirs)
+
+
+def test_generated_table(tmp_path):
+    path = str(tmp_path / "endgame.tb")
+    records = tablebase.generate(path, pieces=PIECES, limit=LIMIT, workers=1)
+    tb = tablebase.Tablebase(path)
+    try:
+        assert len(tb) == records
+        sides = [c for k in range(1, PIECES + 1) for c in combinations(range(1, LIMIT + 1), k)]
+        for mine in sides:
+            for theirs in sides:
+                if set(mine) & set(theirs):
+                    continue
+                board = _board(mine, theirs)
+                value = _brute(board)
+                assert tb.probe(board) == value, (mine, theirs)
+                move, outcome = tb.best_move(board)
+                assert outcome == value
+                if move is not None:
+                    assert board.legal_capture(*move)
+    finally:
+        tb.close()
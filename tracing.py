@@ -0,0 +1,115 @@
+from __future__ import annotations
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+# Opcionális nyomkövetés: kezelők köré tett szakaszok (span) egy gyűrűpufferbe,
+# Chrome trace-event formátumban menthetők (chrome://tracing, Perfetto).
+# Kikapcsolva a @traced függvény csak egy modul-szintű bool-t néz → a költség
+# egy plusz függvényhívás. Kivy-független; a frame-időket a main.py adja.
+
+RING_SIZE = 50_000  # ennyi utolsó esemény marad meg
+ENV = "SZAMOS_TRACE"  # =1 → indításkor bekapcsolva
+
+_enabled = False
+_events: deque = deque(maxlen=RING_SIZE)
+_T0 = time.perf_counter()
+_PID = os.getpid()
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def enable(on: bool = True):
+    global _enabled
+    _enabled = on
+
+
+def clear():
+    _events.clear()
+
+
+def count() -> int:
+    return len(_events)
+
+
+def _us(t: float) -> float:
+    return round((t - _T0) * 1e6, 1)
+
+
+def add(name: str, start: float, end: float, cat: str = "ui", **args):
+    # kész szakasz (perf_counter időpontok); kikapcsolva semmit nem rögzít
+    if not _enabled:
+        return
+    ev = {"name": name, "cat": cat, "ph": "X", "ts": _us(start), "dur": round((end - start) * 1e6, 1),
+          "pid": _PID, "tid": threading.get_ident()}
+    if args:
+        ev["args"] = args
+    _events.append(ev)
+
+
+def instant(name: str, cat: str = "ui", **args):
+    if not _enabled:
+        return
+    ev = {"name": name, "cat": cat, "ph": "i", "s": "t", "ts": _us(time.perf_counter()),
+          "pid": _PID, "tid": threading.get_ident()}
+    if args:
+        ev["args"] = args
+    _events.append(ev)
+
+
+def traced(name: str, cat: str = "ui"):
+    # dekorátor: a hívás ideje egy "X" esemény, ha a nyomkövetés be van kapcsolva
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                add(name, start, time.perf_counter(), cat)
+        return wrapper
+    return deco
+
+
+class span:
+    # with tracing.span("név"): ... — kikapcsolva csak a flag-et nézi
+    __slots__ = ("name", "cat", "start")
+
+    def __init__(self, name: str, cat: str = "ui"):
+        self.name = name
+        self.cat = cat
+        self.start = 0.0
+
+    def __enter__(self):
+        if _enabled:
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if _enabled and self.start:
+            add(self.name, self.start, time.perf_counter(), self.cat)
+
+
+def chrome_trace(**meta) -> dict:
+    return {"traceEvents": list(_events), "displayTimeUnit": "ms", "otherData": meta}
+
+
+def dump(path: str, **meta) -> int:
+    # a puffer mentése Chrome trace JSON-ként; visszaadja az események számát
+    data = chrome_trace(**meta)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+    return len(data["traceEvents"])
+
+
+if os.environ.get(ENV) == "1":
+    enable()
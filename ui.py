@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from kivy.clock import Clock
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.label import Label
+from kivy.uix.button import Button
+from kivy.uix.popup import Popup
+
+import scheduler
+import tracing
+
+# A képernyők közös, könnyű Kivy-s elemei (a menü is ezeket használja): az app
+# ütemezője, a felugró üzenet és a közös fájlnevek. A nehéz képernyők (játék,
+# visszajátszás, fejlesztői) innen importálnak, nem a main-ből.
+
+LAST_GAME_LOG = "last_game.szml"
+
+# az app összes időzítője és tábla-kirajzolása ezen át: szünetben, háttérben és a
+# menükben felfüggesztve (nincs ébresztés), folytatáskor a hátralévő idővel újra
+SCHED = scheduler.Scheduler(Clock)
+
+
+@tracing.traced("popup")
+def popup(title: str, msg: str, on_ok=None):
+    box = BoxLayout(orientation="vertical", padding=12, spacing=10)
+    box.add_widget(Label(text=msg, font_size="14sp"))
+    btn = Button(text="OK", size_hint=(1, None), height=44)
+    box.add_widget(btn)
+    pop = Popup(title=title, content=box, size_hint=(None, None), size=(620, 340))
+
+    def _close(*_):
+        pop.dismiss()
+        if on_ok:
+            on_ok()
+
+    btn.bind(on_release=_close)
+    pop.open()